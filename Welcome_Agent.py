@@ -5,10 +5,16 @@ from shared_header import (
     ACCOUNTS, 
     INDUSTRIES, 
     ACCOUNT_INDUSTRY_MAP,
-    _safe_rerun
+    _safe_rerun,
+    render_assessment_status,
+    render_response_cache_controls,
+    render_agency_metrics,
+    get_feedback_store,
+    flush_feedback_writes,
+    render_feedback_download,
+    render_feedback_table,
 )
 import os
-import pandas as pd
 from datetime import datetime
 import streamlit.components.v1 as components
 
@@ -59,21 +65,6 @@ if 'current_page' not in st.session_state:
 if 'admin_access_requested' not in st.session_state:
     st.session_state.admin_access_requested = False
 
-# Feedback file configuration
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-FEEDBACK_FILE = os.path.join(BASE_DIR, "feedback.csv")
-
-try:
-    if not os.path.exists(FEEDBACK_FILE):
-        df = pd.DataFrame(columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType",
-                          "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement", "Agent"])
-        df.to_csv(FEEDBACK_FILE, index=False)
-except (PermissionError, OSError) as e:
-    if 'feedback_data' not in st.session_state:
-        st.session_state.feedback_data = pd.DataFrame(
-            columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", "OffDefinitions", 
-                    "Suggestions", "Account", "Industry", "ProblemStatement", "Agent"])
-
 # Admin panel URL parameter handling
 try:
     qparams = st.query_params
@@ -832,6 +823,8 @@ def render_main_app():
         title_problem="Share your Problem Statement",
         save_button_label="Save Problem Details"
     )
+    # Every agent runs in the background once the problem is saved
+    render_assessment_status()
 
     st.markdown("---")
     
@@ -881,11 +874,8 @@ def render_main_app():
             if agent_idx < 6:
                 agent = agents[agent_idx]
                 with cols[col_idx]:
-                    is_disabled = (st.session_state.launched_agent is not None and 
-                                 st.session_state.launched_agent != agent["page"])
                     if st.button(f"{agent['icon']} {agent['name']}", 
                                use_container_width=True, 
-                               disabled=is_disabled, 
                                type="secondary", 
                                key=f"agent_{agent_idx}",
                                help=agent['desc']):
@@ -906,11 +896,8 @@ def render_main_app():
     col1, col2, col3 = st.columns([1, 1, 1])
     with col2:
         agent = agents[6]
-        is_disabled = (st.session_state.launched_agent is not None and 
-                     st.session_state.launched_agent != agent["page"])
         if st.button(f"{agent['icon']} {agent['name']}", 
                    use_container_width=True, 
-                   disabled=is_disabled, 
                    type="secondary", 
                    key=f"agent_6",
                    help=agent['desc']):
@@ -1244,49 +1231,29 @@ def _render_admin_dashboard():
             key="admin_feedback_type_filter"
         )
 
-    df = None
-    if os.path.exists(FEEDBACK_FILE):
-        try:
-            df = pd.read_csv(FEEDBACK_FILE)
-        except Exception as e:
-            st.warning(f"⚠️ Error: {e}")
-            df = None
-
-    if df is None or df.empty:
-        if 'feedback_data' in st.session_state and not st.session_state.feedback_data.empty:
-            df = st.session_state.feedback_data.copy()
-            st.info("Session data (cloud mode)")
-        else:
-            df = None
+    # Counts, the table's pages and the report are all indexed queries on the feedback store
+    flush_feedback_writes()
+    feedback_store = get_feedback_store()
+    total_count = feedback_store.count()
 
-    if df is not None and not df.empty:
-        filtered_df = df.copy()
-        
-        if 'Agent' in df.columns and agent_filter != "All Agents":
-            filtered_df = filtered_df[filtered_df['Agent'] == agent_filter]
-        
-        if feedback_type_filter != "All Feedback Types":
-            filtered_df = filtered_df[filtered_df['FeedbackType'] == feedback_type_filter]
+    if total_count:
+        agent = agent_filter if agent_filter != "All Agents" else None
+        feedback_type = feedback_type_filter if feedback_type_filter != "All Feedback Types" else None
+        matching_count = feedback_store.count(agent, feedback_type)
 
-        st.info(f"Showing **{len(filtered_df)}** of **{len(df)}** entries")
+        st.info(f"Showing **{matching_count}** of **{total_count}** entries")
 
-        if not filtered_df.empty:
-            st.dataframe(filtered_df, use_container_width=True, height=350)
+        if matching_count:
+            render_feedback_table(agent, feedback_type, key_prefix="welcome_admin", height=350)
 
-            feedback_csv = filtered_df.to_csv(index=False).encode("utf-8")
-            
             agent_part = agent_filter.replace(' ', '_') if agent_filter != "All Agents" else "AllAgents"
             download_filename = f"feedback_{agent_part}_{datetime.now().strftime('%Y%m%d')}.csv"
 
             col_dl1, col_dl2, col_dl3 = st.columns([1, 2, 1])
             with col_dl2:
-                st.download_button(
-                    "⬇️ Download Report",
-                    feedback_csv,
-                    download_filename,
-                    "text/csv",
-                    use_container_width=True,
-                    type="primary"
+                render_feedback_download(
+                    agent, feedback_type, matching_count, download_filename, "⬇️ Download Report",
+                    key_prefix="welcome_admin",
                 )
         else:
             st.warning("No matching feedback")
@@ -1297,41 +1264,36 @@ def _render_admin_dashboard():
     
     st.markdown("<div class='admin-card'>", unsafe_allow_html=True)
     
-    if df is not None and not df.empty:
+    if total_count:
         col1, col2, col3 = st.columns(3)
         
         with col1:
             st.markdown("<div class='stat-metric'>", unsafe_allow_html=True)
-            st.metric("Total", len(df))
+            st.metric("Total", total_count)
             st.markdown("</div>", unsafe_allow_html=True)
         
         with col2:
             st.markdown("<div class='stat-metric'>", unsafe_allow_html=True)
-            if 'Agent' in df.columns:
-                st.metric("Agents", df['Agent'].nunique())
-            else:
-                st.metric("Agents", "N/A")
+            st.metric("Agents", feedback_store.agent_count())
             st.markdown("</div>", unsafe_allow_html=True)
         
         with col3:
             st.markdown("<div class='stat-metric'>", unsafe_allow_html=True)
-            if 'Timestamp' in df.columns:
-                try:
-                    df['Timestamp'] = pd.to_datetime(df['Timestamp'])
-                    current_month = datetime.now().month
-                    current_year = datetime.now().year
-                    this_month = len(df[(df['Timestamp'].dt.month == current_month) & 
-                                       (df['Timestamp'].dt.year == current_year)])
-                    st.metric("This Month", this_month)
-                except:
-                    st.metric("This Month", "N/A")
-            else:
-                st.metric("This Month", "N/A")
+            # Timestamps are "YYYY-MM-DD HH:MM:SS", so the month is a range on the Timestamp index
+            st.metric("This Month", feedback_store.count(since=datetime.now().strftime("%Y-%m-01")))
             st.markdown("</div>", unsafe_allow_html=True)
 
     
     st.markdown("</div>", unsafe_allow_html=True)
 
+    st.markdown("<div class='admin-card'>", unsafe_allow_html=True)
+    render_response_cache_controls(key_prefix="welcome_admin")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("<div class='admin-card'>", unsafe_allow_html=True)
+    render_agency_metrics(key_prefix="welcome_admin")
+    st.markdown("</div>", unsafe_allow_html=True)
+
 
 # --- PAGE ROUTER ---
 if st.session_state.get('page') == 'admin' or st.session_state.get('admin_view_selected'):
@@ -0,0 +1,231 @@
+"""
+Structured agent results.
+Each Talos answer is parsed once, when it arrives, into an AgentResult; pages
+read scores, sections and takeaways from it instead of re-scanning the text
+on every rerun.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Dimension agents and the questions that make up their score
+DIMENSION_AGENTS = ("volatility", "ambiguity", "interconnectedness", "uncertainty")
+
+
+@dataclass
+class AgentResult:
+    """One parsed agency answer"""
+    agent: str
+    name: str
+    text: str
+    score: Optional[float] = None
+    confidence: str = ""
+    classification: str = "UNKNOWN"
+    sections: dict = field(default_factory=dict)
+    takeaways: tuple = ()
+
+
+# ================================
+# 🔢 Scores
+# ================================
+
+# Dimension questions answer with "Score (0-5): 3"; agencies also write "Rating: **4**",
+# "Volatility score is 3.5" or just "4/5" somewhere in the justification
+_LABELLED_SCORE = re.compile(
+    r'\b(?:score|rating)\b(?:\s*\(\s*0\s*[-–]\s*5\s*\))?\s*\**\s*(?:[:\-–=]|\bis\b|\bof\b)\s*\**\s*(\d+(?:\.\d+)?)',
+    re.IGNORECASE,
+)
+_OUT_OF_FIVE = re.compile(r'\b(\d+(?:\.\d+)?)\s*(?:/|out of)\s*5\b', re.IGNORECASE)
+
+# Numbers are \d+(?:\.\d*)? (same matches as \d+\.?\d* without its ambiguity), and
+# unprefixed ones are only tried from their first digit so long digit runs stay linear
+_HARDNESS_SCORE_PATTERNS = [
+    re.compile(r'Overall Difficulty Score\s*[:\-]?\s*(\d+(?:\.\d*)?)', re.IGNORECASE),
+    re.compile(r'Score\s*[:\-]?\s*(\d+(?:\.\d*)?)', re.IGNORECASE),
+    re.compile(r'(?<!\d)(\d+(?:\.\d*)?)\s*\/\s*5', re.IGNORECASE),
+    re.compile(r'(?<!\d)(\d+(?:\.\d*)?)\s*out of\s*5', re.IGNORECASE),
+]
+_HARDNESS_LEVEL = re.compile(r'Hardness Level', re.IGNORECASE)
+_FIRST_NUMBER_ON_LINE = re.compile(r'[^\d\n]*(\d+(?:\.\d*)?)')
+_ANY_NUMBER = re.compile(r'\b(\d+(?:\.\d*)?)\b')
+
+_HARD_WORDS = ['hard', 'difficult', 'complex', 'challenging', '4.1', '4.2', '4.3', '4.4', '4.5', '4.6', '4.7', '4.8', '4.9', '5.0']
+_MODERATE_WORDS = ['moderate', 'medium', 'average', '3.1', '3.2', '3.3', '3.4', '3.5', '3.6', '3.7', '3.8', '3.9', '4.0']
+_NOT_HARD_WORDS = ['easy', 'simple', 'straightforward', '0.', '1.', '2.', '3.0']
+
+
+def _in_range(matches):
+    scores = (float(m.group(1)) for m in matches)
+    return [score for score in scores if 0 <= score <= 5]
+
+
+def question_score(text):
+    """(score, confidence) for a dimension question answer.
+
+    "high": one labelled 0-5 score (repeats of the same value are fine).
+    "low": labelled scores disagree, or the score was only found as "n/5" / "n out of 5".
+    (None, "") when the answer carries no usable score.
+    """
+    labelled = _in_range(_LABELLED_SCORE.finditer(text or ""))
+    if labelled:
+        return labelled[0], "high" if len(set(labelled)) == 1 else "low"
+    loose = _in_range(_OUT_OF_FIVE.finditer(text or ""))
+    if loose:
+        return loose[0], "low"
+    return None, ""
+
+
+# Bands the hardness prompt asks for: Easy 0-3.0, Moderate 3.1-4.0, Hard 4.1-5.0
+HARDNESS_BANDS = ((4.0, "HARD"), (3.0, "MODERATE"))
+
+
+def score_classification(score):
+    """
+    HARD / MODERATE / NOT HARD (the prompt's "Easy") for a 0-5 score; the one
+    band rule for labels and colours. Upper bounds are inclusive: HARD is
+    > 4.0, MODERATE is > 3.0 up to and including 4.0, NOT HARD is <= 3.0.
+    """
+    if score is None:
+        return "UNKNOWN"
+    for floor, level in HARDNESS_BANDS:
+        if score > floor:
+            return level
+    return "NOT HARD"
+
+
+def _hardness_level_number(text):
+    """re.search(r'Hardness Level.*?(\d+(?:\.\d*)?)', text) with only the first
+    "Hardness Level" of each line tried, as later ones reach the same number"""
+    pos = 0
+    while True:
+        level = _HARDNESS_LEVEL.search(text, pos)
+        if level is None:
+            return None
+        match = _FIRST_NUMBER_ON_LINE.match(text, level.end())
+        if match:
+            return match
+        pos = text.find("\n", level.end())
+        if pos == -1:
+            return None
+
+
+def hardness_score(text):
+    """Extract the hardness score from the API response"""
+    if not text:
+        return None
+
+    for search in [pattern.search for pattern in _HARDNESS_SCORE_PATTERNS] + [_hardness_level_number]:
+        match = search(text)
+        if match:
+            try:
+                score = float(match.group(1))
+                if 0 <= score <= 5:
+                    return score
+            except ValueError:
+                continue
+
+    # If no specific score found, look for any number between 0-5
+    for num in _ANY_NUMBER.findall(text):
+        try:
+            score = float(num)
+            if 0 <= score <= 5:
+                return score
+        except ValueError:
+            continue
+    return None
+
+
+def hardness_classification(text, score=None):
+    """HARD / MODERATE / NOT HARD / UNKNOWN from the summary wording, else from its score"""
+    if not text:
+        return "UNKNOWN"
+
+    text_lower = text.lower()
+    if any(word in text_lower for word in _HARD_WORDS):
+        return "HARD"
+    if any(word in text_lower for word in _MODERATE_WORDS):
+        return "MODERATE"
+    if any(word in text_lower for word in _NOT_HARD_WORDS):
+        return "NOT HARD"
+    return score_classification(score)
+
+
+# ================================
+# 📑 Sections & Takeaways
+# ================================
+
+CURRENT_SYSTEM_SECTIONS = {
+    "core_problem": re.compile(r"(?:Core Problem|Business Problem)[:\n]", re.IGNORECASE),
+    "current_system": re.compile(r"(?:Current System)[:\n]", re.IGNORECASE),
+    "inputs": re.compile(r"(?:Inputs?)[:\n]", re.IGNORECASE),
+    "outputs": re.compile(r"(?:Outputs?)[:\n]", re.IGNORECASE),
+    "pain_points": re.compile(r"(?:Pain Points?)[:\n]", re.IGNORECASE),
+}
+
+
+def parse_current_system_sections(text):
+    """Split extracted text into structured sections"""
+    if not text:
+        return {k: "No data available" for k in CURRENT_SYSTEM_SECTIONS}
+
+    sections = {k: "" for k in CURRENT_SYSTEM_SECTIONS}
+    matches = {k: pattern.search(text) for k, pattern in CURRENT_SYSTEM_SECTIONS.items()}
+    keys = list(matches.keys())
+
+    for i, key in enumerate(keys):
+        if matches[key]:
+            start = matches[key].end()
+            end = None
+            for nxt_key in keys[i + 1:]:
+                if matches[nxt_key]:
+                    end = matches[nxt_key].start()
+                    break
+            sections[key] = text[start:end].strip() if end else text[start:].strip()
+
+    for k in sections:
+        if not sections[k].strip():
+            sections[k] = "No data available"
+    return sections
+
+
+_TAKEAWAY = re.compile(r'^\s*(?:•\s*)?Key\s+Takeaways?\s*:?\s*(.*)$', re.IGNORECASE)
+_BULLET = re.compile(r'^\s*(?:•|-|\*|\d+\.)\s+(.*)$')
+
+
+def key_takeaways(text):
+    """"Key Takeaway: ..." lines, plus the bullets under a bare "Key Takeaways" heading"""
+    takeaways = []
+    in_list = False
+    for line in (text or "").splitlines():
+        match = _TAKEAWAY.match(line)
+        if match:
+            rest = match.group(1).strip()
+            if rest:
+                takeaways.append(rest)
+            in_list = not rest
+            continue
+        if in_list:
+            bullet = _BULLET.match(line)
+            if bullet:
+                takeaways.append(bullet.group(1).strip())
+            elif line.strip():
+                in_list = False
+    return tuple(takeaways)
+
+
+# ================================
+# 🧾 Parsing
+# ================================
+
+def parse_agent_result(agent, name, text):
+    """Parse one sanitized answer of `agent` (an AGENT_API_CONFIGS key) into an AgentResult"""
+    text = text or ""
+    result = AgentResult(agent=agent, name=name, text=text, takeaways=key_takeaways(text))
+    if agent in DIMENSION_AGENTS:
+        result.score, result.confidence = question_score(text)
+    elif agent == "hardness_summary":
+        result.score = hardness_score(text)
+        result.classification = hardness_classification(text, result.score)
+    elif agent == "current_system":
+        result.sections = parse_current_system_sections(text)
+    return result
@@ -0,0 +1,67 @@
+"""
+Single-flight coalescing of identical reasoning_api calls.
+
+Simulates a workshop where many sessions analyze the same demo problem at the
+same moment, and counts how many requests reach the (mock) backend when every
+session goes through the shared client versus one client per session.
+
+    python benchmarks/bench_coalescing.py --sessions 30 --chunk-delay 0.02
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mock_talos_server  # noqa: E402
+from shared_header import TalosClient  # noqa: E402
+
+
+def run_wave(clients, url, goal):
+    """Fire one identical call per session at once; returns per-call latencies"""
+    def one(client):
+        start = time.perf_counter()
+        payload = client.call_agency(url, goal)
+        return time.perf_counter() - start, payload
+
+    with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+        results = list(pool.map(one, clients))
+    return [seconds for seconds, _ in results], [payload for _, payload in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--chunk-delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    server = mock_talos_server.make_server(port=0, chunk_delay=args.chunk_delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = (f"http://127.0.0.1:{server.server_port}/talos-engine/agency/reasoning_api"
+           "?society_id=1757657318406&agency_id=1758555344231&level=1")
+    goal = "Business Problem:\n    Forecast demand for a new product line"
+
+    shared = TalosClient()
+    modes = [
+        ("client per session", [TalosClient() for _ in range(args.sessions)]),
+        ("shared client", [shared] * args.sessions),
+    ]
+    answers = []
+    for label, clients in modes:
+        server.reset_counts()
+        latencies, payloads = run_wave(clients, url, goal)
+        answers.extend(payloads)
+        print(f"{label:>18}: {server.counts.get('requests', 0):3d} backend requests | "
+              f"p50 {statistics.median(latencies):.2f}s, max {max(latencies):.2f}s")
+
+    print(f"coalesced calls: {shared.coalesced_calls} | all answers identical: {len({str(a) for a in answers}) == 1}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Feedback saving: append-only log versus read-concat-rewrite of feedback.csv.
+
+Times one submission against logs of growing size with the rewrite the pages
+used to do and with FeedbackLog.append (per fsync policy), then has several
+processes append concurrently and checks pandas reads back every row intact.
+
+    python benchmarks/bench_feedback_log.py --rows 1000 10000 100000 300000
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feedback_log import FEEDBACK_COLUMNS, FeedbackLog, compact, read_header  # noqa: E402
+from feedback_store import FeedbackStore  # noqa: E402
+
+
+def sample_row(i, agent="Volatility Agent"):
+    return {
+        "Timestamp": "2025-01-01 12:00:00",
+        "Name": f"user{i}",
+        "Email": f"user{i}@example.com",
+        "Feedback": f"Answer {i} missed the supply side, \"lead time\" in particular,\nsee Q3",
+        "FeedbackType": "Report",
+        "OffDefinitions": "",
+        "Suggestions": "Add a lead-time question",
+        "Account": "Dell",
+        "Industry": "Technology",
+        "ProblemStatement": "Forecast demand for the company",
+        "Agent": agent,
+    }
+
+
+def legacy_save(path, row):
+    """The read-concat-rewrite every submission used to do"""
+    new_entry = pd.DataFrame([row], columns=list(FEEDBACK_COLUMNS))
+    if os.path.exists(path):
+        existing = pd.read_csv(path)
+        updated = pd.concat([existing, new_entry], ignore_index=True)
+    else:
+        updated = new_entry
+    updated.to_csv(path, index=False)
+
+
+def build_log(path, rows):
+    log = FeedbackLog(path, fsync="never")
+    for i in range(rows):
+        log.append(sample_row(i))
+
+
+def best_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def append_worker(path, worker, count):
+    log = FeedbackLog(path, fsync="never")
+    for i in range(count):
+        log.append(sample_row(i, agent=f"worker{worker}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000, 300000])
+    parser.add_argument("--legacy-max-rows", type=int, default=100000, help="skip the rewrite above this size")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--per-worker", type=int, default=2000)
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'log rows':>9} | {'rewrite ms':>10} | {'append ms':>9} | {'append+fsync ms':>15}")
+        for rows in args.rows:
+            path = os.path.join(tmp, f"feedback_{rows}.csv")
+            build_log(path, rows)
+            no_sync = FeedbackLog(path, fsync="never")
+            always = FeedbackLog(path, fsync="always")
+            append_ms = best_ms(lambda: no_sync.append(sample_row(0)), args.repeat)
+            fsync_ms = best_ms(lambda: always.append(sample_row(0)), args.repeat)
+            if rows <= args.legacy_max_rows:
+                rewrite = f"{best_ms(lambda: legacy_save(path, sample_row(0)), 1):10.1f}"
+            else:
+                rewrite = f"{'skipped':>10}"
+            print(f"{rows:>9} | {rewrite} | {append_ms:9.3f} | {fsync_ms:15.3f}")
+
+        path = os.path.join(tmp, "feedback_concurrent.csv")
+        workers = [multiprocessing.Process(target=append_worker, args=(path, w, args.per_worker))
+                   for w in range(args.workers)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        df = pd.read_csv(path, keep_default_na=False)
+        expected = args.workers * args.per_worker
+        intact = (
+            tuple(df.columns) == FEEDBACK_COLUMNS
+            and len(df) == expected
+            and (df["Agent"].value_counts() == args.per_worker).all()
+            and (df["Feedback"].str.endswith("see Q3")).all()
+        )
+        print(f"concurrent: {args.workers} processes x {args.per_worker} rows -> {len(df)} rows, "
+              f"{'intact' if intact else 'CORRUPTED'}")
+        failed |= not intact
+
+        # The pages used to save every submission twice
+        path = os.path.join(tmp, "feedback_doubled.csv")
+        doubled = FeedbackLog(path, fsync="never")
+        for i in range(1000):
+            doubled.append(sample_row(i))
+            doubled.append(sample_row(i))
+        read, kept = compact(path)
+        print(f"compact of a double-written log: {read} rows read, {kept} kept")
+        failed |= kept != 1000
+
+        # A file from before the fixed schema is appended to as is and only upgraded by compaction
+        legacy_path = os.path.join(tmp, "feedback_legacy.csv")
+        legacy_header = [column for column in FEEDBACK_COLUMNS if column not in ("Agent", "FeedbackId")]
+        pd.DataFrame([sample_row(0), sample_row(1), sample_row(2)])[legacy_header].to_csv(legacy_path, index=False)
+        FeedbackLog(legacy_path, fsync="never").append(sample_row(3, agent="Ambiguity Agent"))
+        stored = FeedbackStore(os.path.join(tmp, "feedback_legacy.sqlite3"), legacy_path)
+        ok = (
+            read_header(legacy_path) == legacy_header
+            and list(stored.query()["Agent"]) == ["", "", "", "Ambiguity Agent"]
+            and stored.count() == 4
+        )
+        print(f"legacy 10-column file appended to without a rewrite, rows read back: {'ok' if ok else 'FAILED'}")
+        failed |= not ok
+        compact(legacy_path)
+        upgraded = pd.read_csv(legacy_path, keep_default_na=False)
+        ok = tuple(upgraded.columns) == FEEDBACK_COLUMNS and list(upgraded["Agent"])[-1] == "Ambiguity Agent"
+        print(f"legacy file upgraded by compaction: {'ok' if ok else 'FAILED'}")
+        failed |= not ok
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Admin feedback table: server-side paging versus sending the whole filtered frame.
+
+For a large log, times one admin rerun that shows a table: the previous
+path (every filtered row, serialized to Arrow as st.dataframe does) against
+one page from FeedbackStore.page, for a few filter / sort combinations.
+Checks the page holds the rows a pandas sort of the full frame puts there
+and that its total matches FeedbackStore.count.
+
+    python benchmarks/bench_feedback_paging.py --rows 500000 --page-size 50
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feedback_log import FeedbackLog  # noqa: E402
+from feedback_store import FeedbackStore  # noqa: E402
+
+AGENTS = ["Vocabulary Agent", "Current System Agent", "Volatility Agent", "Ambiguity Agent",
+          "Interconnectedness Agent", "Uncertainty Agent", "Hardness Agent"]
+TYPES = ["I have read it, found it useful, thanks.",
+         "I have read it, found some definitions to be off.",
+         "The widget seems interesting, but I have some suggestions on the features."]
+COLUMNS = ["Timestamp", "Name", "Feedback", "FeedbackType", "Agent", "FeedbackId"]
+
+
+def random_row(rng, i):
+    return {
+        "Timestamp": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{i % 60:02d}:00",
+        "Name": f"user{rng.randint(0, 5000)}",
+        "Email": f"user{i}@example.com",
+        "Feedback": "Looks right, but the lead time answer is thin." if i % 3 else "",
+        "FeedbackType": rng.choice(TYPES),
+        "Account": "Dell",
+        "Industry": "Technology",
+        "ProblemStatement": "Forecast demand for the company",
+        "Agent": rng.choice(AGENTS),
+        "FeedbackId": uuid.UUID(int=rng.getrandbits(128)).hex,
+    }
+
+
+def arrow_bytes(df):
+    """Roughly what st.dataframe sends to the browser"""
+    return pa.Table.from_pandas(df, preserve_index=False).nbytes
+
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = random.Random(args.rows)
+        csv_path = os.path.join(tmp, "feedback.csv")
+        FeedbackLog(csv_path, fsync="never").append_many(random_row(rng, i) for i in range(args.rows))
+        store = FeedbackStore(os.path.join(tmp, "feedback.sqlite3"), csv_path=csv_path)
+
+        cases = [
+            (None, None, None, 0),
+            ("Volatility Agent", None, None, 0),
+            (None, None, "Timestamp", 0),
+            ("Hardness Agent", TYPES[1], "Timestamp", 100),
+            (None, TYPES[2], "Name", 5000),
+            (None, None, "Agent", 250000),
+        ]
+        print(f"{'filter / sort':>44} | {'full ms':>8} | {'full MB':>7} | {'store ms':>8} | {'page KB':>7} | same")
+        for agent, feedback_type, sort_by, offset in cases:
+            frame, full_ms = timed_ms(lambda: store.query(agent, feedback_type))
+            full, arrow_ms = timed_ms(lambda: arrow_bytes(frame))
+            (stored, stored_total), store_ms = timed_ms(
+                lambda: store.page(agent, feedback_type, sort_by, True, offset, args.page_size, COLUMNS))
+            # Newest first, ties newest first too, like the store's ORDER BY <column> DESC, id DESC
+            expected = frame.iloc[::-1]
+            if sort_by:
+                expected = expected.sort_values(sort_by, ascending=False, kind="stable")
+            expected = expected.iloc[offset:offset + args.page_size]
+            same = (list(expected["FeedbackId"]) == list(stored["FeedbackId"])
+                    and stored_total == store.count(agent, feedback_type))
+            failed |= not same
+            label = f"{agent or 'all'} / {(feedback_type or 'all')[:12]} / {sort_by or 'log order'} @{offset}"
+            print(f"{label:>44} | {full_ms + arrow_ms:8.1f} | {full / 2**20:7.1f} | {store_ms:8.1f} | "
+                  f"{arrow_bytes(stored) / 1024:7.1f} | {'yes' if same else 'NO'}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
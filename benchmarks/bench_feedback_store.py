@@ -0,0 +1,142 @@
+"""
+Admin feedback views: indexed SQLite store versus pandas over feedback.csv.
+
+Builds a feedback log and store of the same rows, then times what one admin
+rerun does for each filter combination: the old read_csv + copy + boolean
+masks, and the store's count and filtered query. Finally several processes
+append to one log and sync their store from it concurrently, and the row
+count is checked.
+
+    python benchmarks/bench_feedback_store.py --rows 100000 500000
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feedback_log import FEEDBACK_COLUMNS, FeedbackLog  # noqa: E402
+from feedback_store import FeedbackStore  # noqa: E402
+
+AGENTS = ["Vocabulary Agent", "Current System Agent", "Volatility Agent", "Ambiguity Agent",
+          "Interconnectedness Agent", "Uncertainty Agent", "Hardness Agent"]
+TYPES = ["I have read it, found it useful, thanks.",
+         "I have read it, found some definitions to be off.",
+         "The widget seems interesting, but I have some suggestions on the features."]
+ACCOUNTS = ["Dell", "Abbott Laboratories", "Walmart", "Nike", "Pfizer"]
+
+
+def random_row(rng, i):
+    return {
+        "Timestamp": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 12:{i % 60:02d}:00",
+        "Name": f"user{i}",
+        "Email": f"user{i}@example.com",
+        "Feedback": "Looks right, but the lead time answer is thin." if i % 3 else "",
+        "FeedbackType": rng.choice(TYPES),
+        "OffDefinitions": "",
+        "Suggestions": "",
+        "Account": rng.choice(ACCOUNTS),
+        "Industry": "Technology",
+        "ProblemStatement": "Forecast demand for the company",
+        # Rarely used agents are where the indexes pay off most
+        "Agent": rng.choices(AGENTS, weights=[30, 20, 20, 15, 10, 4, 1])[0],
+        "FeedbackId": uuid.UUID(int=rng.getrandbits(128)).hex,
+    }
+
+
+def pandas_view(csv_path, agent, feedback_type):
+    """What the admin views did on every rerun"""
+    df = pd.read_csv(csv_path)
+    filtered_df = df.copy()
+    if agent is not None:
+        filtered_df = filtered_df[filtered_df["Agent"] == agent]
+    if feedback_type is not None:
+        filtered_df = filtered_df[filtered_df["FeedbackType"] == feedback_type]
+    return len(filtered_df), len(df)
+
+
+def store_view(store, agent, feedback_type):
+    filtered_df = store.query(agent, feedback_type)
+    return len(filtered_df), store.count()
+
+
+def best_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def insert_worker(db_path, csv_path, worker, count):
+    log = FeedbackLog(csv_path, fsync="never")
+    store = FeedbackStore(db_path, csv_path=csv_path)
+    rng = random.Random(worker)
+    for i in range(count):
+        log.append(random_row(rng, i))
+        store.sync()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 500000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--per-worker", type=int, default=500)
+    args = parser.parse_args()
+
+    failed = False
+    views = [(None, None), ("Volatility Agent", None), ("Hardness Agent", TYPES[1]), (None, TYPES[2])]
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rows':>7} | {'filter':>42} | {'matches':>7} | {'pandas ms':>9} | {'store ms':>8} | "
+              f"{'count ms':>8}")
+        for rows in args.rows:
+            rng = random.Random(rows)
+            csv_path = os.path.join(tmp, f"feedback_{rows}.csv")
+            pd.DataFrame([random_row(rng, i) for i in range(rows)], columns=list(FEEDBACK_COLUMNS)).to_csv(
+                csv_path, index=False)
+            # The first open imports the existing log
+            store = FeedbackStore(os.path.join(tmp, f"feedback_{rows}.sqlite3"), csv_path=csv_path)
+
+            for agent, feedback_type in views:
+                expected = pandas_view(csv_path, agent, feedback_type)
+                got = store_view(store, agent, feedback_type)
+                failed |= expected != got
+                pandas_ms = best_ms(lambda: pandas_view(csv_path, agent, feedback_type), args.repeat)
+                store_ms = best_ms(lambda: store_view(store, agent, feedback_type), args.repeat)
+                count_ms = best_ms(lambda: store.count(agent, feedback_type), args.repeat)
+                label = f"{agent or 'all agents'} / {(feedback_type or 'all types')[:20]}"
+                print(f"{rows:>7} | {label:>42} | {got[0]:>7} | {pandas_ms:9.1f} | {store_ms:8.1f} | "
+                      f"{count_ms:8.2f}{'' if expected == got else '  MISMATCH'}")
+
+        db_path = os.path.join(tmp, "feedback_concurrent.sqlite3")
+        csv_path = os.path.join(tmp, "feedback_concurrent.csv")
+        FeedbackStore(db_path, csv_path=csv_path)
+        workers = [multiprocessing.Process(target=insert_worker, args=(db_path, csv_path, w, args.per_worker))
+                   for w in range(args.workers)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        # Without a sync on open: what the workers' own syncs left in the store
+        total = FeedbackStore(db_path, csv_path=None).count()
+        expected = args.workers * args.per_worker
+        print(f"concurrent: {args.workers} processes x {args.per_worker} logged + synced -> {total} rows "
+              f"({'ok' if total == expected else 'LOST ROWS'})")
+        failed |= total != expected
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Feedback submission latency: writer thread versus inline store + log writes.
+
+Times what a submit button waits for when each session appends its row to
+the log and syncs the store itself (fsync per row) and when it only queues
+the row for FeedbackWriter, with many threads submitting at once. Then checks
+every queued row reached both the log and the store, that rows still queued
+when a process exits without closing the writer are written by the exit hook,
+and that a store which missed a sync catches up from the log.
+
+    python benchmarks/bench_feedback_writer.py --threads 16 --per-thread 200
+"""
+
+import argparse
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feedback_log import FeedbackLog  # noqa: E402
+from feedback_store import FeedbackStore  # noqa: E402
+from feedback_writer import FeedbackWriter  # noqa: E402
+from shared_header import _percentile as percentile  # noqa: E402
+
+
+def sample_row(thread, i):
+    return {
+        "Timestamp": "2025-01-01 12:00:00",
+        "Name": f"user{thread}-{i}",
+        "Email": f"user{thread}-{i}@example.com",
+        "Feedback": "Looks right, but the lead time answer is thin.",
+        "FeedbackType": "I have read it, found it useful, thanks.",
+        "Account": "Dell",
+        "Industry": "Technology",
+        "ProblemStatement": "Forecast demand for the company",
+        "Agent": f"Agent {thread % 7}",
+    }
+
+
+def inline_submit(log, store, row):
+    """The same writes done in the script thread"""
+    log.append(row)
+    store.sync()
+
+
+def run_sessions(threads, per_thread, submit):
+    """Sorted submit latencies (ms) from `threads` concurrent sessions"""
+    latencies = []
+    lock = threading.Lock()
+
+    def session(thread):
+        mine = []
+        for i in range(per_thread):
+            start = time.perf_counter()
+            submit(sample_row(thread, i))
+            mine.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(mine)
+
+    workers = [threading.Thread(target=session, args=(t,)) for t in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sorted(latencies)
+
+
+def failing_append(rows):
+    raise OSError("No space left on device")
+
+
+def failing_sync():
+    raise sqlite3.OperationalError("database is locked")
+
+
+EXIT_SCRIPT = textwrap.dedent("""
+    import sys
+    sys.path.insert(0, {root!r})
+    from feedback_log import FeedbackLog
+    from feedback_store import FeedbackStore
+    from feedback_writer import FeedbackWriter
+    writer = FeedbackWriter(FeedbackLog({csv!r}), FeedbackStore({db!r}, csv_path={csv!r}), batch_seconds=60)
+    writer.submit([{{"Name": f"user{{i}}", "Agent": "exit"}} for i in range({rows})])
+    # No close(): the atexit hook has to write these
+""")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--per-thread", type=int, default=200)
+    parser.add_argument("--fsync", choices=["always", "interval", "never"], default="always")
+    args = parser.parse_args()
+
+    failed = False
+    expected = args.threads * args.per_thread
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'mode':>8} | {'p50 ms':>8} | {'p99 ms':>8} | {'max ms':>8} | {'wall s':>7} | rows")
+        for mode in ("inline", "writer"):
+            csv_path = os.path.join(tmp, f"{mode}.csv")
+            log = FeedbackLog(csv_path, fsync=args.fsync)
+            store = FeedbackStore(os.path.join(tmp, f"{mode}.sqlite3"), csv_path=csv_path)
+            start = time.perf_counter()
+            if mode == "inline":
+                latencies = run_sessions(args.threads, args.per_thread, lambda row: inline_submit(log, store, row))
+            else:
+                writer = FeedbackWriter(log, store)
+                latencies = run_sessions(args.threads, args.per_thread, lambda row: writer.submit([row]))
+                # Wall time runs until the last row is written, not just queued
+                writer.close()
+            wall = time.perf_counter() - start
+            rows = len(pd.read_csv(csv_path, keep_default_na=False))
+            ok = rows == expected and store.count() == expected
+            failed |= not ok
+            print(f"{mode:>8} | {percentile(latencies, 50):8.3f} | {percentile(latencies, 99):8.3f} | "
+                  f"{latencies[-1]:8.3f} | {wall:7.2f} | {rows} {'ok' if ok else 'MISSING ROWS'}")
+            if mode == "writer":
+                print(f"writer stats: {writer.stats()}")
+
+        csv_path = os.path.join(tmp, "exit.csv")
+        db_path = os.path.join(tmp, "exit.sqlite3")
+        script = EXIT_SCRIPT.format(root=ROOT, csv=csv_path, db=db_path, rows=500)
+        subprocess.run([sys.executable, "-c", script], check=True)
+        rows = len(pd.read_csv(csv_path, keep_default_na=False))
+        stored = FeedbackStore(db_path, csv_path=None).count()
+        ok = rows == 500 and stored == 500
+        print(f"exit without close: 500 queued rows -> {rows} in the log, {stored} in the store "
+              f"({'ok' if ok else 'LOST ROWS'})")
+        failed |= not ok
+
+        # A store that cannot be written while the log can: the rows are saved, the store catches up later
+        csv_path = os.path.join(tmp, "lag.csv")
+        store = FeedbackStore(os.path.join(tmp, "lag.sqlite3"), csv_path=csv_path)
+        sync = store.sync
+        store.sync = failing_sync
+        writer = FeedbackWriter(FeedbackLog(csv_path), store)
+        writer.submit([sample_row(0, i) for i in range(50)])
+        writer.flush()
+        lagging = writer.stats()
+        store.sync = sync
+        writer.close()
+        ok = (lagging["store_error"] is not None and lagging["written"] == 50
+              and writer.stats()["store_error"] is None and store.count() == 50)
+        print(f"store sync failing: {lagging['written']} rows logged, error shown: {lagging['store_error'] is not None}; "
+              f"after the next sync the store has {store.count()} ({'ok' if ok else 'STILL BEHIND'})")
+        failed |= not ok
+
+        # A log write failing once: later submissions are still accepted and the failed rows are retried
+        csv_path = os.path.join(tmp, "retry.csv")
+        log = FeedbackLog(csv_path)
+        append_many = log.append_many
+        log.append_many = failing_append
+        writer = FeedbackWriter(log, FeedbackStore(os.path.join(tmp, "retry.sqlite3"), csv_path=csv_path))
+        writer.submit([sample_row(0, i) for i in range(20)])
+        writer.flush()
+        failing = writer.stats()
+        log.append_many = append_many
+        writer.submit([sample_row(1, i) for i in range(30)])
+        writer.close()
+        rows = len(pd.read_csv(csv_path, keep_default_na=False))
+        ok = failing["log_error"] is not None and failing["retrying"] == 20 and writer.log_error is None and rows == 50
+        print(f"log write failing once: {failing['retrying']} rows held, error shown: {failing['log_error'] is not None}; "
+              f"after the next write the log has {rows} ({'ok' if ok else 'LOST ROWS'})")
+        failed |= not ok
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
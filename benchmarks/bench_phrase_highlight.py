@@ -0,0 +1,156 @@
+"""
+Extra-phrase highlighting: one cached trie pattern versus one re.sub per phrase.
+
+Bolds large glossaries (1,000+ phrases) in long answers with the per-line,
+per-phrase loop the pages used to run and with text_cleaning's compiled phrase
+pattern, checks both produce the same HTML where phrases cannot overlap, and
+times highlighting alone and the full vocabulary renderer (cold = phrase set
+compiled on that call, warm = cached).
+
+    python benchmarks/bench_phrase_highlight.py --phrases 1000 3000 --answer-kb 32
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import text_cleaning  # noqa: E402
+from mock_talos_server import AGENCIES, canned_answer  # noqa: E402
+
+WORDS = (
+    "demand forecast revenue growth rate margin inventory supply chain customer churn retention "
+    "pricing elasticity segment channel promotion lead time backlog capacity utilization yield "
+    "cost variance budget plan actuals region store product category season holiday trend "
+    "volatility ambiguity uncertainty interconnectedness stakeholder process data quality"
+).split()
+
+
+# ================================
+# 📜 Legacy highlighting (verbatim loop from the pages)
+# ================================
+
+def legacy_highlight(text, extra_phrases):
+    extra_patterns = []
+    if extra_phrases:
+        for p in extra_phrases:
+            if any(ch in p for ch in r".^$*+?{}[]\|()"):
+                extra_patterns.append(p)
+            else:
+                extra_patterns.append(re.escape(p))
+
+    out = []
+    for ln in text.splitlines():
+        new_ln = ln
+        for pat in extra_patterns:
+            try:
+                new_ln = re.sub(
+                    pat, lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
+            except re.error:
+                new_ln = re.sub(re.escape(
+                    pat), lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
+        out.append(new_ln)
+    return "\n".join(out)
+
+
+def shared_highlight(text, extra_phrases):
+    pattern = text_cleaning.extra_phrase_pattern(extra_phrases)
+    return "\n".join(pattern.sub(r"<strong>\g<0></strong>", ln) for ln in text.splitlines())
+
+
+# ================================
+# 🧪 Inputs
+# ================================
+
+def glossary(rng, n):
+    """`n` distinct 1-3 word phrases plus a few regex-style entries"""
+    phrases = set()
+    while len(phrases) < n:
+        phrases.add(" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))) + f" {len(phrases)}")
+    return sorted(phrases) + [r"Q\d+", "Score (", "lead[- ]time"]
+
+
+def distinct_tokens(n):
+    """Phrases that can neither overlap nor occur inside each other or inside <strong> tags"""
+    return [f"zq{i}x" for i in range(n)]
+
+
+def long_answer(rng, kb, phrases):
+    lines = []
+    size = 0
+    agency_ids = list(AGENCIES)
+    while size < kb * 1024:
+        text = canned_answer(rng.choice(agency_ids), "Business Problem:\n    Forecast demand for the company")
+        for line in text.splitlines():
+            words = line.split()
+            for _ in range(2):
+                words.insert(rng.randint(0, len(words)), rng.choice(phrases))
+            line = " ".join(words)
+            lines.append(line)
+            size += len(line) + 1
+    return "\n".join(lines)
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--phrases", type=int, nargs="+", default=[1000, 3000])
+    parser.add_argument("--answer-kb", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failed = False
+
+    tokens = distinct_tokens(max(args.phrases))
+    text = long_answer(rng, args.answer_kb, tokens)
+    same = legacy_highlight(text, tokens) == shared_highlight(text, tokens)
+    print(f"identity ({len(tokens)} non-overlapping phrases, {args.answer_kb}KB): {'ok' if same else 'MISMATCH'}")
+    failed |= not same
+
+    print(f"{'phrases':>8} | {'legacy ms':>9} | {'compile ms':>10} | {'warm ms':>8} | speedup | "
+          f"{'render cold ms':>14} | {'render warm ms':>14}")
+    for n in args.phrases:
+        phrases = glossary(rng, n)
+        text = long_answer(rng, args.answer_kb, phrases)
+        legacy = best_of(lambda: legacy_highlight(text, phrases), 1) * 1000
+
+        text_cleaning._extra_phrase_pattern.cache_clear()
+        re.purge()
+        start = time.perf_counter()
+        text_cleaning.extra_phrase_pattern(phrases)
+        compile_ms = (time.perf_counter() - start) * 1000
+        warm = best_of(lambda: shared_highlight(text, phrases), args.repeat) * 1000
+
+        def render():
+            text_cleaning.format_with_bold(text, "vocabulary", phrases)
+
+        def render_cold():
+            text_cleaning._extra_phrase_pattern.cache_clear()
+            re.purge()
+            render()
+
+        cold_render = best_of(render_cold, args.repeat) * 1000
+        warm_render = best_of(render, args.repeat) * 1000
+        print(f"{len(phrases):>8} | {legacy:9.1f} | {compile_ms:10.1f} | {warm:8.1f} | {legacy / warm:6.0f}x | "
+              f"{cold_render:14.1f} | {warm_render:14.1f}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
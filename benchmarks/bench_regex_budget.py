@@ -0,0 +1,171 @@
+"""
+Time budget and linear-scaling guard for every answer cleanup on pathological inputs.
+
+Runs each text_cleaning / agent_results cleanup over a corpus of adversarial
+answers (long digit runs, unclosed markdown links, endless "how"s, whitespace
+runs, ...) and a realistic one at two sizes, and fails when a cleanup goes
+over its budget at the larger size or grows clearly faster than the input.
+Each input family runs in its own process with a hard timeout, so a
+catastrophic pattern is reported instead of hanging the run.
+
+    python benchmarks/bench_regex_budget.py --kb 16 --budget-ms 250
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agent_results  # noqa: E402
+import text_cleaning  # noqa: E402
+from mock_talos_server import AGENCIES, canned_answer  # noqa: E402
+
+
+# ================================
+# 🧹 Cleanups under test
+# ================================
+
+CLEANUPS = {
+    "sanitize": text_cleaning.sanitize_text,
+    "sanitize current_system": lambda t: text_cleaning.sanitize_text(t, "current_system"),
+    "clean output": lambda t: text_cleaning.clean_agent_output(t, "volatility"),
+    "card body": lambda t: text_cleaning.format_card_body(t, "Dell", "Technology"),
+    "section content": text_cleaning.clean_section_content,
+    "bold vocabulary": lambda t: text_cleaning.format_with_bold(t, "vocabulary"),
+    "bold current_system": lambda t: text_cleaning.format_with_bold(t, "current_system"),
+    "bold volatility": lambda t: text_cleaning.format_with_bold(t, "volatility"),
+    "hardness output": text_cleaning.format_hardness_output,
+    "answer html card": lambda t: text_cleaning.answer_html(t, "ambiguity", "Dell", "Technology"),
+    "answer html vocabulary": lambda t: text_cleaning.answer_html(t, "vocabulary", "Dell", "Technology"),
+    "result hardness": lambda t: agent_results.parse_agent_result("hardness_summary", "hardness_summary", t),
+    "result question": lambda t: agent_results.parse_agent_result("volatility", "Q1", t),
+    "result current_system": lambda t: agent_results.parse_agent_result("current_system", "current_system", t),
+}
+
+
+# ================================
+# 🧪 Corpus
+# ================================
+# Each family builds roughly `size` characters; most repeat one unit that makes
+# some lazy or ambiguous pattern retry from every position.
+
+def _repeat(unit, size, tail=""):
+    return unit * max(1, size // len(unit)) + tail
+
+
+def _realistic(size):
+    rng = random.Random(size)
+    chunks = []
+    total = 0
+    agency_ids = list(AGENCIES)
+    while total < size:
+        chunk = canned_answer(rng.choice(agency_ids), "Business Problem:\n    Forecast demand for the company") + "\n\n"
+        chunks.append(chunk)
+        total += len(chunk)
+    return "".join(chunks)
+
+
+FAMILIES = {
+    "realistic answers": _realistic,
+    "long number then =": lambda n: _repeat("1", n, "="),
+    "long number then /": lambda n: _repeat("1", n, "/"),
+    "sums without result": lambda n: _repeat("12345678 + ", n, "="),
+    "sums without /4": lambda n: "(" + _repeat("12345678 + ", n, "/"),
+    "how without calculated": lambda n: _repeat("how ", n, ":"),
+    "how across lines": lambda n: _repeat("How\n", n, "calculated:"),
+    "unclosed links": lambda n: _repeat("[", n, "]("),
+    "unclosed images": lambda n: _repeat("![", n, "\n"),
+    "links after last close": lambda n: "[a](b) " + _repeat("[", n, ")"),
+    "bold markers": lambda n: _repeat("**a", n),
+    "backticks": lambda n: _repeat("`a", n),
+    "space run": lambda n: _repeat(" ", n, "x"),
+    "tab space run before bullet": lambda n: _repeat(" \t", n, "x•"),
+    # Text in front so sanitize_text's strip() keeps the runs
+    "blank lines with spaces": lambda n: "x" + _repeat("\n \n", n, "ab:"),
+    "newline runs": lambda n: "x" + _repeat("\n", n, "s "),
+    "spaced newline runs": lambda n: "x" + _repeat(" \n", n, "1"),
+    "long line with colon": lambda n: _repeat("a", n, ":"),
+    "labels": lambda n: _repeat("Score: 3\n", n),
+    "section markers": lambda n: _repeat("Calculation:", n),
+    "sme mentions": lambda n: _repeat("SME Justification ", n),
+    "hardness levels": lambda n: _repeat("Hardness Level ", n),
+    "key takeaways": lambda n: _repeat("Key Takeaways\n- point\n", n),
+    "step lines": lambda n: _repeat("Step " * 20 + "\n", n),
+}
+
+
+def best_ms(fn, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def measure_family(family, sizes, repeat, queue):
+    """Child process: time every cleanup on one family at each size"""
+    texts = [FAMILIES[family](size) for size in sizes]
+    rows = []
+    for name, fn in CLEANUPS.items():
+        rows.append((name, [best_ms(fn, text, repeat) for text in texts]))
+    queue.put(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kb", type=int, default=16, help="small input size; the large one is 4x")
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="limit for any cleanup at the large size")
+    parser.add_argument("--max-growth", type=float, default=8.0,
+                        help="limit for large/small time (linear is ~4, quadratic ~16)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="hard limit per input family, seconds")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--family", action="append", choices=sorted(FAMILIES), help="only these families")
+    args = parser.parse_args()
+
+    sizes = (args.kb * 1024, args.kb * 4 * 1024)
+    failures = []
+    print(f"{'family':>28} | {'slowest cleanup':>24} | {f'{args.kb}KB ms':>9} | {f'{args.kb * 4}KB ms':>9} | growth")
+    for family in args.family or FAMILIES:
+        queue = multiprocessing.Queue()
+        worker = multiprocessing.Process(target=measure_family, args=(family, sizes, args.repeat, queue))
+        worker.start()
+        try:
+            rows = queue.get(timeout=args.timeout)
+        except Exception:
+            rows = None
+        worker.join(1)
+        if rows is None:
+            worker.terminate()
+            worker.join()
+            failures.append(f"{family}: no result within {args.timeout:.0f}s")
+            print(f"{family:>28} | {'TIMEOUT':>24} |")
+            continue
+
+        worst = None
+        for name, (small, large) in rows:
+            # Ratios of sub-millisecond timings are noise; those are within budget anyway
+            growth = large / small if small >= 1.0 else 1.0
+            if large > args.budget_ms:
+                failures.append(f"{family} / {name}: {large:.1f} ms at {args.kb * 4}KB (budget {args.budget_ms:.0f} ms)")
+            if growth > args.max_growth:
+                failures.append(f"{family} / {name}: {growth:.1f}x slower on 4x the input")
+            if worst is None or large > worst[1][1]:
+                worst = (name, (small, large), growth)
+        name, (small, large), growth = worst
+        print(f"{family:>28} | {name:>24} | {small:9.1f} | {large:9.1f} | {growth:5.1f}x")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"all {len(CLEANUPS)} cleanups within {args.budget_ms:.0f} ms and {args.max_growth:.0f}x growth "
+          f"on {len(args.family or FAMILIES)} input families")
+
+
+if __name__ == "__main__":
+    main()
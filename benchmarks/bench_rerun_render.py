@@ -0,0 +1,76 @@
+"""
+Widget reruns of an agent page with stored results, with and without the
+rendered-answer cache.
+
+Loads the Volatility page through streamlit.testing AppTest with large stored
+answers, then reruns it as a widget interaction would and reports script time
+when every rerun reformats the answers (cache cleared) versus when the HTML
+comes from cached_answer_html.
+
+    python benchmarks/bench_rerun_render.py --answer-kb 32 --reruns 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("TALOS_CACHE_PATH", "")
+os.environ.setdefault("TALOS_METRICS_LOG_PATH", "")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import shared_header  # noqa: E402
+from mock_talos_server import canned_answer  # noqa: E402
+
+PAGE = os.path.join(ROOT, "pages", "3__Volatility_Agent.py")
+
+
+def stored_outputs(answer_kb):
+    outputs = {}
+    for cfg in shared_header.AGENT_API_CONFIGS["volatility"]:
+        answer = canned_answer("volatility", f"Business Problem:\n    Forecast demand ({cfg['name']})")
+        outputs[cfg["name"]] = (answer + "\n\n") * max(1, answer_kb * 1024 // len(answer))
+    return outputs
+
+
+def time_reruns(at, reruns, clear_cache):
+    seconds = []
+    for _ in range(reruns):
+        if clear_cache:
+            shared_header.cached_answer_html.clear()
+        start = time.perf_counter()
+        at.run()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--answer-kb", type=int, default=32, help="size of each stored answer")
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    at = AppTest.from_file(PAGE, default_timeout=60)
+    state = dict(
+        saved_account="Dell", saved_industry="Technology", saved_problem="Forecast demand for laptops",
+        business_account="Dell", business_industry="Technology", business_problem="Forecast demand for laptops",
+        volatile_outputs=stored_outputs(args.answer_kb), show_volatility=True, analysis_complete=True,
+    )
+    for key, value in state.items():
+        at.session_state[key] = value
+    at.run()
+    if at.exception:
+        sys.exit(f"page failed: {at.exception[0].message}")
+
+    for label, clear_cache in (("reformat every rerun", True), ("cached HTML", False)):
+        seconds = time_reruns(at, args.reruns, clear_cache)
+        print(f"{label:>20}: p50 {statistics.median(seconds) * 1000:7.1f} ms, "
+              f"max {max(seconds) * 1000:7.1f} ms over {args.reruns} reruns")
+
+
+if __name__ == "__main__":
+    main()
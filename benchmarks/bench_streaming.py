@@ -0,0 +1,78 @@
+"""
+Streaming vs batch reasoning_api calls against the local mock server.
+
+Checks that the streamed answer ends in the same payload as a batch call and
+reports time-to-first-content for both modes.
+
+    python benchmarks/bench_streaming.py --chunk-delay 0.05
+"""
+
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_talos_server import make_server  # noqa: E402
+from shared_header import IncrementalSanitizer, TalosClient  # noqa: E402
+
+
+def sanitize_text(text):
+    """Same cleaning steps the agent pages apply before display"""
+    if not text:
+        return ""
+    text = re.sub(r'^\s*s\s+', '', text.strip())
+    text = re.sub(r'\n\s*s\s+', '\n', text)
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+    text = re.sub(r'`(.*?)`', r'\1', text)
+    text = re.sub(r'#+\s*', '', text)
+    text = re.sub(r'^\s*[-*]\s+', '• ', text, flags=re.MULTILINE)
+    return text.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-delay", type=float, default=0.05)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    server = make_server(port=0, chunk_delay=args.chunk_delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = (f"http://127.0.0.1:{server.server_port}/talos-engine/agency/reasoning_api"
+           "?society_id=1757657318406&agency_id=1758548233201&level=1")
+    goal = "Business Problem:\n    Forecast demand for a new product line"
+    client = TalosClient()
+
+    for run in range(1, args.runs + 1):
+        start = time.perf_counter()
+        batch_payload = client.call_agency(url, goal)
+        batch_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        first_content, stream_payload = None, None
+        preview = IncrementalSanitizer(sanitize_text)
+        for delta, payload in client.stream_agency(url, goal):
+            if payload is not None:
+                stream_payload = payload
+                continue
+            preview.feed(delta)
+            if first_content is None and preview.text():
+                first_content = time.perf_counter() - start
+        stream_seconds = time.perf_counter() - start
+
+        same = stream_payload == batch_payload
+        print(f"run {run}: batch {batch_seconds:.2f}s | stream first content {first_content:.2f}s, "
+              f"complete {stream_seconds:.2f}s | final payload identical: {same}")
+        if not same:
+            sys.exit(1)
+        if sanitize_text(stream_payload["result"]) != sanitize_text(batch_payload["result"]):
+            sys.exit(1)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,784 @@
+"""
+Shared text-cleaning engine versus the per-page re.sub chains it replaced.
+
+Checks that text_cleaning produces byte-identical output to verbatim copies of
+the old page functions on large LLM-style answers and on randomized markdown
+fuzz, then times both on the large answers and on growing inputs (the line
+renderer should stay linear).
+
+    python benchmarks/bench_text_cleaning.py --answer-kb 64 --fuzz 20000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import text_cleaning  # noqa: E402
+from mock_talos_server import AGENCIES, canned_answer  # noqa: E402
+
+
+# ================================
+# 📜 Legacy page implementations (verbatim)
+# ================================
+
+def legacy_json_to_text(data):
+    """Extract text from JSON response"""
+    if data is None:
+        return ""
+    if isinstance(data, str):
+        return data
+    if isinstance(data, dict):
+        for key in ("result", "output", "content", "text", "answer", "response"):
+            if key in data and data[key]:
+                return legacy_json_to_text(data[key])
+        if "data" in data:
+            return legacy_json_to_text(data["data"])
+        # Try to extract any string values
+        for value in data.values():
+            if isinstance(value, str) and len(value) > 10:
+                return value
+        return "\n".join(f"{k}: {legacy_json_to_text(v)}" for k, v in data.items() if v)
+    if isinstance(data, list):
+        return "\n".join(legacy_json_to_text(x) for x in data if x)
+    return str(data)
+
+
+def legacy_sanitize_text(text):
+    """Remove markdown artifacts and clean up text"""
+    if not text:
+        return ""
+
+    # Fix the "s" character issue
+    text = re.sub(r'^\s*s\s+', '', text.strip())
+    text = re.sub(r'\n\s*s\s+', '\n', text)
+
+    text = re.sub(r'Q\d+\s*Answer\s*Explanation\s*:',
+                  '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+    text = re.sub(r'\*(.*?)\*', r'\1', text)
+    text = re.sub(r'`(.*?)`', r'\1', text)
+    text = re.sub(r'#+\s*', '', text)
+    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
+    text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = re.sub(r' {2,}', ' ', text)
+    text = re.sub(r'^\s*[-*]\s+', '• ', text, flags=re.MULTILINE)
+    text = re.sub(r'<\/?[^>]+>', '', text)
+    text = re.sub(r'& Key Takeaway:', 'Key Takeaway:', text)
+
+    return text.strip()
+
+
+def legacy_current_system_sanitize_text(text):
+    """Remove markdown artifacts and clean up text"""
+    if not text:
+        return ""
+
+    # Fix the "s" character issue - remove stray 's' characters at the beginning
+    text = re.sub(r'^\s*s\s+', '', text.strip())
+    text = re.sub(r'\n\s*s\s+', '\n', text)
+
+    # Remove --- lines
+    text = re.sub(r'^---\s*$', '', text, flags=re.MULTILINE)
+    
+    text = re.sub(r'Q\d+\s*Answer\s*Explanation\s*:',
+                  '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+    text = re.sub(r'\*(.*?)\*', r'\1', text)
+    text = re.sub(r'`(.*?)`', r'\1', text)
+    text = re.sub(r'#+\s*', '', text)
+    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
+    text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = re.sub(r' {2,}', ' ', text)
+    text = re.sub(r'^\s*[-*]\s+', '• ', text, flags=re.MULTILINE)
+    text = re.sub(r'<\/?[^>]+>', '', text)
+    text = re.sub(r'&', '&', text)
+    text = re.sub(r'& Key Takeaway:', 'Key Takeaway:', text)
+
+    return text.strip()
+
+
+def legacy_clean_volatility_output(text):
+    """Clean volatility output by removing Q1/Q2/Q3 prefixes, HTML tags, and fixing formatting"""
+    if not text:
+        return "No volatility data available"
+
+    clean_text = re.sub(r'<[^>]+>', '', text)
+    clean_text = re.sub(r'^(Q\d+\.?\s*)', '', clean_text, flags=re.MULTILINE | re.IGNORECASE)
+    clean_text = re.sub(r'\n(Q\d+\.?\s*)', '\n', clean_text, flags=re.MULTILINE | re.IGNORECASE)
+    clean_text = re.sub(r'^(Question\s*\d+\.?\s*)', '', clean_text, flags=re.MULTILINE | re.IGNORECASE)
+    clean_text = re.sub(r'\n(Question\s*\d+\.?\s*)', '\n', clean_text, flags=re.MULTILINE | re.IGNORECASE)
+    clean_text = re.sub(r'^(Answer|Analysis)\s*:\s*', '', clean_text, flags=re.MULTILINE | re.IGNORECASE)
+    clean_text = re.sub(r'Score\s*\(0[-–]5\)\s*:', 'Score:', clean_text, flags=re.IGNORECASE)
+    clean_text = re.sub(r'^\s+', '', clean_text, flags=re.MULTILINE)
+    clean_text = re.sub(r'\n\s+', '\n', clean_text)
+    clean_text = re.sub(r' {2,}', ' ', clean_text)
+    clean_text = re.sub(r'\n{3,}', '\n\n', clean_text)
+    return clean_text.strip()
+
+
+def legacy_format_volatility_with_bold(text, extra_phrases=None):
+    """Format volatility text with bold styling and remove Q1/Answer labels"""
+    if not text:
+        return "No volatility data available"
+
+    clean_text = legacy_sanitize_text(text)
+    
+    # Remove Q1/Answer labels and prefixes
+    clean_text = re.sub(r'^\s*Q\d+\s*:', '', clean_text, flags=re.IGNORECASE | re.MULTILINE)
+    clean_text = re.sub(r'^\s*Answer\s*:', '', clean_text, flags=re.IGNORECASE | re.MULTILINE)
+    clean_text = re.sub(r'^\s*Question\s*\d+\s*:', '', clean_text, flags=re.IGNORECASE | re.MULTILINE)
+    clean_text = re.sub(r'\bQ\d+\b\s*:', '', clean_text, flags=re.IGNORECASE)
+    clean_text = re.sub(r'\bAnswer\b\s*:', '', clean_text, flags=re.IGNORECASE)
+    
+    clean_text = clean_text.replace(" - ", " : ")
+    clean_text = re.sub(r'(?m)^\s*[-*]\s+', '• ', clean_text)
+
+    extra_patterns = []
+    if extra_phrases:
+        for p in extra_phrases:
+            if any(ch in p for ch in r".^$*+?{}[]\|()"):
+                extra_patterns.append(p)
+            else:
+                extra_patterns.append(re.escape(p))
+
+    lines = clean_text.splitlines()
+    n = len(lines)
+    i = 0
+    paragraph_html = []
+
+    def collect_continuation(start_idx):
+        block_lines = [lines[start_idx].rstrip()]
+        j = start_idx + 1
+        while j < n:
+            next_line = lines[j]
+            if not next_line.strip():
+                break
+            if re.match(r'^\s+', next_line) or re.match(r'^\s*[a-z]', next_line):
+                block_lines.append(next_line.rstrip())
+                j += 1
+                continue
+            if re.match(r'^\s*(?:•|-|\d+\.)\s+', next_line):
+                break
+            break
+        return block_lines, j
+
+    while i < n:
+        ln = lines[i].rstrip()
+        if not ln.strip():
+            paragraph_html.append('')
+            i += 1
+            continue
+
+        # Skip any lines that are just Q1/Answer labels
+        if re.match(r'^\s*(Q\d+|Answer|Question\s*\d+)\s*$', ln, re.IGNORECASE):
+            i += 1
+            continue
+
+        if extra_patterns:
+            new_ln = ln
+            for pat in extra_patterns:
+                try:
+                    new_ln = re.sub(
+                        pat, lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
+                except re.error:
+                    new_ln = re.sub(re.escape(
+                        pat), lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
+            if new_ln != ln:
+                paragraph_html.append(new_ln)
+                i += 1
+                continue
+
+        # Section headers (but not Q1/Answer)
+        if re.match(r'^\s*(Analysis|Score|Justification|Key\s+Takeaway|Frequency|Pace|Change|Cyclical|Predictable|Sporadic|Unpredictable|Resilient|System|Rework|Disruption)', ln, flags=re.IGNORECASE):
+            paragraph_html.append(f"<strong>{ln.strip()}</strong>")
+            i += 1
+            continue
+
+        m_num_colon = re.match(r'^\s*(\d+\.\s+[^:]+):\s*(.*)$', ln)
+        if m_num_colon:
+            heading = m_num_colon.group(1).strip()
+            remainder = m_num_colon.group(2).strip()
+            paragraph_html.append(
+                f"<strong>{heading}:</strong> {remainder}" if remainder else f"<strong>{heading}:</strong>")
+            i += 1
+            continue
+
+        m_bullet_heading = re.match(r'^\s*(?:•|\d+\.)\s*([^:]+):\s*(.*)$', ln)
+        if m_bullet_heading:
+            heading = m_bullet_heading.group(1).strip()
+            remainder = m_bullet_heading.group(2).strip()
+            paragraph_html.append(
+                f"• <strong>{heading}:</strong> {remainder}" if remainder else f"• <strong>{heading}:</strong>")
+            i += 1
+            continue
+
+        m_side = re.match(r'^\s*([^:]+):\s*(.*)$', ln)
+        if m_side and len(m_side.group(1).split()) <= 8:
+            left = m_side.group(1).strip()
+            right = m_side.group(2).strip()
+            paragraph_html.append(
+                f"<strong>{left}:</strong> {right}" if right else f"<strong>{left}:</strong>")
+            i += 1
+            continue
+
+        paragraph_html.append(ln)
+        i += 1
+
+    final_paragraphs = []
+    temp_lines = []
+    for entry in paragraph_html:
+        if entry == '':
+            if temp_lines:
+                final_paragraphs.append("<br>".join(temp_lines))
+                temp_lines = []
+        else:
+            temp_lines.append(entry)
+    if temp_lines:
+        final_paragraphs.append("<br>".join(temp_lines))
+
+    para_wrapped = [
+        f"<p style='margin:6px 0; line-height:1.45; font-size:0.98rem;'>{p}</p>" for p in final_paragraphs
+    ]
+    final_html = "\n".join(para_wrapped)
+
+    formatted_output = f"""
+    <div class="volatility-display">
+        {final_html}
+    </div>
+    """
+    formatted_output = re.sub(r'(<br>\s*){3,}', '<br><br>', formatted_output)
+    return formatted_output
+
+
+def legacy_format_vocabulary_with_bold(text, extra_phrases=None):
+    """Format vocabulary text with bold styling"""
+    if not text:
+        return "No vocabulary data available"
+
+    clean_text = legacy_sanitize_text(text)
+    clean_text = clean_text.replace(" - ", " : ")
+    clean_text = re.sub(r'(?m)^\s*[-*]\s+', '• ', clean_text)
+
+    extra_patterns = []
+    if extra_phrases:
+        for p in extra_phrases:
+            if any(ch in p for ch in r".^$*+?{}[]\|()"):
+                extra_patterns.append(p)
+            else:
+                extra_patterns.append(re.escape(p))
+
+    lines = clean_text.splitlines()
+    n = len(lines)
+    i = 0
+    paragraph_html = []
+
+    def collect_continuation(start_idx):
+        block_lines = [lines[start_idx].rstrip()]
+        j = start_idx + 1
+        while j < n:
+            next_line = lines[j]
+            if not next_line.strip():
+                break
+            if re.match(r'^\s+', next_line) or re.match(r'^\s*[a-z]', next_line):
+                block_lines.append(next_line.rstrip())
+                j += 1
+                continue
+            if re.match(r'^\s*(?:•|-|\d+\.)\s+', next_line):
+                break
+            break
+        return block_lines, j
+
+    while i < n:
+        ln = lines[i].rstrip()
+        if not ln.strip():
+            paragraph_html.append('')
+            i += 1
+            continue
+
+        if extra_patterns:
+            new_ln = ln
+            for pat in extra_patterns:
+                try:
+                    new_ln = re.sub(
+                        pat, lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
+                except re.error:
+                    new_ln = re.sub(re.escape(
+                        pat), lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
+            if new_ln != ln:
+                paragraph_html.append(new_ln)
+                i += 1
+                continue
+
+        if re.search(r'(Step\s*\d+\s*:)', ln, flags=re.IGNORECASE):
+            block, j = collect_continuation(i)
+            block_text = "<br>".join([b.strip() for b in block])
+            paragraph_html.append(f"<strong>{block_text}</strong>")
+            i = j
+            continue
+
+        m_num_colon = re.match(r'^\s*(\d+\.\s+[^:]+):\s*(.*)$', ln)
+        if m_num_colon:
+            heading = m_num_colon.group(1).strip()
+            remainder = m_num_colon.group(2).strip()
+            paragraph_html.append(
+                f"<strong>{heading}:</strong> {remainder}" if remainder else f"<strong>{heading}:</strong>")
+            i += 1
+            continue
+
+        m_num_no_colon = re.match(r'^\s*(\d+\.\s+.+)$', ln)
+        if m_num_no_colon:
+            block, j = collect_continuation(i)
+            block_text = "<br>".join([b.strip() for b in block])
+            paragraph_html.append(f"<strong>{block_text}</strong>")
+            i = j
+            continue
+
+        m_bullet_heading = re.match(r'^\s*(?:•|\d+\.)\s*([^:]+):\s*(.*)$', ln)
+        if m_bullet_heading:
+            heading = m_bullet_heading.group(1).strip()
+            remainder = m_bullet_heading.group(2).strip()
+            paragraph_html.append(
+                f"• <strong>{heading}:</strong> {remainder}" if remainder else f"• <strong>{heading}:</strong>")
+            i += 1
+            continue
+
+        m_side = re.match(r'^\s*([^:]+):\s*(.*)$', ln)
+        if m_side and len(m_side.group(1).split()) <= 8:
+            left = m_side.group(1).strip()
+            right = m_side.group(2).strip()
+            paragraph_html.append(
+                f"<strong>{left}:</strong> {right}" if right else f"<strong>{left}:</strong>")
+            i += 1
+            continue
+
+        if re.fullmatch(r'\s*Revenue\s+Growth\s+Rate\s*', ln, flags=re.IGNORECASE):
+            paragraph_html.append(f"<strong>{ln.strip()}</strong>")
+            i += 1
+            continue
+
+        paragraph_html.append(ln)
+        i += 1
+
+    final_paragraphs = []
+    temp_lines = []
+    for entry in paragraph_html:
+        if entry == '':
+            if temp_lines:
+                final_paragraphs.append("<br>".join(temp_lines))
+                temp_lines = []
+        else:
+            temp_lines.append(entry)
+    if temp_lines:
+        final_paragraphs.append("<br>".join(temp_lines))
+
+    para_wrapped = [
+        f"<p style='margin:6px 0; line-height:1.45; font-size:0.98rem;'>{p}</p>" for p in final_paragraphs
+    ]
+    final_html = "\n".join(para_wrapped)
+
+    formatted_output = f"""
+    <div class="vocab-display">
+        {final_html}
+    </div>
+    """
+    formatted_output = re.sub(r'(<br>\s*){3,}', '<br><br>', formatted_output)
+    return formatted_output
+
+
+def legacy_clean_section_content(content):
+    """Remove numbered lists (1., 2., 3., etc.) and clean up formatting"""
+    if not content:
+        return content
+    
+    # Remove numbered lists (1., 2., 3., etc.)
+    cleaned = re.sub(r'^\s*\d+\.\s*', '', content, flags=re.MULTILINE)
+    
+    # Remove any remaining "Box X:" patterns
+    cleaned = re.sub(r'(?i)\b(box\s*\d+[:.]?\s*)', '', cleaned)
+    
+    # Remove extra whitespace and normalize line breaks
+    cleaned = re.sub(r'\n{3,}', '\n\n', cleaned)
+    cleaned = re.sub(r' {2,}', ' ', cleaned)
+    
+    return cleaned.strip()
+
+
+def legacy_card_body(cleaned_output, display_account, display_industry):
+    # Replace company/industry names
+    if display_account and display_account != "Unknown Company":
+        cleaned_output = re.sub(r'\bthe company\b', display_account, cleaned_output, flags=re.IGNORECASE)
+    if display_industry and display_industry != "Unknown Industry":
+        cleaned_output = re.sub(r'\bthe industry\b', display_industry, cleaned_output, flags=re.IGNORECASE)
+
+    formatted_output = cleaned_output
+    formatted_output = re.sub(r'(?m)^\s*(?:\d+\.|-)\s+(.*)', r'• \1', formatted_output)
+    formatted_output = re.sub(r':\s*•', ':\n•', formatted_output)
+    formatted_output = re.sub(r'(:)\s+(?=•)', r'\1\n', formatted_output)
+    formatted_output = re.sub(r'(?<!\n)\s*•', r'\n•', formatted_output)
+    formatted_output = re.sub(
+        r'(^|[\n])\s*(•\s*)?([^:\n]{2,80}):',
+        lambda m: f"{m.group(1)}{m.group(2) or ''}<strong>{m.group(3).strip()}:</strong>",
+        formatted_output
+    )
+    formatted_output = re.sub(r'\n{2,}', '\n', formatted_output)
+    return formatted_output
+
+
+def legacy_current_system_json_to_text(data):
+    if data is None:
+        return ""
+    if isinstance(data, str):
+        return data
+    if isinstance(data, dict):
+        for key in ("result", "output", "content", "text"):
+            if key in data and data[key]:
+                return legacy_current_system_json_to_text(data[key])
+        if "data" in data:
+            return legacy_current_system_json_to_text(data["data"])
+        return "\n".join(f"{k}: {legacy_current_system_json_to_text(v)}" for k, v in data.items() if v)
+    if isinstance(data, list):
+        return "\n".join(legacy_current_system_json_to_text(x) for x in data if x)
+    return str(data)
+
+
+
+def legacy_format_current_system_with_bold(text, extra_phrases=None):
+    """
+    Format Current System output with bold styling.
+    Formats current system text with bold patterns and proper structure.
+    """
+    if not text:
+        return "No current system data available"
+
+    # Sanitize text
+    try:
+        clean_text = legacy_current_system_sanitize_text(text)
+    except NameError:
+        clean_text = text
+
+    # Remove numbered sections like "2." and "3." etc.
+    clean_text = re.sub(r'^\s*\d+\.\s*', '', clean_text, flags=re.MULTILINE)
+    
+    # Basic normalization
+    clean_text = clean_text.replace(" - ", " : ")
+    clean_text = re.sub(r'(?m)^\s*[-*]\s+', '• ', clean_text)
+
+    # Prepare extra phrase patterns
+    extra_patterns = []
+    if extra_phrases:
+        for p in extra_phrases:
+            if any(ch in p for ch in r".^$*+?{}[]\|()"):
+                extra_patterns.append(p)
+            else:
+                extra_patterns.append(re.escape(p))
+
+    lines = clean_text.splitlines()
+    n = len(lines)
+    i = 0
+    paragraph_html = []
+
+    def collect_continuation(start_idx):
+        """Collect continuation lines for block-style headings."""
+        block_lines = [lines[start_idx].rstrip()]
+        j = start_idx + 1
+        while j < n:
+            next_line = lines[j]
+            if not next_line.strip():
+                break
+            if re.match(r'^\s+', next_line) or re.match(r'^\s*[a-z]', next_line):
+                block_lines.append(next_line.rstrip())
+                j += 1
+                continue
+            if re.match(r'^\s*(?:•|-|\d+\.)\s+', next_line):
+                break
+            break
+        return block_lines, j
+
+    while i < n:
+        ln = lines[i].rstrip()
+        if not ln.strip():
+            paragraph_html.append('')
+            i += 1
+            continue
+
+        # Extra phrases
+        if extra_patterns:
+            new_ln = ln
+            for pat in extra_patterns:
+                try:
+                    new_ln = re.sub(
+                        pat, lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
+                except re.error:
+                    new_ln = re.sub(re.escape(
+                        pat), lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
+            if new_ln != ln:
+                paragraph_html.append(new_ln)
+                i += 1
+                continue
+
+        # Section headers (Current System, Inputs, Outputs, Pain Points)
+        if re.match(r'^\s*(Current\s+System|Inputs?|Outputs?|Pain\s+Points?|System\s+Description)', ln, flags=re.IGNORECASE):
+            paragraph_html.append(
+                f"<strong style='font-size:1.1rem; color: var(--text-primary);'>{ln.strip()}</strong>")
+            i += 1
+            continue
+
+        # Numbered heading WITH colon
+        m_num_colon = re.match(r'^\s*(\d+\.\s+[^:]+):\s*(.*)$', ln)
+        if m_num_colon:
+            heading = m_num_colon.group(1).strip()
+            remainder = m_num_colon.group(2).strip()
+            if remainder:
+                paragraph_html.append(
+                    f"<strong style='color: var(--text-primary);'>{heading}:</strong> {remainder}")
+            else:
+                paragraph_html.append(f"<strong style='color: var(--text-primary);'>{heading}:</strong>")
+            i += 1
+            continue
+
+        # Numbered heading WITHOUT colon
+        m_num_no_colon = re.match(r'^\s*(\d+\.\s+.+)$', ln)
+        if m_num_no_colon:
+            block, j = collect_continuation(i)
+            block_text = "<br>".join([b.strip() for b in block])
+            paragraph_html.append(f"<strong style='color: var(--text-primary);'>{block_text}</strong>")
+            i = j
+            continue
+
+        # Bullet with colon
+        m_bullet_heading = re.match(r'^\s*(?:•|\d+\.)\s*([^:]+):\s*(.*)$', ln)
+        if m_bullet_heading:
+            heading = m_bullet_heading.group(1).strip()
+            remainder = m_bullet_heading.group(2).strip()
+            if remainder:
+                paragraph_html.append(
+                    f"• <strong style='color: var(--text-primary);'>{heading}:</strong> {remainder}")
+            else:
+                paragraph_html.append(f"• <strong style='color: var(--text-primary);'>{heading}:</strong>")
+            i += 1
+            continue
+
+        # Generic inline heading "LeftOfColon: rest" - FIXED THIS PART
+        m_side = re.match(r'^\s*([^:]+):\s*(.*)$', ln)
+        if m_side and len(m_side.group(1).split()) <= 12:  # Increased word limit
+            left = m_side.group(1).strip()
+            right = m_side.group(2).strip()
+            
+            # Skip if it's a section header we already processed
+            if not re.match(r'^\s*(Current\s+System|Inputs?|Outputs?|Pain\s+Points?|System\s+Description)', left, flags=re.IGNORECASE):
+                paragraph_html.append(
+                    f"<strong style='color: var(--text-primary);'>{left}:</strong> {right}" if right else f"<strong style='color: var(--text-primary);'>{left}:</strong>")
+                i += 1
+                continue
+
+        # Handle bullet points with colons that might have been missed
+        if ':' in ln and not ln.startswith('•'):
+            parts = ln.split(':', 1)
+            if len(parts) == 2 and len(parts[0].split()) <= 8:
+                left = parts[0].strip()
+                right = parts[1].strip()
+                paragraph_html.append(f"<strong style='color: var(--text-primary);'>{left}:</strong> {right}")
+                i += 1
+                continue
+
+        # Default
+        paragraph_html.append(f"<span style='color: var(--text-primary);'>{ln}</span>")
+        i += 1
+
+    # Group into paragraphs
+    final_paragraphs = []
+    temp_lines = []
+    for entry in paragraph_html:
+        if entry == '':
+            if temp_lines:
+                final_paragraphs.append("<br>".join(temp_lines))
+                temp_lines = []
+        else:
+            temp_lines.append(entry)
+    if temp_lines:
+        final_paragraphs.append("<br>".join(temp_lines))
+
+    para_wrapped = [
+        f"<p style='margin:6px 0; line-height:1.45; font-size:0.98rem; color: var(--text-primary);'>{p}</p>" for p in final_paragraphs]
+    final_html = "\n".join(para_wrapped)
+
+    return final_html
+
+
+def legacy_format_hardness_output(text):
+    """Format hardness output by removing everything before SME Justification and cleaning up"""
+    if not text:
+        return "No hardness data available"
+
+    # Remove everything before "SME Justification"
+    clean_text = re.sub(r'^.*?(?=SME Justification)', '', text, flags=re.DOTALL | re.IGNORECASE)
+    
+    # If SME Justification wasn't found, use the original text
+    if not clean_text.strip():
+        clean_text = text
+    
+    # Remove calculation sections that might still be present
+    clean_text = re.sub(r'Calculation:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
+    clean_text = re.sub(r'Score Calculation:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
+    clean_text = re.sub(r'Calculation Process:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
+    clean_text = re.sub(r'How.*?calculated:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.IGNORECASE | re.DOTALL)
+    
+    # Remove mathematical expressions
+    clean_text = re.sub(r'\(\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*\)\s*\/\s*4', '', clean_text)
+    clean_text = re.sub(r'\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*=\s*\d+\.?\d*', '', clean_text)
+    
+    # Remove dimension scores and individual question scores if they appear after SME Justification
+    clean_text = re.sub(r'Individual Question Scores.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
+    clean_text = re.sub(r'Dimension Averages.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
+    clean_text = re.sub(r'DIMENSION SCORES:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
+    clean_text = re.sub(r'OVERALL CLASSIFICATION:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
+    clean_text = re.sub(r'COMPREHENSIVE ASSESSMENT:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
+    clean_text = re.sub(r'HARDNESS SUMMARY.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
+    
+    # Clean up remaining text
+    clean_text = re.sub(r'<[^>]+>', '', clean_text)
+    clean_text = re.sub(r'^\s+', '', clean_text, flags=re.MULTILINE)
+    clean_text = re.sub(r'\n\s+', '\n', clean_text)
+    clean_text = re.sub(r' {2,}', ' ', clean_text)
+    clean_text = re.sub(r'\n{3,}', '\n\n', clean_text)
+    
+    return clean_text.strip()
+
+
+# ================================
+# 🧪 Inputs
+# ================================
+
+FUZZ_TOKENS = [
+    "s ", "s\n", " s ", "\n", "\n\n\n", "  ", " ", "*", "**", "`", "#", "## ", "![img](x.png)",
+    "[link](http://a#b)", "[", "]", "(", ")", "<b>", "</b>", "<br>", "&", "& Key Takeaway:",
+    "Q1", "Q12.", "q3:", "Question 2", "Answer:", "answer :", "Analysis:", "Score (0-5):",
+    "Score (0–5):", "Q1 Answer Explanation:", "---", "- ", "* ", "• ", "1. ", "12.", ":", " - ",
+    "Step 1:", "Revenue Growth Rate", "the company", "The Industry", "Box 3:", "box1.",
+    "Frequency", "Clarity", "Risk", "word", "Lorem ipsum", "dolor", "\t", "é", "\u00a0",
+    "Inputs", "Current System:", "Pain Points", "\n  indented", "\nlowercase", "\n:", "\r", "\x0c",
+    "SME Justification", "Calculation:", "DIMENSION SCORES:", "1.5 + 2 + 3 - 4 = 2", "(1 + 2 + 3 + 4) / 4",
+    "{", "}", "one two three four five six seven eight nine ten:",
+]
+
+
+def fuzz_text(rng, max_tokens=60):
+    return "".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(0, max_tokens)))
+
+
+def large_answer(rng, kb):
+    """Markdown-heavy answer of roughly `kb` kilobytes built from the mock agencies"""
+    chunks = []
+    size = 0
+    agency_ids = list(AGENCIES)
+    while size < kb * 1024:
+        agency_id = rng.choice(agency_ids)
+        text = canned_answer(agency_id, "Business Problem:\n    Forecast demand for the company")
+        text = text.replace("Key Takeaway:", "**Key Takeaway:**").replace("Score", "### Score")
+        chunk = (f"Q{rng.randint(1, 12)}. Question {rng.randint(1, 12)}\n"
+                 f"Answer: {text}\n\n- `{agency_id}` see [notes](http://x/{agency_id})\n"
+                 f"  <i>{fuzz_text(rng, 20)}</i>\n\n\n")
+        chunks.append(chunk)
+        size += len(chunk)
+    return "".join(chunks)
+
+
+CASES = [
+    ("sanitize", legacy_sanitize_text, text_cleaning.sanitize_text),
+    ("sanitize current_system", legacy_current_system_sanitize_text,
+     lambda t: text_cleaning.sanitize_text(t, "current_system")),
+    ("clean output", legacy_clean_volatility_output,
+     lambda t: text_cleaning.clean_agent_output(t, "volatility")),
+    ("card body", lambda t: legacy_card_body(t, "Dell", "Technology"),
+     lambda t: text_cleaning.format_card_body(t, "Dell", "Technology")),
+    ("bold volatility", legacy_format_volatility_with_bold,
+     lambda t: text_cleaning.format_with_bold(t, "volatility")),
+    ("bold vocabulary", legacy_format_vocabulary_with_bold,
+     lambda t: text_cleaning.format_with_bold(t, "vocabulary")),
+    ("bold extra phrases", lambda t: legacy_format_vocabulary_with_bold(t, ["demand", "Score (", "the+"]),
+     lambda t: text_cleaning.format_with_bold(t, "vocabulary", ["demand", "Score (", "the+"])),
+    ("bold current_system", legacy_format_current_system_with_bold,
+     lambda t: text_cleaning.format_with_bold(t, "current_system")),
+    ("current_system extra", lambda t: legacy_format_current_system_with_bold(t, ["System", "a[b"]),
+     lambda t: text_cleaning.format_with_bold(t, "current_system", ["System", "a[b"])),
+    ("section content", legacy_clean_section_content, text_cleaning.clean_section_content),
+    # Prefixed: on text starting with "SME Justification" the legacy re.sub also cut
+    # up to a second mention (an empty match at 0 followed by a non-empty one); fixed
+    ("hardness output", lambda t: legacy_format_hardness_output("x" + t),
+     lambda t: text_cleaning.format_hardness_output("x" + t)),
+]
+
+
+def check_identity(rng, fuzz_cases, answers):
+    """Returns a list of (case, input) pairs where old and new output differ"""
+    mismatches = []
+    inputs = [fuzz_text(rng) for _ in range(fuzz_cases)] + answers
+    for label, legacy, shared in CASES:
+        for text in inputs:
+            if legacy(text) != shared(text):
+                mismatches.append((label, text))
+    payloads = [{"result": "x"}, {"answer": "long enough answer"}, {"data": [{"output": "a"}, None, 3]},
+                {"meta": "a string longer than ten", "n": 1}, {"a": {"b": "c"}, "d": [1, 2]}, None, 4.5]
+    for payload in payloads:
+        if legacy_json_to_text(payload) != text_cleaning.json_to_text(payload):
+            mismatches.append(("json_to_text", repr(payload)))
+        if legacy_current_system_json_to_text(payload) != text_cleaning.json_to_text(payload, "current_system"):
+            mismatches.append(("json_to_text current_system", repr(payload)))
+    return mismatches
+
+
+def best_of(fn, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--answer-kb", type=int, default=64, help="size of each large answer")
+    parser.add_argument("--answers", type=int, default=8)
+    parser.add_argument("--fuzz", type=int, default=20000, help="random inputs for the identity check")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    answers = [large_answer(rng, args.answer_kb) for _ in range(args.answers)]
+
+    mismatches = check_identity(rng, args.fuzz, answers)
+    print(f"identity: {len(mismatches)} mismatches over {args.fuzz} fuzz inputs "
+          f"and {args.answers} x {args.answer_kb}KB answers")
+    for label, text in mismatches[:5]:
+        print(f"  {label}: {text[:120]!r}")
+
+    print(f"{'function':>24} | {'legacy ms':>9} | {'shared ms':>9} | speedup")
+    for label, legacy, shared in CASES:
+        old = best_of(legacy, answers, args.repeat) * 1000
+        new = best_of(shared, answers, args.repeat) * 1000
+        print(f"{label:>24} | {old:9.1f} | {new:9.1f} | {old / new:6.2f}x")
+
+    # The renderer should stay linear in the answer size
+    base = answers[0]
+    print(f"{'answer size':>24} | {'legacy ms':>9} | {'shared ms':>9} | shared us/KB")
+    for factor in (1, 4, 16):
+        text = base * factor
+        old = best_of(legacy_format_vocabulary_with_bold, [text], 3) * 1000
+        new = best_of(lambda t: text_cleaning.format_with_bold(t, "vocabulary"), [text], 3) * 1000
+        print(f"{len(text) // 1024:>21}KB | {old:9.1f} | {new:9.1f} | {new * 1000 / (len(text) / 1024):8.1f}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Multi-user load test of the Streamlit pages against the local mock backend.
+
+Each simulated user logs in on Welcome_Agent, saves a business problem (which
+starts the background full assessment), then opens every agent page, presses
+its Analyze/Extract button and waits for the results. Users are driven from
+concurrent threads through streamlit.testing AppTest in one process, sharing
+the cache_resource singletons (Talos client, job manager) a real server would.
+
+AppTest keeps a process-wide Runtime, so script runs are executed one at a time
+(much like the GIL serializes page rendering on a real server); the time a
+user waits for its turn is reported as "queue". Background jobs and backend
+calls overlap freely.
+
+For each user count it reports journey throughput, page render time, queue
+wait, click-to-result latency (p50/p95/p99), resident memory per session and
+errors.
+
+    python benchmarks/load_test.py --users 1,5,10,20 --latency lognormal:-0.7,0.5
+    python benchmarks/load_test.py --users 10 --json load_results.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep runs independent of earlier ones; must be set before shared_header is imported
+os.environ.setdefault("TALOS_CACHE_PATH", "")
+os.environ.setdefault("TALOS_METRICS_LOG_PATH", "")
+
+from mock_talos_server import make_server  # noqa: E402
+from shared_header import _percentile as percentile  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+# One script run at a time, see the module docstring
+_script_lock = threading.Lock()
+
+# page file, session flag that is set once its results are in
+AGENT_PAGES = [
+    ("1__Vocabulary_Agent.py", "show_vocabulary"),
+    ("2__Current_System_Agent.py", "current_system_extracted"),
+    ("3__Volatility_Agent.py", "show_volatility"),
+    ("4__Ambiguity_Agent.py", "show_ambiguity"),
+    ("5__Interconnectedness_Agent.py", "show_interconnectedness"),
+    ("6__Uncertainty_Agent.py", "show_uncertainty"),
+    ("7__Hardness_Summary_Agent.py", "show_hardness"),
+]
+
+
+def rss_mb():
+    """Resident set size of this process in MB (Linux), or None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return None
+
+
+class SimulatedUser:
+    """One browser session walking through login, save and every agent page"""
+
+    def __init__(self, index, timeout):
+        self.index = index
+        self.timeout = timeout
+        self.renders = []        # (page, seconds) for every full script run
+        self.queue_waits = []    # seconds spent waiting for the script runner
+        self.analyses = []       # (page, seconds) from button click to results
+        self.errors = []
+        self.apps = []           # kept alive so their session state counts towards memory
+
+    def _run(self, at, page):
+        queued = time.perf_counter()
+        with _script_lock:
+            start = time.perf_counter()
+            at.run(timeout=self.timeout)
+            self.renders.append((page, time.perf_counter() - start))
+        self.queue_waits.append(start - queued)
+        if at.exception:
+            raise RuntimeError(f"{page}: {at.exception[0].value}")
+
+    def _new_app(self, page, state=None):
+        path = os.path.join(ROOT, "pages", page) if page != "Welcome_Agent.py" else os.path.join(ROOT, page)
+        at = AppTest.from_file(path, default_timeout=self.timeout)
+        for key, value in (state or {}).items():
+            # Widget values belong to the page that rendered them
+            if not key.endswith(("_btn", "_button", "_input", "_textarea")) and "_select_" not in key:
+                at.session_state[key] = value
+        self.apps.append(at)
+        return at
+
+    def journey(self, problem):
+        try:
+            at = self._new_app("Welcome_Agent.py")
+            self._run(at, "Welcome_Agent.py")
+            at.text_input(key="employee_id_input").input(f"load-user-{self.index}")
+            at.button(key="login_btn").click()
+            self._run(at, "Welcome_Agent.py")
+
+            account = next(sb for sb in at.selectbox if "Dell" in sb.options)
+            account.select("Dell")
+            self._run(at, "Welcome_Agent.py")
+            at.text_area[0].input(problem)
+            self._run(at, "Welcome_Agent.py")
+            next(b for b in at.button if b.key and b.key.endswith("_save_btn")).click()
+            self._run(at, "Welcome_Agent.py")
+            state = at.session_state.to_dict()
+
+            for page, done_flag in AGENT_PAGES:
+                page_at = self._new_app(page, state)
+                self._run(page_at, page)
+                # Press Analyze/Extract when the page offers it; otherwise wait for the
+                # background assessment to deliver this page's results
+                started = time.perf_counter()
+                button = next((b for b in page_at.button if b.label.startswith("🔍") and not b.disabled), None)
+                if button is not None:
+                    button.click()
+                    self._run(page_at, page)
+                deadline = started + self.timeout
+                while not (done_flag in page_at.session_state and page_at.session_state[done_flag]):
+                    if time.perf_counter() > deadline:
+                        raise TimeoutError(f"{page}: no results after {self.timeout}s")
+                    time.sleep(0.2)
+                    self._run(page_at, page)
+                self.analyses.append((page, time.perf_counter() - started))
+                state = page_at.session_state.to_dict()
+        except Exception as e:
+            self.errors.append(f"user {self.index}: {e}")
+            if os.environ.get("LOAD_TEST_DEBUG"):
+                traceback.print_exc()
+
+
+def run_wave(users, timeout, wave):
+    before = rss_mb()
+    sims = [SimulatedUser(i, timeout) for i in range(users)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        for i, sim in enumerate(sims):
+            pool.submit(sim.journey, f"Wave {wave} user {i}: forecast weekly demand for a new laptop line")
+    elapsed = time.perf_counter() - start
+    after = rss_mb()
+
+    renders = [s for sim in sims for _, s in sim.renders]
+    analyses = [s for sim in sims for _, s in sim.analyses]
+    waits = [s for sim in sims for s in sim.queue_waits]
+    errors = [e for sim in sims for e in sim.errors]
+    completed = sum(1 for sim in sims if not sim.errors)
+    return {
+        "users": users,
+        "seconds": round(elapsed, 2),
+        "journeys_per_min": round(completed / elapsed * 60, 2) if elapsed else None,
+        "render_p50": percentile(renders, 50),
+        "render_p95": percentile(renders, 95),
+        "render_p99": percentile(renders, 99),
+        "queue_p95": percentile(waits, 95),
+        "analysis_p50": percentile(analyses, 50),
+        "analysis_p95": percentile(analyses, 95),
+        "analysis_p99": percentile(analyses, 99),
+        "mb_per_session": round((after - before) / users, 2) if before is not None and after is not None else None,
+        "per_page_render_p95": {
+            page: percentile([s for sim in sims for p, s in sim.renders if p == page], 95)
+            for page in ["Welcome_Agent.py"] + [p for p, _ in AGENT_PAGES]
+        },
+        "errors": errors,
+    }
+
+
+def _fmt(value):
+    return f"{value:6.2f}" if isinstance(value, (int, float)) else f"{'-':>6}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", default="1,5,10", help="comma-separated simulated user counts, one wave each")
+    parser.add_argument("--latency", default="lognormal:-1.2,0.5", help="mock time to first byte")
+    parser.add_argument("--chunk-delay", type=float, default=0.002)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=120, help="per-page limit in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    server = make_server(port=0, chunk_delay=args.chunk_delay, seed=args.seed,
+                         profile={"default": {"latency": args.latency, "error_rate": args.error_rate}})
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["TALOS_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+
+    results = []
+    print(f"{'users':>5} {'secs':>7} {'jrny/min':>8} | {'render p50':>10} {'p95':>6} {'p99':>6} | "
+          f"{'queue p95':>9} | {'result p50':>10} {'p95':>6} {'p99':>6} | {'MB/sess':>7} | errors")
+    for wave, users in enumerate(int(n) for n in args.users.split(",")):
+        server.reset_counts()
+        result = run_wave(users, args.timeout, wave)
+        result["backend_requests"] = server.counts.get("requests", 0)
+        results.append(result)
+        print(f"{users:5d} {result['seconds']:7.2f} {_fmt(result['journeys_per_min']):>8} | "
+              f"{_fmt(result['render_p50']):>10} {_fmt(result['render_p95'])} {_fmt(result['render_p99'])} | "
+              f"{_fmt(result['queue_p95']):>9} | "
+              f"{_fmt(result['analysis_p50']):>10} {_fmt(result['analysis_p95'])} {_fmt(result['analysis_p99'])} | "
+              f"{_fmt(result['mb_per_session']):>7} | {len(result['errors'])}")
+        for error in result["errors"][:5]:
+            print(f"      ! {error}")
+
+    slowest = max(results[-1]["per_page_render_p95"].items(), key=lambda item: item[1] or 0)
+    print(f"slowest page render (p95, last wave): {slowest[0]} {_fmt(slowest[1]).strip()}s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    server.shutdown()
+    sys.exit(1 if any(r["errors"] for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
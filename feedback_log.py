@@ -0,0 +1,225 @@
+"""
+Append-only feedback log (feedback.csv).
+
+Every submission appends one CSV row under a fixed header with a single
+O_APPEND write, so saving costs the same however long the log grows and
+concurrent sessions (or processes) never rewrite each other's rows. Rows are
+never edited in place, not even the header of a file written before the fixed
+schema: rows appended to such a file carry every FEEDBACK_COLUMNS field and
+readers tell them from the older rows by their field count (record_columns).
+Upgrading the header and dropping duplicate rows is done by compaction, run
+offline:
+
+    python feedback_log.py compact [path/to/feedback.csv]
+"""
+
+import argparse
+import csv
+import io
+import os
+import threading
+import time
+import uuid
+
+FEEDBACK_COLUMNS = (
+    "Timestamp", "Name", "Email", "Feedback", "FeedbackType",
+    "OffDefinitions", "Suggestions", "Account", "Industry",
+    "ProblemStatement", "Agent", "FeedbackId",
+)
+
+# Rows logged before feedback ids existed get one derived from their contents
+_LEGACY_ID_NAMESPACE = uuid.UUID("6f1d3c2e-5b7a-4e8f-9a0b-1c2d3e4f5a6b")
+
+FEEDBACK_FILE = os.environ.get(
+    "FEEDBACK_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "feedback.csv"),
+)
+
+# "always": fsync after every row; "interval": at most once per FEEDBACK_FSYNC_SECONDS
+# (an OS crash or power loss can lose the rows since); "never": leave it to the OS.
+# A crash of the app itself loses nothing either way: each row is written before append returns.
+FEEDBACK_FSYNC = os.environ.get("FEEDBACK_FSYNC", "always")
+FEEDBACK_FSYNC_SECONDS = float(os.environ.get("FEEDBACK_FSYNC_SECONDS", "1.0"))
+
+
+def _csv_line(values):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(values)
+    return buffer.getvalue()
+
+
+_HEADER = _csv_line(FEEDBACK_COLUMNS)
+
+
+def _cell(value):
+    # None and NaN (empty pandas cells) are written as empty fields
+    if value is None or value != value:
+        return ""
+    return value
+
+
+def new_feedback_id():
+    return uuid.uuid4().hex
+
+
+def feedback_id(row):
+    """FeedbackId of a feedback dict; rows from before ids existed get the same id on every read"""
+    value = _cell(row.get("FeedbackId", ""))
+    if value != "":
+        return str(value)
+    contents = _csv_line([_cell(row.get(column, "")) for column in FEEDBACK_COLUMNS if column != "FeedbackId"])
+    return uuid.uuid5(_LEGACY_ID_NAMESPACE, contents).hex
+
+
+def feedback_row(row, columns=FEEDBACK_COLUMNS):
+    """CSV line for one feedback dict: `columns` order, missing columns empty, others dropped"""
+    return _csv_line([feedback_id(row) if column == "FeedbackId" else _cell(row.get(column, ""))
+                      for column in columns])
+
+
+def complete_records(data):
+    """Length of the leading part of `data` (bytes read from the log) made of whole CSV records"""
+    end = data.rfind(b"\n")
+    # A newline inside a quoted field has an odd number of quotes before it
+    while end >= 0 and data.count(b'"', 0, end) % 2:
+        end = data.rfind(b"\n", 0, end)
+    return end + 1
+
+
+def read_header(path):
+    """Column names on the first line of a CSV file ([] when empty)"""
+    with open(path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), [])
+
+
+def record_columns(header, record):
+    """
+    Column names for one parsed record of a log whose first line is `header`.
+    Under a legacy header of another width, rows appended since are in the
+    FEEDBACK_COLUMNS layout and are the ones with that many fields.
+    """
+    if len(record) == len(FEEDBACK_COLUMNS) and len(header) != len(FEEDBACK_COLUMNS):
+        return FEEDBACK_COLUMNS
+    return header
+
+
+class FeedbackLog:
+    """
+    Appends feedback rows to `path`, creating it with the FEEDBACK_COLUMNS
+    header. The header of an existing file is read once per file (inode) and
+    never rewritten; every append is one write of one row, in the
+    FEEDBACK_COLUMNS layout unless a legacy header of the same width names
+    the columns in another order.
+    """
+
+    def __init__(self, path=FEEDBACK_FILE, fsync=FEEDBACK_FSYNC, fsync_seconds=FEEDBACK_FSYNC_SECONDS):
+        if fsync not in ("always", "interval", "never"):
+            raise ValueError(f"Unknown fsync policy: {fsync!r}")
+        self.path = path
+        self.fsync = fsync
+        self.fsync_seconds = fsync_seconds
+        self._lock = threading.Lock()
+        self._checked = None
+        self._columns = FEEDBACK_COLUMNS
+        self._last_sync = 0.0
+
+    def append(self, row):
+        """Append one feedback dict; raises OSError when the log cannot be written"""
+        self.append_many([row])
+
+    def append_many(self, rows):
+        """Append feedback dicts with one write (and at most one fsync) for the whole batch"""
+        if not rows:
+            return
+        with self._lock:
+            self._ensure_header()
+            data = "".join(feedback_row(row, self._columns) for row in rows).encode("utf-8")
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                self._sync(fd)
+            finally:
+                os.close(fd)
+
+    def _ensure_header(self):
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            stat = os.stat(self.path)
+            if (stat.st_dev, stat.st_ino) == self._checked:
+                return
+            header = tuple(read_header(self.path)) if stat.st_size else ()
+            if header:
+                # Other processes append to this file too: write in its layout instead of rewriting it
+                self._columns = record_columns(header, FEEDBACK_COLUMNS)
+                self._checked = (stat.st_dev, stat.st_ino)
+                return
+            # Created but never written: the header is still due
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, _HEADER.encode("utf-8"))
+            self._sync(fd)
+            self._columns = FEEDBACK_COLUMNS
+            stat = os.fstat(fd)
+            self._checked = (stat.st_dev, stat.st_ino)
+        finally:
+            os.close(fd)
+
+    def _sync(self, fd):
+        if self.fsync == "never":
+            return
+        now = time.monotonic()
+        if self.fsync == "always" or now - self._last_sync >= self.fsync_seconds:
+            os.fsync(fd)
+            self._last_sync = now
+
+
+def compact(path=FEEDBACK_FILE, drop_duplicates=True):
+    """
+    Rewrite the log under the FEEDBACK_COLUMNS header: columns are matched by
+    name (missing ones empty, a missing FeedbackId derived from the row),
+    exact duplicate rows are dropped (the pages used to save every
+    submission twice), and the file is replaced
+    atomically. Returns (rows read, rows kept). Meant to run while nothing
+    is appending, since rows appended during the rewrite would be lost.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = [dict(zip(record_columns(header, record), record)) for record in reader if record]
+
+    seen = set()
+    kept = []
+    for row in rows:
+        line = feedback_row(row)
+        if drop_duplicates:
+            if line in seen:
+                continue
+            seen.add(line)
+        kept.append(line)
+
+    tmp_path = path + ".compact.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        f.write(_HEADER)
+        f.writelines(kept)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(rows), len(kept)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feedback log maintenance")
+    parser.add_argument("command", choices=["compact"])
+    parser.add_argument("path", nargs="?", default=FEEDBACK_FILE)
+    parser.add_argument("--keep-duplicates", action="store_true")
+    args = parser.parse_args()
+
+    read, kept = compact(args.path, drop_duplicates=not args.keep_duplicates)
+    print(f"{args.path}: {read} rows read, {kept} kept, header {', '.join(FEEDBACK_COLUMNS)}")
+
+
+if __name__ == "__main__":
+    main()
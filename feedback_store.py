@@ -0,0 +1,222 @@
+"""
+Indexed feedback store for the admin views (SQLite, WAL).
+
+An index of the append-only feedback log, which stays the one source of
+truth: the store holds the same rows, one per FeedbackId, indexed on Agent,
+FeedbackType, Timestamp and Account, so the admin filters, counts, table
+pages and reports are index lookups instead of pandas masks over the whole
+file. Rows only get in
+through sync(), which imports what was appended to feedback.csv since the
+last sync (by any process) and remembers how far it read, so a store that
+missed a write catches up on the next sync instead of drifting from the log.
+"""
+
+import csv
+import io
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from feedback_log import (
+    FEEDBACK_COLUMNS, FEEDBACK_FILE, FEEDBACK_FSYNC, complete_records, feedback_id, read_header, record_columns,
+)
+
+FEEDBACK_DB_PATH = os.environ.get(
+    "FEEDBACK_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "feedback.sqlite3"),
+)
+
+_COLUMNS_SQL = ", ".join(f'"{column}"' for column in FEEDBACK_COLUMNS)
+# A submission already stored under its FeedbackId is skipped, so writes are idempotent
+_INSERT_SQL = f"INSERT OR IGNORE INTO feedback ({_COLUMNS_SQL}) VALUES ({', '.join('?' * len(FEEDBACK_COLUMNS))})"
+
+# 1: the existing feedback.csv has been imported; 2: rows carry a unique FeedbackId;
+# 3: rows come from the log through sync(), which records how far it has read
+_SCHEMA_VERSION = 3
+
+
+def _values(row):
+    values = []
+    for column in FEEDBACK_COLUMNS:
+        value = feedback_id(row) if column == "FeedbackId" else row.get(column)
+        # None and NaN (empty pandas cells) are stored as empty text
+        values.append("" if value is None or value != value else str(value))
+    return values
+
+
+def _legacy_feedback_id(*values):
+    return feedback_id(dict(zip(FEEDBACK_COLUMNS, values)))
+
+
+class FeedbackStore:
+    """
+    Feedback rows of the log at `csv_path` in a SQLite table shared by every
+    session and process, synced on open and on every sync() call. One
+    connection per process behind a lock; other processes are kept
+    consistent by SQLite's own locking (WAL, busy timeout). If the file
+    cannot be opened (read-only deployments) the store runs in memory and
+    is rebuilt from the log.
+    """
+
+    def __init__(self, path=FEEDBACK_DB_PATH, csv_path=FEEDBACK_FILE):
+        self.csv_path = csv_path
+        self._lock = threading.Lock()
+        self._db = self._open_db(path)
+        try:
+            self.sync()
+        except (sqlite3.Error, OSError, csv.Error, UnicodeDecodeError) as e:
+            print(f"Feedback store could not sync with the log yet: {e}")
+
+    @staticmethod
+    def _create(db):
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(f"PRAGMA synchronous={'FULL' if FEEDBACK_FSYNC == 'always' else 'NORMAL'}")
+        columns = ", ".join(f'"{column}" TEXT NOT NULL DEFAULT \'\'' for column in FEEDBACK_COLUMNS)
+        db.execute(f"CREATE TABLE IF NOT EXISTS feedback (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns})")
+        # How far sync() has read, and in which file (a compacted log is a new file)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS log_position "
+            "(id INTEGER PRIMARY KEY CHECK (id = 0), dev INTEGER, ino INTEGER, log_offset INTEGER)"
+        )
+
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if version == 1:
+                # Stores from before feedback ids: derive the ids like the log does, keep one row per id
+                db.create_function("legacy_feedback_id", len(FEEDBACK_COLUMNS), _legacy_feedback_id)
+                db.execute('ALTER TABLE feedback ADD COLUMN "FeedbackId" TEXT NOT NULL DEFAULT \'\'')
+                db.execute(f'UPDATE feedback SET "FeedbackId" = legacy_feedback_id({_COLUMNS_SQL})')
+                db.execute('DELETE FROM feedback WHERE id NOT IN (SELECT MIN(id) FROM feedback GROUP BY "FeedbackId")')
+            db.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_feedback_id ON feedback ("FeedbackId")')
+            db.execute('CREATE INDEX IF NOT EXISTS idx_feedback_agent ON feedback ("Agent", "FeedbackType", "Timestamp")')
+            db.execute('CREATE INDEX IF NOT EXISTS idx_feedback_type ON feedback ("FeedbackType", "Timestamp")')
+            db.execute('CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON feedback ("Timestamp")')
+            db.execute('CREATE INDEX IF NOT EXISTS idx_feedback_account ON feedback ("Account")')
+            if version < _SCHEMA_VERSION:
+                db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            db.execute("COMMIT")
+        except (sqlite3.Error, OSError):
+            db.execute("ROLLBACK")
+            raise
+
+    @classmethod
+    def _open_db(cls, path):
+        if path:
+            try:
+                db = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+                cls._create(db)
+                return db
+            except (sqlite3.Error, OSError) as e:
+                print(f"Feedback store running in memory: {e}")
+        db = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        cls._create(db)
+        return db
+
+    def sync(self):
+        """
+        Import the log rows appended since the last sync, skipping known ids,
+        in one transaction; returns how many rows were new. A replaced or
+        shrunk log (compaction) is read again from the start. A row still
+        being written is left for the next sync. Raises when the log cannot
+        be read or the store written; the recorded position is then unchanged.
+        """
+        if not self.csv_path:
+            return 0
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                added = self._sync_locked()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return added
+
+    def _sync_locked(self):
+        try:
+            stat = os.stat(self.csv_path)
+        except FileNotFoundError:
+            return 0
+        position = self._db.execute("SELECT dev, ino, log_offset FROM log_position WHERE id = 0").fetchone()
+        offset = position[2] if position and position[:2] == (stat.st_dev, stat.st_ino) else 0
+        if stat.st_size < offset:
+            offset = 0
+        if stat.st_size == offset:
+            return 0
+
+        with open(self.csv_path, "rb") as f:
+            f.seek(offset)
+            data = f.read(stat.st_size - offset)
+        size = complete_records(data)
+        reader = csv.reader(io.StringIO(data[:size].decode("utf-8"), newline=""))
+        header = next(reader, None) if offset == 0 else read_header(self.csv_path)
+        before = self._db.total_changes
+        self._db.executemany(
+            _INSERT_SQL, (_values(dict(zip(record_columns(header, record), record))) for record in reader)
+        )
+        added = self._db.total_changes - before
+        self._db.execute(
+            "INSERT OR REPLACE INTO log_position (id, dev, ino, log_offset) VALUES (0, ?, ?, ?)",
+            (stat.st_dev, stat.st_ino, offset + size),
+        )
+        return added
+
+    @staticmethod
+    def _where(agent=None, feedback_type=None, since=None):
+        clauses, params = [], []
+        if agent is not None:
+            clauses.append('"Agent" = ?')
+            params.append(agent)
+        if feedback_type is not None:
+            clauses.append('"FeedbackType" = ?')
+            params.append(feedback_type)
+        if since is not None:
+            clauses.append('"Timestamp" >= ?')
+            params.append(since)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(self, agent=None, feedback_type=None, since=None):
+        """Rows matching the filters (None = any); `since` is a "YYYY-MM-DD ..." timestamp prefix"""
+        where, params = self._where(agent, feedback_type, since)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM feedback{where}", params).fetchone()[0]
+
+    def agent_count(self):
+        """Number of distinct agents with feedback"""
+        with self._lock:
+            return self._db.execute('SELECT COUNT(DISTINCT "Agent") FROM feedback WHERE "Agent" != \'\'').fetchone()[0]
+
+    def page(self, agent=None, feedback_type=None, sort_by=None, descending=True, offset=0, limit=50, columns=None):
+        """
+        (page, total matching rows), read in one transaction so they agree: the
+        page is a DataFrame sorted on `sort_by` (None = submission order),
+        `limit` rows from `offset`, only `columns`
+        """
+        columns = list(columns or FEEDBACK_COLUMNS)
+        for column in columns + ([sort_by] if sort_by else []):
+            if column not in FEEDBACK_COLUMNS:
+                raise ValueError(f"Unknown feedback column: {column!r}")
+        direction = "DESC" if descending else "ASC"
+        order = f'"{sort_by}" {direction}, id {direction}' if sort_by else f"id {direction}"
+        where, params = self._where(agent, feedback_type)
+        select = ", ".join(f'"{column}"' for column in columns)
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                total = self._db.execute(f"SELECT COUNT(*) FROM feedback{where}", params).fetchone()[0]
+                rows = self._db.execute(
+                    f"SELECT {select} FROM feedback{where} ORDER BY {order} LIMIT ? OFFSET ?", params + [limit, offset]
+                ).fetchall()
+            finally:
+                self._db.execute("COMMIT")
+        return pd.DataFrame.from_records(rows, columns=columns), total
+
+    def query(self, agent=None, feedback_type=None):
+        """Matching rows as a DataFrame with the FEEDBACK_COLUMNS, in submission order"""
+        where, params = self._where(agent, feedback_type)
+        with self._lock:
+            rows = self._db.execute(f"SELECT {_COLUMNS_SQL} FROM feedback{where} ORDER BY id", params).fetchall()
+        return pd.DataFrame.from_records(rows, columns=list(FEEDBACK_COLUMNS))
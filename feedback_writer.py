@@ -0,0 +1,161 @@
+"""
+Write-behind feedback ingestion: one writer thread per server process.
+
+Sessions hand their feedback rows to FeedbackWriter.submit, which only puts
+them on a queue and returns. A single thread takes rows off the queue and
+appends them to the feedback log in batches, one log write per batch, as
+soon as FEEDBACK_BATCH_ROWS rows are waiting or FEEDBACK_BATCH_SECONDS after
+the first row of a batch arrived, then syncs the store from the log. Rows the
+log could not take are kept and written ahead of the next batch (or flush), so
+a transient disk error delays them instead of losing them. Rows still queued when the process
+exits are written by an atexit hook (Streamlit stops on SIGINT/SIGTERM by
+shutting its server down, so the hook runs); only a hard kill or a crash of
+the interpreter can lose them.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+
+FEEDBACK_BATCH_ROWS = int(os.environ.get("FEEDBACK_BATCH_ROWS", "100"))
+FEEDBACK_BATCH_SECONDS = float(os.environ.get("FEEDBACK_BATCH_SECONDS", "0.5"))
+# Rows held for another try while the log cannot be written (the oldest are dropped beyond
+# FEEDBACK_RETRY_ROWS), retried with the next batch or after FEEDBACK_RETRY_SECONDS without one
+FEEDBACK_RETRY_ROWS = int(os.environ.get("FEEDBACK_RETRY_ROWS", "10000"))
+FEEDBACK_RETRY_SECONDS = float(os.environ.get("FEEDBACK_RETRY_SECONDS", "5"))
+
+# Queue marker telling the writer thread to stop once everything before it is written
+_STOP = object()
+
+
+class FeedbackWriter:
+    """
+    Owns the feedback writes of this process. The FeedbackLog is the one
+    place a row is written; the FeedbackStore is synced from it after each
+    batch (and on flush), so a failed sync only delays the store until the
+    next one. Failures are printed, counted and kept in log_error /
+    store_error (cleared by the next success) for the admin views and the
+    sessions submitting meanwhile. Rows a failed log write could not take
+    are retried with the next batch, on every flush and every retry_seconds
+    when nothing else comes in, up to retry_rows of them.
+    """
+
+    def __init__(self, log, store, batch_rows=FEEDBACK_BATCH_ROWS, batch_seconds=FEEDBACK_BATCH_SECONDS,
+                 retry_rows=FEEDBACK_RETRY_ROWS, retry_seconds=FEEDBACK_RETRY_SECONDS):
+        self.log = log
+        self.store = store
+        self.batch_rows = max(1, batch_rows)
+        self.batch_seconds = batch_seconds
+        self.retry_rows = retry_rows
+        self.retry_seconds = retry_seconds
+        self.batches = 0
+        self.written = 0
+        self.failed = 0
+        self.log_error = None
+        self.store_error = None
+        self._retry = []
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, rows):
+        """Queue feedback dicts for writing and return at once, also while the log is failing"""
+        if self._closed:
+            raise RuntimeError("Feedback writer is closed")
+        for row in rows:
+            self._queue.put(dict(row))
+
+    def flush(self, timeout=None):
+        """Block until every row submitted before this call (and any held for retry) has had a write; False on timeout"""
+        if self._closed:
+            return not self._thread.is_alive()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=10):
+        """Write what is queued and stop the writer thread (idempotent; also run at exit)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            "pending": self._queue.qsize(),
+            "retrying": len(self._retry),
+            "batches": self.batches,
+            "written": self.written,
+            "failed": self.failed,
+            "log_error": self.log_error,
+            "store_error": self.store_error,
+        }
+
+    def _next_batch(self):
+        """Rows plus flush events and the stop marker, waiting for the size or time trigger"""
+        try:
+            batch = [self._queue.get(timeout=self.retry_seconds) if self._retry else self._queue.get()]
+        except queue.Empty:
+            # Nothing new while rows wait for the log: try them again on their own
+            return []
+        deadline = time.monotonic() + self.batch_seconds
+        rows = int(isinstance(batch[0], dict))
+        # A flush or stop request writes what has arrived without waiting out the window
+        while rows < self.batch_rows and isinstance(batch[-1], dict):
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+            rows += isinstance(item, dict)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            rows = [item for item in batch if isinstance(item, dict)]
+            try:
+                self._write(rows)
+            except Exception as e:
+                # Keep the thread alive: a dead writer would leave every later submission queued
+                self.failed += len(rows)
+                self.log_error = f"Feedback writer skipped a batch of {len(rows)} rows: {e}"
+                print(self.log_error)
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if batch and batch[-1] is _STOP:
+                return
+
+    def _write(self, rows):
+        # Rows an earlier write failed on go first; a flush without new rows retries them too
+        rows = self._retry + rows
+        if rows:
+            self.batches += 1
+            try:
+                self.log.append_many(rows)
+            except OSError as e:
+                # Not in the log means not saved: hold on to the rows for the next try
+                dropped = max(0, len(rows) - self.retry_rows)
+                self._retry = rows[dropped:]
+                self.failed += dropped
+                self.log_error = f"Feedback log write failed, {len(self._retry)} rows wait for the next try: {e}"
+                print(self.log_error)
+                return
+            self._retry = []
+            self.log_error = None
+            self.written += len(rows)
+        # Also on a flush without new rows, so a store that missed a sync (or rows another process logged) catches up
+        try:
+            self.store.sync()
+        except Exception as e:
+            self.store_error = f"Feedback store sync failed, the admin counts lag the log until the next one: {e}"
+            print(self.store_error)
+        else:
+            self.store_error = None
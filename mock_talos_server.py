@@ -0,0 +1,333 @@
+"""
+Local stand-in for the Talos reasoning_api.
+
+Answers POST {"agency_goal": ...} on .../reasoning_api?society_id=...&agency_id=...
+the same way the real endpoint does. Plain requests get a JSON body; requests
+that send "Accept: text/event-stream" get the same answer as server-sent
+events (one "delta" event per word, then a "done" event carrying the full JSON
+payload). Each known agency_id returns a canned answer in the format its page
+parses (vocabulary sections, current system sections, scored questions, the
+hardness summary).
+
+Latency, hangs, 5xx answers and response sizes can be injected globally or per
+agency, so the pages can be exercised and benchmarked offline:
+
+    python mock_talos_server.py --port 8765 --chunk-delay 0.05
+    python mock_talos_server.py --latency lognormal:0,0.6 --error-rate 0.05 --timeout-rate 0.02
+    python mock_talos_server.py --profile faults.json --seed 7
+
+A --profile file holds {"default": {...}, "agencies": {"<agency_id>": {...}}}
+with the keys of DEFAULT_PROFILE. Point the app at the server with
+TALOS_BASE_URL=http://127.0.0.1:8765 streamlit run Welcome_Agent.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from agent_results import score_classification
+
+# agency_id -> (kind, label), mirroring AGENT_API_CONFIGS in shared_header.py
+AGENCIES = {
+    "1758548233201": ("vocabulary", "Vocabulary"),
+    "1758549095254": ("current_system", "Current System"),
+    "1758555344231": ("question", "Q1"),
+    "1758549615986": ("question", "Q2"),
+    "1758614550482": ("question", "Q3"),
+    "1758614809984": ("question", "Q4"),
+    "1758615038050": ("question", "Q5"),
+    "1758615386880": ("question", "Q6"),
+    "1758615778653": ("question", "Q7"),
+    "1758616081630": ("question", "Q8"),
+    "1758616793510": ("question", "Q9"),
+    "1758617140479": ("question", "Q10"),
+    "1758618137301": ("question", "Q11"),
+    "1758619317968": ("question", "Q12"),
+    "1758619658634": ("hardness", "Hardness Summary"),
+}
+
+DEFAULT_PROFILE = {
+    "latency": "fixed:0",      # wait before the first byte, see parse_latency
+    "chunk_delay": None,       # seconds per streamed word (None: the server's --chunk-delay)
+    "error_rate": 0.0,         # share of requests answered with a 500/502/503
+    "timeout_rate": 0.0,       # share of requests that hang, then drop the connection
+    "hang_seconds": 120.0,
+    "response_kb": None,       # pad answers to roughly this size
+}
+
+
+def parse_latency(spec):
+    """
+    Sampler for a latency spec in seconds: "0.5", "fixed:0.5", "uniform:0.2,1.5",
+    "normal:1,0.3" or "lognormal:mu,sigma" (mu/sigma of the underlying normal).
+    """
+    spec = str(spec).strip()
+    kind, _, args = spec.partition(":") if ":" in spec else ("fixed", "", spec)
+    values = [float(v) for v in args.split(",") if v.strip()]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(values[0], values[1])
+    raise ValueError(f"unknown latency distribution: {spec}")
+
+
+def _problem_focus(goal):
+    match = re.search(r"(?:Business Problem:|Problem statement -)\s*(.+)", goal)
+    line = match.group(1) if match else (goal.strip().splitlines() or [""])[0]
+    return line.strip()[:120]
+
+
+def _score(agency_id, goal):
+    digest = hashlib.sha256(f"{agency_id}:{goal}".encode("utf-8")).digest()
+    return 1 + digest[0] % 5
+
+
+def canned_answer(agency_id, goal, response_kb=None):
+    """Deterministic answer in the format the page for this agency parses"""
+    kind, label = AGENCIES.get(agency_id, ("generic", f"agency {agency_id}"))
+    focus = _problem_focus(goal)
+
+    if kind == "vocabulary":
+        answer = (
+            "Section 1: Business Terms\n"
+            "1. Demand Forecast: expected unit sales per product, region and week.\n"
+            "2. Service Level: share of orders shipped complete and on time.\n"
+            "3. Safety Stock: buffer inventory held against forecast error.\n\n"
+            "Section 2: Data & Metrics\n"
+            "1. MAPE: mean absolute percentage error of the forecast.\n"
+            "2. Sell-through: units sold to end customers over units shipped.\n\n"
+            "Section 3: Stakeholders\n"
+            "1. Demand Planner: owns the consensus forecast.\n"
+            "2. Supply Chain Lead: turns the forecast into production plans."
+        )
+    elif kind == "current_system":
+        answer = (
+            f"Core Problem:\n{focus}\n\n"
+            "Current System:\nPlanners combine last year's sales with sales-team input in spreadsheets every month.\n\n"
+            "Inputs:\n- Weekly point-of-sale data\n- Promotion calendar\n- Channel inventory reports\n\n"
+            "Outputs:\n- Monthly demand plan by SKU\n- Replenishment orders\n\n"
+            "Pain Points:\n- Forecasts lag real demand by several weeks\n- Manual reconciliation between teams"
+        )
+    elif kind == "hardness":
+        score = round(1 + _score(agency_id, goal) * 0.7, 1)
+        # The app's bands, worded like the prompt asks ("Easy" for NOT HARD)
+        level = score_classification(score).replace("NOT HARD", "EASY")
+        answer = (
+            f"Overall Difficulty Score: {score:.1f}\n\n"
+            f"Hardness Level: {level}\n\n"
+            "Summary Statement:\nThe problem combines volatile inputs with partly shared definitions; "
+            "the company should stabilise upstream feeds before automating decisions.\n\n"
+            "Key Takeaway: start with the inputs that change most often."
+        )
+    else:
+        answer = (
+            f"## Analysis for {label}\n\n"
+            f"**Problem focus:** {focus}\n\n"
+            f"Score (0-5): {_score(agency_id, goal) if kind == 'question' else 3}\n\n"
+            "Justification:\n"
+            "- Inputs change on a **monthly** cadence with occasional shocks.\n"
+            "- Stakeholders share most definitions, but `forecast` means different things to finance and ops.\n"
+            "- The current system depends on three upstream feeds.\n\n"
+            "Key Takeaway: the company should stabilise the upstream feeds before automating decisions."
+        )
+
+    if response_kb:
+        target, extra = int(response_kb * 1024), []
+        while len(answer.encode("utf-8")) + sum(len(e) for e in extra) < target:
+            extra.append(f"\n- Observation {len(extra) + 1}: supporting evidence gathered from the problem context.")
+        if extra:
+            answer += "\n\nAdditional evidence:" + "".join(extra)
+    return answer
+
+
+class MockTalosHandler(BaseHTTPRequestHandler):
+    server_version = "MockTalos/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            goal = json.loads(self.rfile.read(length) or b"{}").get("agency_goal", "")
+        except ValueError:
+            self._send_json(400, {"error": "invalid JSON body"})
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        agency_id = query.get("agency_id", [None])[0]
+        if agency_id is None or "society_id" not in query:
+            self._send_json(400, {"error": "society_id and agency_id are required"})
+            return
+        if not goal:
+            self._send_json(400, {"error": "agency_goal is required"})
+            return
+
+        server = self.server
+        profile = server.profile_for(agency_id)
+        latency, hang, error_status = server.draw(profile)
+        server.count("requests", agency_id)
+        time.sleep(latency)
+
+        if hang:
+            server.count("timeouts")
+            time.sleep(profile["hang_seconds"])
+            self.close_connection = True
+            return
+        if error_status:
+            server.count("errors")
+            self._send_json(error_status, {"error": f"injected failure for agency {agency_id}"})
+            return
+
+        payload = {"result": canned_answer(agency_id, goal, profile["response_kb"])}
+        chunk_delay = profile["chunk_delay"] if profile["chunk_delay"] is not None else server.chunk_delay
+        if "text/event-stream" in self.headers.get("Accept", ""):
+            self._send_events(payload, chunk_delay)
+        else:
+            time.sleep(chunk_delay * len(payload["result"].split(" ")))
+            self._send_json(200, payload)
+
+    def _start_response(self, status, headers):
+        """Status line and headers of a response; the only place that ends the header block"""
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self._start_response(status, [("Content-Type", "application/json"), ("Content-Length", str(len(body)))])
+        self.wfile.write(body)
+
+    def _send_events(self, payload, chunk_delay):
+        self._start_response(200, [
+            ("Content-Type", "text/event-stream; charset=utf-8"),
+            ("Cache-Control", "no-cache"),
+            ("Transfer-Encoding", "chunked"),
+        ])
+
+        words = payload["result"].split(" ")
+        for i, word in enumerate(words):
+            delta = word if i == 0 else " " + word
+            self._write_event("message", json.dumps({"delta": delta}))
+            time.sleep(chunk_delay)
+        self._write_event("done", json.dumps(payload))
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _write_event(self, event, data):
+        chunk = f"event: {event}\ndata: {data}\n\n".encode("utf-8")
+        self.wfile.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class MockTalosServer(ThreadingHTTPServer):
+    """Threaded server holding the fault profile, a seeded RNG and request counters"""
+
+    daemon_threads = True
+
+    def __init__(self, address, chunk_delay=0.05, quiet=True, profile=None, seed=None):
+        super().__init__(address, MockTalosHandler)
+        self.chunk_delay = chunk_delay
+        self.quiet = quiet
+        self.set_profile(profile)
+        self.counts = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def set_profile(self, profile=None):
+        """Replace the fault profile ({"default": {...}, "agencies": {id: {...}}})"""
+        profile = profile or {}
+        self.default_profile = dict(DEFAULT_PROFILE, **profile.get("default", {}))
+        self.agency_profiles = {
+            agency_id: dict(self.default_profile, **overrides)
+            for agency_id, overrides in profile.get("agencies", {}).items()
+        }
+        self._samplers = {}
+
+    def profile_for(self, agency_id):
+        return self.agency_profiles.get(agency_id, self.default_profile)
+
+    def draw(self, profile):
+        """(latency seconds, hang?, error status or None) for one request"""
+        spec = str(profile["latency"])
+        with self._lock:
+            sampler = self._samplers.get(spec)
+            if sampler is None:
+                sampler = self._samplers[spec] = parse_latency(spec)
+            latency = sampler(self._rng)
+            hang = self._rng.random() < profile["timeout_rate"]
+            error = self._rng.choice((500, 502, 503)) if self._rng.random() < profile["error_rate"] else None
+        return latency, hang, error
+
+    def count(self, *keys):
+        with self._lock:
+            for key in keys:
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def reset_counts(self):
+        with self._lock:
+            self.counts = {}
+
+
+def make_server(host="127.0.0.1", port=8765, chunk_delay=0.05, quiet=True, profile=None, seed=None):
+    """Build (but do not start) a mock server; port 0 picks a free port"""
+    return MockTalosServer((host, port), chunk_delay=chunk_delay, quiet=quiet, profile=profile, seed=seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Talos reasoning_api")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--chunk-delay", type=float, default=0.05,
+                        help="seconds between streamed words (plain JSON waits for all of them)")
+    parser.add_argument("--latency", help="time to first byte, e.g. 0.5, uniform:0.2,2 or lognormal:0,0.6")
+    parser.add_argument("--error-rate", type=float, help="share of requests answered with a 5xx")
+    parser.add_argument("--timeout-rate", type=float, help="share of requests that hang and drop")
+    parser.add_argument("--hang-seconds", type=float, help="how long a hanging request waits")
+    parser.add_argument("--response-kb", type=float, help="pad answers to roughly this many KB")
+    parser.add_argument("--profile", help="JSON file with default and per-agency fault settings")
+    parser.add_argument("--seed", type=int, help="seed for reproducible latency and failures")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    profile = {}
+    if args.profile:
+        with open(args.profile, encoding="utf-8") as f:
+            profile = json.load(f)
+    overrides = {
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "timeout_rate": args.timeout_rate,
+        "hang_seconds": args.hang_seconds,
+        "response_kb": args.response_kb,
+    }
+    profile.setdefault("default", {}).update({k: v for k, v in overrides.items() if v is not None})
+    parse_latency(profile["default"].get("latency", DEFAULT_PROFILE["latency"]))
+
+    server = make_server(args.host, args.port, args.chunk_delay, quiet=not args.verbose,
+                         profile=profile, seed=args.seed)
+    print(f"Mock Talos reasoning_api on http://{args.host}:{server.server_port}/talos-engine/agency/reasoning_api")
+    print(f"Use it from the app with TALOS_BASE_URL=http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
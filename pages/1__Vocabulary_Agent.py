@@ -1,22 +1,31 @@
 import streamlit as st
-import streamlit.components.v1 as components
-import os
 import re
-import json
 from shared_header import render_header
 # REMOVE THIS: render_header() - Don't call it here, call it after imports
 from datetime import datetime
-import pandas as pd
-import requests
 from shared_header import (
     render_header,
     render_admin_panel,
-    save_feedback_to_admin_session,  # ADD THIS
+    submit_agent_feedback,
     ACCOUNTS,
     INDUSTRIES,
     ACCOUNT_INDUSTRY_MAP,
     get_shared_data,
     render_unified_business_inputs,
+    submit_agent_job,
+    take_agent_job_results,
+    render_agent_job_progress,
+    describe_agency_error,
+    AGENT_API_CONFIGS,
+    build_agent_context,
+    take_assessment_results,
+    render_assessment_status,
+    cached_answer_html,
+)
+from text_cleaning import (
+    json_to_text,
+    sanitize_text,
+    format_with_bold,
 )
 
 # --- Page Config ---
@@ -71,293 +80,24 @@ render_header(  # CALL IT HERE INSTEAD
 # API Configuration
 # ===============================
 
-# Constants
-TENANT_ID = "talos"
-HEADERS_BASE = {"Content-Type": "application/json"}
-VOCAB_API_URL = "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758548233201&level=1"
-
 # API config with simplified prompt
-API_CONFIGS = [
-    {
-        "name": "vocabulary",
-        "url": VOCAB_API_URL,
-        "multiround_convo": 3,
-        "description": "vocabulary",
-        "prompt": lambda problem, outputs: (
-            f"{problem}\n\nExtract the vocabulary from this problem statement."
-        )
-    }
-]
-
-# Global feedback file path
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-FEEDBACK_FILE = os.path.join(BASE_DIR, "feedback.csv")
-
-# Initialize feedback file if not present
-try:
-    if not os.path.exists(FEEDBACK_FILE):
-        df = pd.DataFrame(columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType",
-                          "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
-        df.to_csv(FEEDBACK_FILE, index=False)
-except (PermissionError, OSError) as e:
-    if 'feedback_data' not in st.session_state:
-        st.session_state.feedback_data = pd.DataFrame(
-            columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
-
-# Token initialization
-def _init_auth_token():
-    token = os.environ.get("AUTH_TOKEN", "")
-    try:
-        if not token:
-            token = st.secrets.get("AUTH_TOKEN", "")
-    except Exception:
-        pass
-    return token or ""
-
-if 'auth_token' not in st.session_state:
-    st.session_state.auth_token = _init_auth_token()
+API_CONFIGS = AGENT_API_CONFIGS["vocabulary"]
 
 # ===============================
 # Utility Functions
 # ===============================
 
-def json_to_text(data):
-    """Extract text from JSON response"""
-    if data is None:
-        return ""
-    if isinstance(data, str):
-        return data
-    if isinstance(data, dict):
-        for key in ("result", "output", "content", "text", "answer", "response"):
-            if key in data and data[key]:
-                return json_to_text(data[key])
-        if "data" in data:
-            return json_to_text(data["data"])
-        # Try to extract any string values
-        for value in data.values():
-            if isinstance(value, str) and len(value) > 10:
-                return value
-        return "\n".join(f"{k}: {json_to_text(v)}" for k, v in data.items() if v)
-    if isinstance(data, list):
-        return "\n".join(json_to_text(x) for x in data if x)
-    return str(data)
-
-def sanitize_text(text):
-    """Remove markdown artifacts and clean up text"""
-    if not text:
-        return ""
-
-    # Fix the "s" character issue
-    text = re.sub(r'^\s*s\s+', '', text.strip())
-    text = re.sub(r'\n\s*s\s+', '\n', text)
-
-    text = re.sub(r'Q\d+\s*Answer\s*Explanation\s*:',
-                  '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-    text = re.sub(r'\*(.*?)\*', r'\1', text)
-    text = re.sub(r'`(.*?)`', r'\1', text)
-    text = re.sub(r'#+\s*', '', text)
-    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
-    text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r' {2,}', ' ', text)
-    text = re.sub(r'^\s*[-*]\s+', '• ', text, flags=re.MULTILINE)
-    text = re.sub(r'<\/?[^>]+>', '', text)
-    text = re.sub(r'& Key Takeaway:', 'Key Takeaway:', text)
-
-    return text.strip()
-
 def format_vocabulary_with_bold(text, extra_phrases=None):
     """Format vocabulary text with bold styling"""
-    if not text:
-        return "No vocabulary data available"
-
-    clean_text = sanitize_text(text)
-    clean_text = clean_text.replace(" - ", " : ")
-    clean_text = re.sub(r'(?m)^\s*[-*]\s+', '• ', clean_text)
-
-    extra_patterns = []
-    if extra_phrases:
-        for p in extra_phrases:
-            if any(ch in p for ch in r".^$*+?{}[]\|()"):
-                extra_patterns.append(p)
-            else:
-                extra_patterns.append(re.escape(p))
-
-    lines = clean_text.splitlines()
-    n = len(lines)
-    i = 0
-    paragraph_html = []
-
-    def collect_continuation(start_idx):
-        block_lines = [lines[start_idx].rstrip()]
-        j = start_idx + 1
-        while j < n:
-            next_line = lines[j]
-            if not next_line.strip():
-                break
-            if re.match(r'^\s+', next_line) or re.match(r'^\s*[a-z]', next_line):
-                block_lines.append(next_line.rstrip())
-                j += 1
-                continue
-            if re.match(r'^\s*(?:•|-|\d+\.)\s+', next_line):
-                break
-            break
-        return block_lines, j
-
-    while i < n:
-        ln = lines[i].rstrip()
-        if not ln.strip():
-            paragraph_html.append('')
-            i += 1
-            continue
-
-        if extra_patterns:
-            new_ln = ln
-            for pat in extra_patterns:
-                try:
-                    new_ln = re.sub(
-                        pat, lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
-                except re.error:
-                    new_ln = re.sub(re.escape(
-                        pat), lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
-            if new_ln != ln:
-                paragraph_html.append(new_ln)
-                i += 1
-                continue
-
-        if re.search(r'(Step\s*\d+\s*:)', ln, flags=re.IGNORECASE):
-            block, j = collect_continuation(i)
-            block_text = "<br>".join([b.strip() for b in block])
-            paragraph_html.append(f"<strong>{block_text}</strong>")
-            i = j
-            continue
-
-        m_num_colon = re.match(r'^\s*(\d+\.\s+[^:]+):\s*(.*)$', ln)
-        if m_num_colon:
-            heading = m_num_colon.group(1).strip()
-            remainder = m_num_colon.group(2).strip()
-            paragraph_html.append(
-                f"<strong>{heading}:</strong> {remainder}" if remainder else f"<strong>{heading}:</strong>")
-            i += 1
-            continue
-
-        m_num_no_colon = re.match(r'^\s*(\d+\.\s+.+)$', ln)
-        if m_num_no_colon:
-            block, j = collect_continuation(i)
-            block_text = "<br>".join([b.strip() for b in block])
-            paragraph_html.append(f"<strong>{block_text}</strong>")
-            i = j
-            continue
-
-        m_bullet_heading = re.match(r'^\s*(?:•|\d+\.)\s*([^:]+):\s*(.*)$', ln)
-        if m_bullet_heading:
-            heading = m_bullet_heading.group(1).strip()
-            remainder = m_bullet_heading.group(2).strip()
-            paragraph_html.append(
-                f"• <strong>{heading}:</strong> {remainder}" if remainder else f"• <strong>{heading}:</strong>")
-            i += 1
-            continue
-
-        m_side = re.match(r'^\s*([^:]+):\s*(.*)$', ln)
-        if m_side and len(m_side.group(1).split()) <= 8:
-            left = m_side.group(1).strip()
-            right = m_side.group(2).strip()
-            paragraph_html.append(
-                f"<strong>{left}:</strong> {right}" if right else f"<strong>{left}:</strong>")
-            i += 1
-            continue
-
-        if re.fullmatch(r'\s*Revenue\s+Growth\s+Rate\s*', ln, flags=re.IGNORECASE):
-            paragraph_html.append(f"<strong>{ln.strip()}</strong>")
-            i += 1
-            continue
-
-        paragraph_html.append(ln)
-        i += 1
-
-    final_paragraphs = []
-    temp_lines = []
-    for entry in paragraph_html:
-        if entry == '':
-            if temp_lines:
-                final_paragraphs.append("<br>".join(temp_lines))
-                temp_lines = []
-        else:
-            temp_lines.append(entry)
-    if temp_lines:
-        final_paragraphs.append("<br>".join(temp_lines))
-
-    para_wrapped = [
-        f"<p style='margin:6px 0; line-height:1.45; font-size:0.98rem;'>{p}</p>" for p in final_paragraphs
-    ]
-    final_html = "\n".join(para_wrapped)
-
-    formatted_output = f"""
-    <div class="vocab-display">
-        {final_html}
-    </div>
-    """
-    formatted_output = re.sub(r'(<br>\s*){3,}', '<br><br>', formatted_output)
-    return formatted_output
+    return format_with_bold(text, "vocabulary", extra_phrases)
 
 def submit_feedback(feedback_type, name="", email="", off_definitions="", suggestions="", additional_feedback=""):
-    """Submit feedback to CSV file and admin session storage"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    # Get context data from session state
-    account = st.session_state.get("current_account", "")
-    industry = st.session_state.get("current_industry", "")
-    problem_statement = st.session_state.get("current_problem", "")
-
-    # Create feedback data for admin session
-    feedback_data = {
-        "Name": name,
-        "Email": email, 
-        "Feedback": additional_feedback,
-        "FeedbackType": feedback_type,
-        "OffDefinitions": off_definitions,
-        "Suggestions": suggestions,
-        "Account": account,
-        "Industry": industry,
-        "ProblemStatement": problem_statement
-    }
-
-    # Save to admin session storage
-    save_feedback_to_admin_session(feedback_data, "Vocabulary Agent")
-
-    # Also save to CSV file (original functionality)
-    new_entry = pd.DataFrame([[
-        timestamp, name, email, additional_feedback, feedback_type, off_definitions, suggestions, account, industry, problem_statement
-    ]], columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
-
+    """Submit feedback through the shared feedback service"""
     try:
-        # Try file-based storage first
-        if os.path.exists(FEEDBACK_FILE):
-            existing = pd.read_csv(FEEDBACK_FILE)
-
-            # Handle schema mismatch
-            missing_cols = set(new_entry.columns) - set(existing.columns)
-            for col in missing_cols:
-                existing[col] = ''
-
-            # Reorder existing columns to match the new entry's order
-            existing = existing[new_entry.columns]
-
-            updated = pd.concat([existing, new_entry], ignore_index=True)
-        else:
-            updated = new_entry
-
-        try:
-            updated.to_csv(FEEDBACK_FILE, index=False)
-        except (PermissionError, OSError):
-            # Fallback to session state on Streamlit Cloud
-            if 'feedback_data' not in st.session_state:
-                st.session_state.feedback_data = pd.DataFrame(
-                    columns=new_entry.columns)
-            st.session_state.feedback_data = pd.concat(
-                [st.session_state.feedback_data, new_entry], ignore_index=True)
-            st.info("📝 Feedback saved to session (cloud mode)")
+        submit_agent_feedback(
+            "Vocabulary Agent", feedback_type, name=name, email=email, off_definitions=off_definitions,
+            suggestions=suggestions, additional_feedback=additional_feedback,
+        )
 
         # CHANGED: Set agent-specific feedback state
         st.session_state.vocab_feedback_submitted = True
@@ -410,6 +150,18 @@ account, industry, problem = render_unified_business_inputs(
     save_button_label="✅ Save Problem Details",
 )
 
+# Pick up the vocabulary from the background full assessment once it has finished
+pipeline_results = take_assessment_results("vocabulary")
+if pipeline_results:
+    result_data, error = pipeline_results["vocabulary"]
+    if error is None:
+        st.session_state.vocab_output = sanitize_text(json_to_text(result_data))
+        st.session_state.show_vocabulary = True
+        st.session_state.analysis_complete = True
+    else:
+        st.warning(f"⚠️ Background vocabulary extraction failed. {describe_agency_error(error)} Use Extract Vocabulary to retry.")
+render_assessment_status("vocabulary")
+
 st.markdown("---")
 
 # ===============================
@@ -443,80 +195,32 @@ if extract_btn:
         st.stop()
 
     # Build context
-    full_context = f"""
-    Business Problem:
-    {problem.strip()}
-
-    Context:
-    Account: {account}
-    Industry: {industry}
-    """.strip()
+    full_context = build_agent_context(problem, account, industry)
 
-    # Prepare headers with authentication
-    headers = HEADERS_BASE.copy()
-    headers.update({
-        "Tenant-ID": TENANT_ID,
-        "X-Tenant-ID": TENANT_ID
-    })
-
-    if st.session_state.auth_token:
-        headers["Authorization"] = f"Bearer {st.session_state.auth_token}"
-
-    with st.spinner("🔍 Extracting vocabulary and analyzing context • ⏱️ 60-90s"):
-        progress = st.progress(0)
-
-        try:
-            with requests.Session() as session:
-                cfg = API_CONFIGS[0]
-                goal = cfg["prompt"](full_context, {})
-
-                # Make API request with timeout
-                response = session.post(
-                    cfg["url"],
-                    headers=headers,
-                    json={"agency_goal": goal},
-                    timeout=60
-                )
-
-                progress.progress(0.5)
-
-                if response.status_code == 200:
-                    # Process successful response
-                    result_data = response.json()
-                    text_output = json_to_text(result_data)
-                    cleaned_text = sanitize_text(text_output)
-
-                    st.session_state.vocab_output = cleaned_text
-                    st.session_state.show_vocabulary = True
-                    st.session_state.analysis_complete = True
-
-                    progress.progress(1.0)
-                    st.success("✅ Vocabulary extraction complete!")
+    # Runs as a background job; the answer is previewed live while it streams in
+    cfg = API_CONFIGS[0]
+    st.session_state.vocab_output = ""
+    st.session_state.show_vocabulary = False
+    submit_agent_job("vocabulary", [("vocabulary", cfg["url"], cfg["prompt"](full_context, {}))])
 
-                else:
-                    error_msg = f"API Error {response.status_code}: {response.text[:200]}"
-                    st.session_state.vocab_output = error_msg
-                    st.session_state.show_vocabulary = True
-                    st.error(
-                        f"API request failed with status {response.status_code}")
+render_agent_job_progress("vocabulary", sanitize_text, titles={"vocabulary": "Vocabulary"})
 
-        except requests.exceptions.Timeout:
-            error_msg = "Request timeout: The API took too long to respond."
-            st.session_state.vocab_output = error_msg
-            st.session_state.show_vocabulary = True
-            st.error("Request timeout - please try again.")
+job_results = take_agent_job_results("vocabulary")
+if job_results:
+    result_data, error = job_results["vocabulary"]
+    if error is None:
+        # Process successful response
+        text_output = json_to_text(result_data)
+        cleaned_text = sanitize_text(text_output)
 
-        except requests.exceptions.ConnectionError:
-            error_msg = "Connection error: Unable to connect to the API server."
-            st.session_state.vocab_output = error_msg
-            st.session_state.show_vocabulary = True
-            st.error("Connection error - please check your network connection.")
+        st.session_state.vocab_output = cleaned_text
+        st.session_state.show_vocabulary = True
+        st.session_state.analysis_complete = True
 
-        except Exception as e:
-            error_msg = f"Unexpected error: {str(e)}"
-            st.session_state.vocab_output = error_msg
-            st.session_state.show_vocabulary = True
-            st.error(f"An unexpected error occurred: {str(e)}")
+        st.success("✅ Vocabulary extraction complete!")
+    else:
+        # The failure is reported, never stored or shown as the vocabulary itself
+        st.error(f"❌ Vocabulary extraction failed. {describe_agency_error(error)}")
 
 # ===============================
 # Display Vocabulary Results
@@ -553,19 +257,9 @@ if st.session_state.get("show_vocabulary") and st.session_state.get("vocab_outpu
     )
 
     # Format and display vocabulary with account/industry substitutions
+    # (bold formatting, generic mentions and <br> lines; cached across reruns and sessions)
     vocab_text = st.session_state.vocab_output
-    formatted_vocab = format_vocabulary_with_bold(vocab_text)
-
-    # Replace generic mentions in the formatted HTML
-    if display_account and display_account != "Unknown Company":
-        formatted_vocab = re.sub(
-            r'\bthe company\b', display_account, formatted_vocab, flags=re.IGNORECASE)
-    if display_industry and display_industry != "Unknown Industry":
-        formatted_vocab = re.sub(
-            r'\bthe industry\b', display_industry, formatted_vocab, flags=re.IGNORECASE)
-
-    # Convert newlines to <br> for proper HTML display
-    html_body = formatted_vocab.replace('\n', '<br>')
+    html_body = cached_answer_html(vocab_text, "vocabulary", display_account, display_industry)
 
         # Single box for vocabulary with proper spacing and visible border
     st.markdown(
@@ -3,19 +3,29 @@ import streamlit as st
 from shared_header import (
     render_header,
     render_admin_panel,
-    save_feedback_to_admin_session,
+    submit_agent_feedback,
     render_unified_business_inputs,
     get_shared_data,
     ACCOUNTS,
     INDUSTRIES,
     ACCOUNT_INDUSTRY_MAP,
-    _safe_rerun
+    _safe_rerun,
+    submit_agent_job,
+    take_agent_job_results,
+    render_agent_job_progress,
+    describe_agency_error,
+    AGENT_API_CONFIGS,
+    take_assessment_results,
+    render_assessment_status,
+    store_agent_results,
+    get_agent_results,
+)
+from text_cleaning import (
+    clean_section_content,
+    format_with_bold,
+    json_to_text as _json_to_text,
+    sanitize_text as _sanitize_text,
 )
-import requests
-import json
-import os
-import re
-import pandas as pd
 from datetime import datetime
 
 
@@ -54,83 +64,18 @@ for key, val in session_defaults.items():
 # =========================================
 # 🌐 API CONFIGURATION
 # =========================================
-TENANT_ID = "talos"
-AUTH_TOKEN = None
-HEADERS_BASE = {"Content-Type": "application/json"}
-
-CURRENT_SYSTEM_API_URL = (
-    "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api"
-    "?society_id=1757657318406&agency_id=1758549095254&level=1"
-)
-
-API_CONFIGS = [
-    {
-        "name": "current_system",
-        "url": CURRENT_SYSTEM_API_URL,
-        "multiround_convo": 2,
-        "description": "Current System in Place",
-        "prompt": lambda problem, outputs: (
-            f"Problem statement - {problem}\n\n"
-            f"Context from vocabulary:\n{outputs.get('vocabulary', '')}\n\n"
-            "Describe the current system, inputs, outputs, and pain points in detail with clear sections."
-        )
-    }
-]
-
-# =========================================
-# 📁 FILE CONFIG
-# =========================================
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-FEEDBACK_FILE = os.path.join(BASE_DIR, "feedback.csv")
+API_CONFIGS = AGENT_API_CONFIGS["current_system"]
 
 # =========================================
 # 🧹 HELPER FUNCTIONS
 # =========================================
 def json_to_text(data):
-    if data is None:
-        return ""
-    if isinstance(data, str):
-        return data
-    if isinstance(data, dict):
-        for key in ("result", "output", "content", "text"):
-            if key in data and data[key]:
-                return json_to_text(data[key])
-        if "data" in data:
-            return json_to_text(data["data"])
-        return "\n".join(f"{k}: {json_to_text(v)}" for k, v in data.items() if v)
-    if isinstance(data, list):
-        return "\n".join(json_to_text(x) for x in data if x)
-    return str(data)
+    return _json_to_text(data, "current_system")
 
 
 def sanitize_text(text):
     """Remove markdown artifacts and clean up text"""
-    if not text:
-        return ""
-
-    # Fix the "s" character issue - remove stray 's' characters at the beginning
-    text = re.sub(r'^\s*s\s+', '', text.strip())
-    text = re.sub(r'\n\s*s\s+', '\n', text)
-
-    # Remove --- lines
-    text = re.sub(r'^---\s*$', '', text, flags=re.MULTILINE)
-    
-    text = re.sub(r'Q\d+\s*Answer\s*Explanation\s*:',
-                  '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-    text = re.sub(r'\*(.*?)\*', r'\1', text)
-    text = re.sub(r'`(.*?)`', r'\1', text)
-    text = re.sub(r'#+\s*', '', text)
-    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
-    text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r' {2,}', ' ', text)
-    text = re.sub(r'^\s*[-*]\s+', '• ', text, flags=re.MULTILINE)
-    text = re.sub(r'<\/?[^>]+>', '', text)
-    text = re.sub(r'&', '&', text)
-    text = re.sub(r'& Key Takeaway:', 'Key Takeaway:', text)
-
-    return text.strip()
+    return _sanitize_text(text, "current_system")
 
 
 def format_current_system_with_bold(text, extra_phrases=None):
@@ -138,289 +83,41 @@ def format_current_system_with_bold(text, extra_phrases=None):
     Format Current System output with bold styling.
     Formats current system text with bold patterns and proper structure.
     """
-    if not text:
-        return "No current system data available"
-
-    # Sanitize text
-    try:
-        clean_text = sanitize_text(text)
-    except NameError:
-        clean_text = text
-
-    # Remove numbered sections like "2." and "3." etc.
-    clean_text = re.sub(r'^\s*\d+\.\s*', '', clean_text, flags=re.MULTILINE)
-    
-    # Basic normalization
-    clean_text = clean_text.replace(" - ", " : ")
-    clean_text = re.sub(r'(?m)^\s*[-*]\s+', '• ', clean_text)
-
-    # Prepare extra phrase patterns
-    extra_patterns = []
-    if extra_phrases:
-        for p in extra_phrases:
-            if any(ch in p for ch in r".^$*+?{}[]\|()"):
-                extra_patterns.append(p)
-            else:
-                extra_patterns.append(re.escape(p))
-
-    lines = clean_text.splitlines()
-    n = len(lines)
-    i = 0
-    paragraph_html = []
-
-    def collect_continuation(start_idx):
-        """Collect continuation lines for block-style headings."""
-        block_lines = [lines[start_idx].rstrip()]
-        j = start_idx + 1
-        while j < n:
-            next_line = lines[j]
-            if not next_line.strip():
-                break
-            if re.match(r'^\s+', next_line) or re.match(r'^\s*[a-z]', next_line):
-                block_lines.append(next_line.rstrip())
-                j += 1
-                continue
-            if re.match(r'^\s*(?:•|-|\d+\.)\s+', next_line):
-                break
-            break
-        return block_lines, j
-
-    while i < n:
-        ln = lines[i].rstrip()
-        if not ln.strip():
-            paragraph_html.append('')
-            i += 1
-            continue
-
-        # Extra phrases
-        if extra_patterns:
-            new_ln = ln
-            for pat in extra_patterns:
-                try:
-                    new_ln = re.sub(
-                        pat, lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
-                except re.error:
-                    new_ln = re.sub(re.escape(
-                        pat), lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
-            if new_ln != ln:
-                paragraph_html.append(new_ln)
-                i += 1
-                continue
-
-        # Section headers (Current System, Inputs, Outputs, Pain Points)
-        if re.match(r'^\s*(Current\s+System|Inputs?|Outputs?|Pain\s+Points?|System\s+Description)', ln, flags=re.IGNORECASE):
-            paragraph_html.append(
-                f"<strong style='font-size:1.1rem; color: var(--text-primary);'>{ln.strip()}</strong>")
-            i += 1
-            continue
-
-        # Numbered heading WITH colon
-        m_num_colon = re.match(r'^\s*(\d+\.\s+[^:]+):\s*(.*)$', ln)
-        if m_num_colon:
-            heading = m_num_colon.group(1).strip()
-            remainder = m_num_colon.group(2).strip()
-            if remainder:
-                paragraph_html.append(
-                    f"<strong style='color: var(--text-primary);'>{heading}:</strong> {remainder}")
-            else:
-                paragraph_html.append(f"<strong style='color: var(--text-primary);'>{heading}:</strong>")
-            i += 1
-            continue
-
-        # Numbered heading WITHOUT colon
-        m_num_no_colon = re.match(r'^\s*(\d+\.\s+.+)$', ln)
-        if m_num_no_colon:
-            block, j = collect_continuation(i)
-            block_text = "<br>".join([b.strip() for b in block])
-            paragraph_html.append(f"<strong style='color: var(--text-primary);'>{block_text}</strong>")
-            i = j
-            continue
-
-        # Bullet with colon
-        m_bullet_heading = re.match(r'^\s*(?:•|\d+\.)\s*([^:]+):\s*(.*)$', ln)
-        if m_bullet_heading:
-            heading = m_bullet_heading.group(1).strip()
-            remainder = m_bullet_heading.group(2).strip()
-            if remainder:
-                paragraph_html.append(
-                    f"• <strong style='color: var(--text-primary);'>{heading}:</strong> {remainder}")
-            else:
-                paragraph_html.append(f"• <strong style='color: var(--text-primary);'>{heading}:</strong>")
-            i += 1
-            continue
-
-        # Generic inline heading "LeftOfColon: rest" - FIXED THIS PART
-        m_side = re.match(r'^\s*([^:]+):\s*(.*)$', ln)
-        if m_side and len(m_side.group(1).split()) <= 12:  # Increased word limit
-            left = m_side.group(1).strip()
-            right = m_side.group(2).strip()
-            
-            # Skip if it's a section header we already processed
-            if not re.match(r'^\s*(Current\s+System|Inputs?|Outputs?|Pain\s+Points?|System\s+Description)', left, flags=re.IGNORECASE):
-                paragraph_html.append(
-                    f"<strong style='color: var(--text-primary);'>{left}:</strong> {right}" if right else f"<strong style='color: var(--text-primary);'>{left}:</strong>")
-                i += 1
-                continue
-
-        # Handle bullet points with colons that might have been missed
-        if ':' in ln and not ln.startswith('•'):
-            parts = ln.split(':', 1)
-            if len(parts) == 2 and len(parts[0].split()) <= 8:
-                left = parts[0].strip()
-                right = parts[1].strip()
-                paragraph_html.append(f"<strong style='color: var(--text-primary);'>{left}:</strong> {right}")
-                i += 1
-                continue
-
-        # Default
-        paragraph_html.append(f"<span style='color: var(--text-primary);'>{ln}</span>")
-        i += 1
-
-    # Group into paragraphs
-    final_paragraphs = []
-    temp_lines = []
-    for entry in paragraph_html:
-        if entry == '':
-            if temp_lines:
-                final_paragraphs.append("<br>".join(temp_lines))
-                temp_lines = []
-        else:
-            temp_lines.append(entry)
-    if temp_lines:
-        final_paragraphs.append("<br>".join(temp_lines))
-
-    para_wrapped = [
-        f"<p style='margin:6px 0; line-height:1.45; font-size:0.98rem; color: var(--text-primary);'>{p}</p>" for p in final_paragraphs]
-    final_html = "\n".join(para_wrapped)
-
-    return final_html
-
-
-def parse_current_system_sections(text):
-    """Split extracted text into structured sections"""
-    sections = {
-        "core_problem": "",
-        "current_system": "",
-        "inputs": "",
-        "outputs": "",
-        "pain_points": ""
-    }
-
-    if not text:
-        return {k: "No data available" for k in sections}
-
-    patterns = {
-        "core_problem": r"(?:Core Problem|Business Problem)[:\n]",
-        "current_system": r"(?:Current System)[:\n]",
-        "inputs": r"(?:Inputs?)[:\n]",
-        "outputs": r"(?:Outputs?)[:\n]",
-        "pain_points": r"(?:Pain Points?)[:\n]"
-    }
-
-    matches = {k: re.search(v, text, re.IGNORECASE) for k, v in patterns.items()}
-    keys = list(matches.keys())
-
-    for i, key in enumerate(keys):
-        if matches[key]:
-            start = matches[key].end()
-            end = None
-            for nxt_key in keys[i + 1:]:
-                if matches[nxt_key]:
-                    end = matches[nxt_key].start()
-                    break
-            sections[key] = text[start:end].strip() if end else text[start:].strip()
-
-    for k in sections:
-        if not sections[k].strip():
-            sections[k] = "No data available"
-
-    return sections
+    return format_with_bold(text, "current_system", extra_phrases)
 
 
 def call_api(agent_name, problem, context=""):
-    """Call the Talos API using centralized API_CONFIGS"""
+    """Queue the Talos call for API_CONFIGS[agent_name] as a background job"""
     config = next((a for a in API_CONFIGS if a["name"] == agent_name), None)
     if not config:
         st.error("Invalid API configuration.")
         return None
 
     prompt = config["prompt"](problem, {"vocabulary": context})
-    payload = {"agency_goal": prompt}
+    return submit_agent_job(agent_name, [(agent_name, config["url"], prompt)])
 
-    headers = HEADERS_BASE.copy()
-    headers.update({"Tenant-ID": TENANT_ID, "X-Tenant-ID": TENANT_ID})
-    if AUTH_TOKEN:
-        headers["Authorization"] = f"Bearer {AUTH_TOKEN}"
 
-    try:
-        response = requests.post(config["url"], headers=headers, json=payload)
-        if response.status_code == 200:
-            return sanitize_text(json_to_text(response.json()))
-        else:
-            st.error(f"❌ API Error: {response.status_code}")
-            return None
-    except Exception as e:
-        st.error(f"❌ API Call Failed: {str(e)}")
+def api_result_to_text(result_data, error=None):
+    """Sanitized text of a finished Talos call, or None after showing the error"""
+    if error is not None:
+        st.error(f"❌ Current system extraction failed. {describe_agency_error(error)}")
         return None
+    return sanitize_text(json_to_text(result_data))
 
 def submit_feedback(feedback_type, name="", email="", off_definitions="", suggestions="", additional_feedback="", 
                    account="", industry="", problem_statement=""):
-    """Submit feedback to CSV file and admin session storage"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
+    """Submit feedback through the shared feedback service"""
     # Use provided account/industry or get from session state
     account = account or st.session_state.get("current_account", "") or st.session_state.get("saved_account", "")
     industry = industry or st.session_state.get("current_industry", "") or st.session_state.get("saved_industry", "")
     problem_statement = problem_statement or st.session_state.get("current_problem", "") or st.session_state.get("saved_problem", "")
 
-    # Create feedback data for admin session
-    feedback_data = {
-        "Name": name,
-        "Email": email, 
-        "Feedback": additional_feedback,
-        "FeedbackType": feedback_type,
-        "OffDefinitions": off_definitions,
-        "Suggestions": suggestions,
-        "Account": account,
-        "Industry": industry,
-        "ProblemStatement": problem_statement
-    }
-
-    # Save to admin session storage
-    save_feedback_to_admin_session(feedback_data, "Current System Agent")
-
-    # Also save to CSV file (original functionality)
-    new_entry = pd.DataFrame([[
-        timestamp, name, email, additional_feedback, feedback_type, off_definitions, suggestions, account, industry, problem_statement
-    ]], columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
-
     try:
-        # Try file-based storage first
-        if os.path.exists(FEEDBACK_FILE):
-            existing = pd.read_csv(FEEDBACK_FILE)
-
-            # Handle schema mismatch
-            missing_cols = set(new_entry.columns) - set(existing.columns)
-            for col in missing_cols:
-                existing[col] = ''
-
-            # Reorder existing columns to match the new entry's order
-            existing = existing[new_entry.columns]
-
-            updated = pd.concat([existing, new_entry], ignore_index=True)
-        else:
-            updated = new_entry
-
-        try:
-            updated.to_csv(FEEDBACK_FILE, index=False)
-        except (PermissionError, OSError):
-            # Fallback to session state on Streamlit Cloud
-            if 'feedback_data' not in st.session_state:
-                st.session_state.feedback_data = pd.DataFrame(
-                    columns=new_entry.columns)
-            st.session_state.feedback_data = pd.concat(
-                [st.session_state.feedback_data, new_entry], ignore_index=True)
-            st.info("📝 Feedback saved to session (cloud mode)")
+        submit_agent_feedback(
+            "Current System Agent", feedback_type, name=name, email=email, off_definitions=off_definitions,
+            suggestions=suggestions, additional_feedback=additional_feedback,
+            account=account, industry=industry, problem_statement=problem_statement,
+        )
 
         # Set AGENT-SPECIFIC feedback flag
         st.session_state.current_system_feedback_submitted = True
@@ -465,6 +162,18 @@ account, industry, problem = render_unified_business_inputs(
     save_button_label="✅ Save Problem Details"
 )
 
+# Pick up the current system from the background full assessment once it has finished
+pipeline_results = take_assessment_results("current_system")
+if pipeline_results:
+    result_data, error = pipeline_results["current_system"]
+    if error is None:
+        st.session_state.current_system_data = sanitize_text(json_to_text(result_data))
+        store_agent_results("current_system", {"current_system": st.session_state.current_system_data})
+        st.session_state.current_system_extracted = True
+    else:
+        st.warning(f"⚠️ Background current system extraction failed. {describe_agency_error(error)} Use Extract Current System to retry.")
+render_assessment_status("current_system")
+
 st.markdown(
     "<hr style='border: 0; height: 1px; background: var(--divider-color, rgba(0,0,0,0.1)); margin: 1.5rem 0;'>",
     unsafe_allow_html=True
@@ -483,17 +192,24 @@ if not st.session_state.current_system_extracted:
         if not st.session_state.saved_problem.strip():
             st.error("⚠️ Please save your business problem details first!")
         else:
-            with st.spinner("🔍 Extracting current system analysis..."):
-                api_output = call_api(
-                    agent_name="current_system",
-                    problem=st.session_state.saved_problem,
-                    context=f"{st.session_state.saved_account}, {st.session_state.saved_industry}"
-                )
-                if api_output:
-                    st.session_state.current_system_data = api_output
-                    st.session_state.current_system_extracted = True
-                    st.success("✅ Current System extracted successfully!")
-                    _safe_rerun()
+            # Runs as a background job so switching pages does not lose it
+            call_api(
+                agent_name="current_system",
+                problem=st.session_state.saved_problem,
+                context=f"{st.session_state.saved_account}, {st.session_state.saved_industry}"
+            )
+
+render_agent_job_progress("current_system", sanitize_text, titles={"current_system": "Current System Analysis"})
+
+job_results = take_agent_job_results("current_system")
+if job_results:
+    api_output = api_result_to_text(*job_results["current_system"])
+    if api_output:
+        st.session_state.current_system_data = api_output
+        store_agent_results("current_system", {"current_system": api_output})
+        st.session_state.current_system_extracted = True
+        st.success("✅ Current System extracted successfully!")
+        _safe_rerun()
 
 # =========================================
 # 📊 DISPLAY RESULTS
@@ -521,25 +237,10 @@ if st.session_state.current_system_extracted:
         unsafe_allow_html=True,
     )
     
-    sections = parse_current_system_sections(st.session_state.current_system_data)
-
-    # Clean and format each section to remove numbers and extra whitespace
-    def clean_section_content(content):
-        """Remove numbered lists (1., 2., 3., etc.) and clean up formatting"""
-        if not content:
-            return content
-        
-        # Remove numbered lists (1., 2., 3., etc.)
-        cleaned = re.sub(r'^\s*\d+\.\s*', '', content, flags=re.MULTILINE)
-        
-        # Remove any remaining "Box X:" patterns
-        cleaned = re.sub(r'(?i)\b(box\s*\d+[:.]?\s*)', '', cleaned)
-        
-        # Remove extra whitespace and normalize line breaks
-        cleaned = re.sub(r'\n{3,}', '\n\n', cleaned)
-        cleaned = re.sub(r' {2,}', ' ', cleaned)
-        
-        return cleaned.strip()
+    # Sections were split once when the answer arrived
+    sections = get_agent_results(
+        "current_system", {"current_system": st.session_state.current_system_data}
+    )["current_system"].sections
 
     # Display Core Business Problem with red border
     core_problem_clean = clean_section_content(sections["core_problem"])
@@ -1,20 +1,32 @@
 import streamlit as st
-import streamlit.components.v1 as components
-import os
 import re
-import json
 from datetime import datetime
-import pandas as pd
-import requests
 from shared_header import (
     render_header,
     render_admin_panel,
-    save_feedback_to_admin_session,
+    submit_agent_feedback,
     ACCOUNTS,
     INDUSTRIES,
     ACCOUNT_INDUSTRY_MAP,
     get_shared_data,
     render_unified_business_inputs,
+    submit_agent_job,
+    split_agency_results,
+    describe_agency_error,
+    take_agent_job_results,
+    render_agent_job_progress,
+    AGENT_API_CONFIGS,
+    build_agent_context,
+    take_assessment_results,
+    render_assessment_status,
+    cached_answer_html,
+    store_agent_results,
+)
+from text_cleaning import (
+    json_to_text,
+    sanitize_text,
+    clean_agent_output,
+    format_with_bold,
 )
 
 # --- Page Config ---
@@ -64,312 +76,29 @@ if admin_toggled or st.session_state.get('current_page', '') == 'admin':
 # API Configuration for Uncertainty
 # ===============================
 
-# Constants
-TENANT_ID = "talos"
-HEADERS_BASE = {"Content-Type": "application/json"}
-
-# Uncertainty APIs (replace with your actual API URLs)
-API_CONFIGS = [
-   {
-        "name": "Q10",
-        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758617140479&level=1",
-        "multiround_convo": 2,
-        "description": "Are there hidden or latent dependencies that could affect outcomes?",
-        "prompt": lambda problem, outputs: (
-            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
-            "What is the risk/impact if this problem remains unresolved? Score 0–5. Provide justification."
-        )
-    },
-    {
-        "name": "Q11",
-        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758618137301&level=1",
-        "multiround_convo": 2,
-        "description": "Are feedback loops insufficient or missing, limiting our ability to adapt?",
-        "prompt": lambda problem, outputs: (
-            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
-            "How urgent is it to address this problem? Score 0–5. Provide justification."
-        )
-    },
-    {
-        "name": "Q12",
-        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758619317968&level=1",
-        "multiround_convo": 2,
-        "description": "Do we lack established benchmarks or \"gold standards\" to validate results?",
-        "prompt": lambda problem, outputs: (
-            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
-            "How well does solving this problem align with organizational strategy or goals? Score 0–5. Provide justification."
-        )
-    }
-]
-
-# Global feedback file path
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-FEEDBACK_FILE = os.path.join(BASE_DIR, "feedback.csv")
-
-# Initialize feedback file if not present
-try:
-    if not os.path.exists(FEEDBACK_FILE):
-        df = pd.DataFrame(columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType",
-                          "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
-        df.to_csv(FEEDBACK_FILE, index=False)
-except (PermissionError, OSError) as e:
-    if 'feedback_data' not in st.session_state:
-        st.session_state.feedback_data = pd.DataFrame(
-            columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
-
-# Token initialization
-def _init_auth_token():
-    token = os.environ.get("AUTH_TOKEN", "")
-    try:
-        if not token:
-            token = st.secrets.get("AUTH_TOKEN", "")
-    except Exception:
-        pass
-    return token or ""
-
-if 'auth_token' not in st.session_state:
-    st.session_state.auth_token = _init_auth_token()
+# Uncertainty APIs (shared with the full assessment pipeline)
+API_CONFIGS = AGENT_API_CONFIGS["uncertainty"]
 
 # ===============================
 # Utility Functions
 # ===============================
 
-def json_to_text(data):
-    """Extract text from JSON response"""
-    if data is None:
-        return ""
-    if isinstance(data, str):
-        return data
-    if isinstance(data, dict):
-        for key in ("result", "output", "content", "text", "answer", "response"):
-            if key in data and data[key]:
-                return json_to_text(data[key])
-        if "data" in data:
-            return json_to_text(data["data"])
-        # Try to extract any string values
-        for value in data.values():
-            if isinstance(value, str) and len(value) > 10:
-                return value
-        return "\n".join(f"{k}: {json_to_text(v)}" for k, v in data.items() if v)
-    if isinstance(data, list):
-        return "\n".join(json_to_text(x) for x in data if x)
-    return str(data)
-
-def sanitize_text(text):
-    """Remove markdown artifacts and clean up text"""
-    if not text:
-        return ""
-
-    # Fix the "s" character issue
-    text = re.sub(r'^\s*s\s+', '', text.strip())
-    text = re.sub(r'\n\s*s\s+', '\n', text)
-
-    text = re.sub(r'Q\d+\s*Answer\s*Explanation\s*:',
-                  '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-    text = re.sub(r'\*(.*?)\*', r'\1', text)
-    text = re.sub(r'`(.*?)`', r'\1', text)
-    text = re.sub(r'#+\s*', '', text)
-    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
-    text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r' {2,}', ' ', text)
-    text = re.sub(r'^\s*[-*]\s+', '• ', text, flags=re.MULTILINE)
-    text = re.sub(r'<\/?[^>]+>', '', text)
-    text = re.sub(r'& Key Takeaway:', 'Key Takeaway:', text)
-
-    return text.strip()
+def agency_result_to_text(result_data):
+    """Sanitized answer text of a successful agency call"""
+    text_output = json_to_text(result_data)
+    return sanitize_text(text_output)
 
 def format_uncertainty_with_bold(text, extra_phrases=None):
     """Format uncertainty text with bold styling and remove Q1/Answer labels"""
-    if not text:
-        return "No uncertainty data available"
-
-    clean_text = sanitize_text(text)
-    
-    # Remove Q1/Answer labels and prefixes
-    clean_text = re.sub(r'^\s*Q\d+\s*:', '', clean_text, flags=re.IGNORECASE | re.MULTILINE)
-    clean_text = re.sub(r'^\s*Answer\s*:', '', clean_text, flags=re.IGNORECASE | re.MULTILINE)
-    clean_text = re.sub(r'^\s*Question\s*\d+\s*:', '', clean_text, flags=re.IGNORECASE | re.MULTILINE)
-    clean_text = re.sub(r'\bQ\d+\b\s*:', '', clean_text, flags=re.IGNORECASE)
-    clean_text = re.sub(r'\bAnswer\b\s*:', '', clean_text, flags=re.IGNORECASE)
-    
-    clean_text = clean_text.replace(" - ", " : ")
-    clean_text = re.sub(r'(?m)^\s*[-*]\s+', '• ', clean_text)
-
-    extra_patterns = []
-    if extra_phrases:
-        for p in extra_phrases:
-            if any(ch in p for ch in r".^$*+?{}[]\|()"):
-                extra_patterns.append(p)
-            else:
-                extra_patterns.append(re.escape(p))
-
-    lines = clean_text.splitlines()
-    n = len(lines)
-    i = 0
-    paragraph_html = []
-
-    def collect_continuation(start_idx):
-        block_lines = [lines[start_idx].rstrip()]
-        j = start_idx + 1
-        while j < n:
-            next_line = lines[j]
-            if not next_line.strip():
-                break
-            if re.match(r'^\s+', next_line) or re.match(r'^\s*[a-z]', next_line):
-                block_lines.append(next_line.rstrip())
-                j += 1
-                continue
-            if re.match(r'^\s*(?:•|-|\d+\.)\s+', next_line):
-                break
-            break
-        return block_lines, j
-
-    while i < n:
-        ln = lines[i].rstrip()
-        if not ln.strip():
-            paragraph_html.append('')
-            i += 1
-            continue
-
-        # Skip any lines that are just Q1/Answer labels
-        if re.match(r'^\s*(Q\d+|Answer|Question\s*\d+)\s*$', ln, re.IGNORECASE):
-            i += 1
-            continue
-
-        if extra_patterns:
-            new_ln = ln
-            for pat in extra_patterns:
-                try:
-                    new_ln = re.sub(
-                        pat, lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
-                except re.error:
-                    new_ln = re.sub(re.escape(
-                        pat), lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
-            if new_ln != ln:
-                paragraph_html.append(new_ln)
-                i += 1
-                continue
-
-        # Section headers (but not Q1/Answer)
-        if re.match(r'^\s*(Analysis|Score|Justification|Key\s+Takeaway|Uncertainty|Risk|Predictability|Data\s+Gaps|Knowledge\s+Limitations|Volatility|Stability|Reliability|Confidence|Probability)', ln, flags=re.IGNORECASE):
-            paragraph_html.append(f"<strong>{ln.strip()}</strong>")
-            i += 1
-            continue
-
-        m_num_colon = re.match(r'^\s*(\d+\.\s+[^:]+):\s*(.*)$', ln)
-        if m_num_colon:
-            heading = m_num_colon.group(1).strip()
-            remainder = m_num_colon.group(2).strip()
-            paragraph_html.append(
-                f"<strong>{heading}:</strong> {remainder}" if remainder else f"<strong>{heading}:</strong>")
-            i += 1
-            continue
-
-        m_bullet_heading = re.match(r'^\s*(?:•|\d+\.)\s*([^:]+):\s*(.*)$', ln)
-        if m_bullet_heading:
-            heading = m_bullet_heading.group(1).strip()
-            remainder = m_bullet_heading.group(2).strip()
-            paragraph_html.append(
-                f"• <strong>{heading}:</strong> {remainder}" if remainder else f"• <strong>{heading}:</strong>")
-            i += 1
-            continue
-
-        m_side = re.match(r'^\s*([^:]+):\s*(.*)$', ln)
-        if m_side and len(m_side.group(1).split()) <= 8:
-            left = m_side.group(1).strip()
-            right = m_side.group(2).strip()
-            paragraph_html.append(
-                f"<strong>{left}:</strong> {right}" if right else f"<strong>{left}:</strong>")
-            i += 1
-            continue
-
-        paragraph_html.append(ln)
-        i += 1
-
-    final_paragraphs = []
-    temp_lines = []
-    for entry in paragraph_html:
-        if entry == '':
-            if temp_lines:
-                final_paragraphs.append("<br>".join(temp_lines))
-                temp_lines = []
-        else:
-            temp_lines.append(entry)
-    if temp_lines:
-        final_paragraphs.append("<br>".join(temp_lines))
-
-    para_wrapped = [
-        f"<p style='margin:6px 0; line-height:1.45; font-size:0.98rem;'>{p}</p>" for p in final_paragraphs
-    ]
-    final_html = "\n".join(para_wrapped)
-
-    formatted_output = f"""
-    <div class="uncertainty-display">
-        {final_html}
-    </div>
-    """
-    formatted_output = re.sub(r'(<br>\s*){3,}', '<br><br>', formatted_output)
-    return formatted_output
+    return format_with_bold(text, "uncertainty", extra_phrases)
 
 def submit_feedback(feedback_type, name="", email="", off_definitions="", suggestions="", additional_feedback=""):
-    """Submit feedback to CSV file and admin session storage"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    # Get context data from session state
-    account = st.session_state.get("current_account", "")
-    industry = st.session_state.get("current_industry", "")
-    problem_statement = st.session_state.get("current_problem", "")
-
-    # Create feedback data for admin session
-    feedback_data = {
-        "Name": name,
-        "Email": email, 
-        "Feedback": additional_feedback,
-        "FeedbackType": feedback_type,
-        "OffDefinitions": off_definitions,
-        "Suggestions": suggestions,
-        "Account": account,
-        "Industry": industry,
-        "ProblemStatement": problem_statement
-    }
-
-    # Save to admin session storage
-    save_feedback_to_admin_session(feedback_data, "Uncertainty Agent")
-
-    # Also save to CSV file (original functionality)
-    new_entry = pd.DataFrame([[
-        timestamp, name, email, additional_feedback, feedback_type, off_definitions, suggestions, account, industry, problem_statement
-    ]], columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
-
+    """Submit feedback through the shared feedback service"""
     try:
-        # Try file-based storage first
-        if os.path.exists(FEEDBACK_FILE):
-            existing = pd.read_csv(FEEDBACK_FILE)
-
-            # Handle schema mismatch
-            missing_cols = set(new_entry.columns) - set(existing.columns)
-            for col in missing_cols:
-                existing[col] = ''
-
-            # Reorder existing columns to match the new entry's order
-            existing = existing[new_entry.columns]
-
-            updated = pd.concat([existing, new_entry], ignore_index=True)
-        else:
-            updated = new_entry
-
-        try:
-            updated.to_csv(FEEDBACK_FILE, index=False)
-        except (PermissionError, OSError):
-            # Fallback to session state on Streamlit Cloud
-            if 'feedback_data' not in st.session_state:
-                st.session_state.feedback_data = pd.DataFrame(
-                    columns=new_entry.columns)
-            st.session_state.feedback_data = pd.concat(
-                [st.session_state.feedback_data, new_entry], ignore_index=True)
-            st.info("📝 Feedback saved to session (cloud mode)")
+        submit_agent_feedback(
+            "Uncertainty Agent", feedback_type, name=name, email=email, off_definitions=off_definitions,
+            suggestions=suggestions, additional_feedback=additional_feedback,
+        )
 
         st.session_state.feedback_submitted = True
         return True
@@ -380,7 +109,7 @@ def submit_feedback(feedback_type, name="", email="", off_definitions="", sugges
 def reset_app_state():
     """Completely reset session state to initial values"""
     # Clear uncertainty-related state
-    keys_to_clear = ['uncertainty_outputs', 'show_uncertainty', 'feedback_submitted',
+    keys_to_clear = ['uncertainty_outputs', 'uncertainty_errors', 'show_uncertainty', 'feedback_submitted',
                      'feedback_option', 'analysis_complete', 'validation_attempted']
     for key in keys_to_clear:
         if key in st.session_state:
@@ -421,8 +150,85 @@ account, industry, problem = render_unified_business_inputs(
     save_button_label="✅ Save Problem Details",
 )
 
+# Pick up this dimension from the background full assessment once it has finished
+pipeline_results = take_assessment_results("uncertainty")
+if pipeline_results:
+    st.session_state.uncertainty_outputs, st.session_state.uncertainty_errors = split_agency_results(
+        pipeline_results, agency_result_to_text
+    )
+    store_agent_results("uncertainty", st.session_state.uncertainty_outputs)
+    st.session_state.show_uncertainty = True
+    st.session_state.analysis_complete = True
+render_assessment_status("uncertainty")
+
 st.markdown("---")
 
+# ===============================
+# Uncertainty Result Cards
+# ===============================
+
+def clean_uncertainty_output(text):
+    """Clean uncertainty output by removing Q1/Q2/Q3 prefixes, HTML tags, and fixing formatting"""
+    return clean_agent_output(text, "uncertainty")
+
+
+def render_uncertainty_card(api_name, api_output, display_account, display_industry):
+    """Render one uncertainty question card (used while streaming results and on rerun)"""
+    question_description = ""
+    for cfg in API_CONFIGS:
+        if cfg.get("name") == api_name:
+            question_description = cfg.get("description", "")
+            break
+
+    clean_question = re.sub(r'^Q\d+\.?\s*', '', question_description or "").strip() or api_name.replace("_", " ").title()
+    # Cleaned, bulleted, bold-labelled answer; cached across reruns and sessions
+    html_body = cached_answer_html(api_output, "uncertainty", display_account, display_industry)
+
+    # Updated border styling to match Vocabulary - Red border like Vocabulary
+    st.markdown(
+        f"""
+        <div style="
+            background: var(--bg-card);
+            border: 2px solid #8b1e1e;
+            border-radius: 16px;
+            padding: 1.6rem;
+            margin-bottom: 1.6rem;
+            box-shadow: 0 3px 10px rgba(139,30,30,0.15);
+        ">
+            <h4 style="
+                color: #8b1e1e;
+                font-weight: 700;
+                font-size: 1.15rem;
+                margin: 0 0 1rem 0;
+                border-bottom: 2px solid #8b1e1e;
+                padding-bottom: 0.5rem;
+                text-align: left;
+            ">
+                {clean_question}
+            </h4>
+            <div style="
+                color: var(--text-primary);
+                line-height: 1.45;
+                font-size: 1rem;
+                text-align: left;
+                white-space: normal;
+            ">
+                {html_body}
+            </div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+
+def render_uncertainty_job_result(api_name, result_data, error):
+    """Card for a finished background call, or its error (errors are never shown as answers)"""
+    if error is not None:
+        st.error(f"❌ {api_name}: {describe_agency_error(error)}")
+    else:
+        render_uncertainty_card(api_name, agency_result_to_text(result_data), display_account, display_industry)
+
+
 # ===============================
 # Uncertainty Analysis Section
 # ===============================
@@ -454,94 +260,45 @@ if analyze_btn:
         st.stop()
 
     # Build context
-    full_context = f"""
-    Business Problem:
-    {problem.strip()}
-
-    Context:
-    Account: {account}
-    Industry: {industry}
-    """.strip()
-
-    # Prepare headers with authentication
-    headers = HEADERS_BASE.copy()
-    headers.update({
-        "Tenant-ID": TENANT_ID,
-        "X-Tenant-ID": TENANT_ID
-    })
-
-    if st.session_state.auth_token:
-        headers["Authorization"] = f"Bearer {st.session_state.auth_token}"
-
-    with st.spinner("🔍 Analyzing uncertainty factors and risk elements..."):
-        progress = st.progress(0)
-        st.session_state.uncertainty_outputs = {}
-
-        try:
-            with requests.Session() as session:
-                total_apis = len(API_CONFIGS)
-                
-                for i, api_cfg in enumerate(API_CONFIGS):
-                    progress.progress(i / total_apis)
-                    
-                    try:
-                        goal = api_cfg["prompt"](full_context, {})
-                        
-                        # Make API request with timeout
-                        response = session.post(
-                            api_cfg["url"],
-                            headers=headers,
-                            json={"agency_goal": goal},
-                            timeout=60
-                        )
-
-                        if response.status_code == 200:
-                            # Process successful response
-                            result_data = response.json()
-                            text_output = json_to_text(result_data)
-                            cleaned_text = sanitize_text(text_output)
-                            
-                            st.session_state.uncertainty_outputs[api_cfg["name"]] = cleaned_text
-                        else:
-                            error_msg = f"API Error {response.status_code}: {response.text[:200]}"
-                            st.session_state.uncertainty_outputs[api_cfg["name"]] = error_msg
-
-                    except requests.exceptions.Timeout:
-                        st.session_state.uncertainty_outputs[api_cfg["name"]] = "Request timeout: The API took too long to respond."
-                    except Exception as e:
-                        st.session_state.uncertainty_outputs[api_cfg["name"]] = f"Error: {str(e)}"
-
-                progress.progress(1.0)
-                st.session_state.show_uncertainty = True
-                st.session_state.analysis_complete = True
-                st.success("✅ Uncertainty analysis complete!")
-
-        except Exception as e:
-            st.error(f"An unexpected error occurred during analysis: {str(e)}")
+    full_context = build_agent_context(problem, account, industry)
+
+    # The calls run as a background job, so clicking around or switching pages
+    # does not cancel them; coming back reattaches to the same job
+    st.session_state.uncertainty_outputs = {}
+    st.session_state.uncertainty_errors = {}
+    st.session_state.show_uncertainty = False
+    submit_agent_job(
+        "uncertainty",
+        [(cfg["name"], cfg["url"], cfg["prompt"](full_context, {})) for cfg in API_CONFIGS],
+    )
+
+# Cards appear as each question is answered; the page reruns once all are in
+render_agent_job_progress(
+    "uncertainty",
+    sanitize_text,
+    titles={cfg["name"]: cfg["description"] for cfg in API_CONFIGS},
+    render_result=render_uncertainty_job_result,
+)
+
+job_results = take_agent_job_results("uncertainty")
+if job_results:
+    st.session_state.uncertainty_outputs, st.session_state.uncertainty_errors = split_agency_results(
+        job_results, agency_result_to_text
+    )
+    store_agent_results("uncertainty", st.session_state.uncertainty_outputs)
+    st.session_state.show_uncertainty = True
+    st.session_state.analysis_complete = True
+    if not st.session_state.uncertainty_errors:
+        st.success("✅ Uncertainty analysis complete!")
+
+# Failed questions are reported, never rendered as answers
+for api_name, message in st.session_state.get("uncertainty_errors", {}).items():
+    st.error(f"❌ {api_name}: {message}")
 
 # ===============================
 # Display Uncertainty Results
 # ===============================
 
-def clean_uncertainty_output(text):
-    """Clean uncertainty output by removing Q1/Q2/Q3 prefixes, HTML tags, and fixing formatting"""
-    if not text:
-        return "No uncertainty data available"
-
-    clean_text = re.sub(r'<[^>]+>', '', text)
-    clean_text = re.sub(r'^(Q\d+\.?\s*)', '', clean_text, flags=re.MULTILINE | re.IGNORECASE)
-    clean_text = re.sub(r'\n(Q\d+\.?\s*)', '\n', clean_text, flags=re.MULTILINE | re.IGNORECASE)
-    clean_text = re.sub(r'^(Question\s*\d+\.?\s*)', '', clean_text, flags=re.MULTILINE | re.IGNORECASE)
-    clean_text = re.sub(r'\n(Question\s*\d+\.?\s*)', '\n', clean_text, flags=re.MULTILINE | re.IGNORECASE)
-    clean_text = re.sub(r'^(Answer|Analysis)\s*:\s*', '', clean_text, flags=re.MULTILINE | re.IGNORECASE)
-    clean_text = re.sub(r'Score\s*\(0[-–]5\)\s*:', 'Score:', clean_text, flags=re.IGNORECASE)
-    clean_text = re.sub(r'^\s+', '', clean_text, flags=re.MULTILINE)
-    clean_text = re.sub(r'\n\s+', '\n', clean_text)
-    clean_text = re.sub(r' {2,}', ' ', clean_text)
-    clean_text = re.sub(r'\n{3,}', '\n\n', clean_text)
-    return clean_text.strip()
-
-
 if st.session_state.get("show_uncertainty") and st.session_state.get("uncertainty_outputs"):
     st.markdown("---")
 
@@ -573,85 +330,8 @@ if st.session_state.get("show_uncertainty") and st.session_state.get("uncertaint
     )
 
     # Loop through uncertainty results
-    for i, (api_name, api_output) in enumerate(st.session_state["uncertainty_outputs"].items()):
-        question_description = ""
-        for cfg in API_CONFIGS:
-            if cfg.get("name") == api_name:
-                question_description = cfg.get("description", "")
-                break
-
-        clean_question = re.sub(r'^Q\d+\.?\s*', '', question_description or "").strip() or api_name.replace("_", " ").title()
-        cleaned_output = clean_uncertainty_output(api_output)
-
-        # Replace company/industry names
-        if display_account and display_account != "Unknown Company":
-            cleaned_output = re.sub(r'\bthe company\b', display_account, cleaned_output, flags=re.IGNORECASE)
-        if display_industry and display_industry != "Unknown Industry":
-            cleaned_output = re.sub(r'\bthe industry\b', display_industry, cleaned_output, flags=re.IGNORECASE)
-
-        # Format output with proper list formatting + bold labels + left alignment
-        formatted_output = cleaned_output
-
-        # Convert numbered and dash lists to bullets
-        formatted_output = re.sub(r'(?m)^\s*(?:\d+\.|-)\s+(.*)', r'• \1', formatted_output)
-
-        # Ensure bullets always start on a new line (even if inline after colon)
-        formatted_output = re.sub(r':\s*•', ':\n•', formatted_output)
-
-        # Handle sentences ending with ":" followed by bullet text
-        formatted_output = re.sub(r'(:)\s+(?=•)', r'\1\n', formatted_output)
-
-        # Add newline before bullets (to separate from paragraphs)
-        formatted_output = re.sub(r'(?<!\n)\s*•', r'\n•', formatted_output)
-
-        # Bold text before colon, including bullets
-        formatted_output = re.sub(
-            r'(^|[\n])\s*(•\s*)?([^:\n]{2,80}):',
-            lambda m: f"{m.group(1)}{m.group(2) or ''}<strong>{m.group(3).strip()}:</strong>",
-            formatted_output
-        )
-
-        # Remove extra blank lines
-        formatted_output = re.sub(r'\n{2,}', '\n', formatted_output)
-
-        # Convert newlines to <br>
-        html_body = formatted_output.replace('\n', '<br>')
-
-        # Updated border styling to match Vocabulary - Red border like Vocabulary
-        st.markdown(
-            f"""
-            <div style="
-                background: var(--bg-card);
-                border: 2px solid #8b1e1e;
-                border-radius: 16px;
-                padding: 1.6rem;
-                margin-bottom: 1.6rem;
-                box-shadow: 0 3px 10px rgba(139,30,30,0.15);
-            ">
-                <h4 style="
-                    color: #8b1e1e;
-                    font-weight: 700;
-                    font-size: 1.15rem;
-                    margin: 0 0 1rem 0;
-                    border-bottom: 2px solid #8b1e1e;
-                    padding-bottom: 0.5rem;
-                    text-align: left;
-                ">
-                    {clean_question}
-                </h4>
-                <div style="
-                    color: var(--text-primary);
-                    line-height: 1.45;
-                    font-size: 1rem;
-                    text-align: left;
-                    white-space: normal;
-                ">
-                    {html_body}
-                </div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    for api_name, api_output in st.session_state["uncertainty_outputs"].items():
+        render_uncertainty_card(api_name, api_output, display_account, display_industry)
 
 
 
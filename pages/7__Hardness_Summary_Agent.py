@@ -1,15 +1,8 @@
 import streamlit as st
-import streamlit.components.v1 as components
-import os
-import re
-import json
-from datetime import datetime
-import pandas as pd
-import requests
 from shared_header import (
     render_header,
     render_admin_panel,
-    save_feedback_to_admin_session,
+    submit_agent_feedback,
     ACCOUNTS,
     INDUSTRIES,
     ACCOUNT_INDUSTRY_MAP,
@@ -20,8 +13,32 @@ from shared_header import (
     get_overall_hardness_score,
     get_agent_progress,
     get_all_question_scores,
-    DIMENSION_QUESTIONS
+    store_agent_results,
+    get_agent_results,
+    get_low_confidence_questions,
+    cached_answer_html,
+    DIMENSION_QUESTIONS,
+    submit_agent_job,
+    split_agency_results,
+    take_agent_job_results,
+    render_agent_job_progress,
+    AGENT_API_CONFIGS,
+    build_agent_context,
+    hardness_extra_context,
+    session_question_results,
+    take_assessment_results,
+    assessment_pending,
+    render_assessment_status,
 )
+from text_cleaning import json_to_text, sanitize_text, format_hardness_output
+from agent_results import score_classification
+
+# Tile colour and marker per hardness band
+BAND_STYLES = {
+    "HARD": ("#ff6b6b", "🔴"),
+    "MODERATE": ("#ffa502", "🟡"),
+    "NOT HARD": ("#51cf66", "🟢"),
+}
 
 # --- Page Config ---
 st.set_page_config(
@@ -73,211 +90,17 @@ if admin_toggled or st.session_state.get('current_page', '') == 'admin':
 # API Configuration for Hardness
 # ===============================
 
-# Constants
-TENANT_ID = "talos"
-HEADERS_BASE = {"Content-Type": "application/json"}
-
 # Hardness API
-API_CONFIGS = [
-    {
-        "name": "hardness_summary",
-        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758619658634&level=1",
-        "multiround_convo": 2,
-        "description": "Hardness Level, Summary & Key Takeaways",
-        "prompt": lambda problem, outputs: (
-            f"Problem statement - {problem}\n\n"
-            "Based on the comprehensive analysis of the business problem, provide a hardness assessment with the following sections IN THIS EXACT FORMAT:\n\n"
-            
-            "Overall Difficulty Score\n"
-            "[Provide a single numerical score between 0-5 based on your assessment of the problem complexity]\n\n"
-            "Hardness Level\n"
-            "[Easy: 0-3.0, Moderate: 3.1-4.0, or Hard: 4.1-5.0]\n\n"
-            "SME Justification\n"
-            "[Provide detailed justification analyzing the problem across multiple dimensions - complexity, ambiguity, interconnectedness, and uncertainty]\n\n"
-            "Summary\n"
-            "[Provide a concise summary of the overall assessment in 2-3 sentences]\n\n"
-            "Key Takeaways\n"
-            "[Provide 3-5 bullet points with actionable insights]\n\n"
-            "IMPORTANT: Make sure each section is clearly labeled with its header as shown above. Provide actual scores and analysis, not placeholders."
-        )
-    }
-]
-
-# Global feedback file path
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-FEEDBACK_FILE = os.path.join(BASE_DIR, "feedback.csv")
-
-# Initialize feedback file if not present
-try:
-    if not os.path.exists(FEEDBACK_FILE):
-        df = pd.DataFrame(columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType",
-                          "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
-        df.to_csv(FEEDBACK_FILE, index=False)
-except (PermissionError, OSError) as e:
-    if 'feedback_data' not in st.session_state:
-        st.session_state.feedback_data = pd.DataFrame(
-            columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
-
-# Token initialization
-def _init_auth_token():
-    token = os.environ.get("AUTH_TOKEN", "")
-    try:
-        if not token:
-            token = st.secrets.get("AUTH_TOKEN", "")
-    except Exception:
-        pass
-    return token or ""
-
-if 'auth_token' not in st.session_state:
-    st.session_state.auth_token = _init_auth_token()
+API_CONFIGS = AGENT_API_CONFIGS["hardness_summary"]
 
 # ===============================
 # Utility Functions
 # ===============================
 
-def json_to_text(data):
-    """Extract text from JSON response"""
-    if data is None:
-        return ""
-    if isinstance(data, str):
-        return data
-    if isinstance(data, dict):
-        for key in ("result", "output", "content", "text", "answer", "response"):
-            if key in data and data[key]:
-                return json_to_text(data[key])
-        if "data" in data:
-            return json_to_text(data["data"])
-        # Try to extract any string values
-        for value in data.values():
-            if isinstance(value, str) and len(value) > 10:
-                return value
-        return "\n".join(f"{k}: {json_to_text(v)}" for k, v in data.items() if v)
-    if isinstance(data, list):
-        return "\n".join(json_to_text(x) for x in data if x)
-    return str(data)
-
-def sanitize_text(text):
-    """Remove markdown artifacts and clean up text"""
-    if not text:
-        return ""
-
-    # Fix the "s" character issue
-    text = re.sub(r'^\s*s\s+', '', text.strip())
-    text = re.sub(r'\n\s*s\s+', '\n', text)
-
-    text = re.sub(r'Q\d+\s*Answer\s*Explanation\s*:',
-                  '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-    text = re.sub(r'\*(.*?)\*', r'\1', text)
-    text = re.sub(r'`(.*?)`', r'\1', text)
-    text = re.sub(r'#+\s*', '', text)
-    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
-    text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r' {2,}', ' ', text)
-    text = re.sub(r'^\s*[-*]\s+', '• ', text, flags=re.MULTILINE)
-    text = re.sub(r'<\/?[^>]+>', '', text)
-    text = re.sub(r'& Key Takeaway:', 'Key Takeaway:', text)
-
-    return text.strip()
-
-def extract_hardness_score(text):
-    """Extract the hardness score from the API response"""
-    if not text:
-        return None
-    
-    # Look for score patterns in the Overall Difficulty Score section
-    score_patterns = [
-        r'Overall Difficulty Score\s*[:\-]?\s*(\d+\.?\d*)',
-        r'Score\s*[:\-]?\s*(\d+\.?\d*)',
-        r'(\d+\.?\d*)\s*\/\s*5',
-        r'(\d+\.?\d*)\s*out of\s*5',
-        r'Hardness Level.*?(\d+\.?\d*)',
-    ]
-    
-    for pattern in score_patterns:
-        matches = re.search(pattern, text, re.IGNORECASE)
-        if matches:
-            try:
-                score = float(matches.group(1))
-                if 0 <= score <= 5:
-                    return score
-            except ValueError:
-                continue
-    
-    # If no specific score found, look for any number between 0-5
-    numbers = re.findall(r'\b(\d+\.?\d*)\b', text)
-    for num in numbers:
-        try:
-            score = float(num)
-            if 0 <= score <= 5:
-                return score
-        except ValueError:
-            continue
-    
-    return None
-
-def extract_hardness_classification(text):
-    """Extract hardness classification from text"""
-    if not text:
-        return "UNKNOWN"
-    
-    text_lower = text.lower()
-    
-    if any(word in text_lower for word in ['hard', 'difficult', 'complex', 'challenging', '4.1', '4.2', '4.3', '4.4', '4.5', '4.6', '4.7', '4.8', '4.9', '5.0']):
-        return "HARD"
-    elif any(word in text_lower for word in ['moderate', 'medium', 'average', '3.1', '3.2', '3.3', '3.4', '3.5', '3.6', '3.7', '3.8', '3.9', '4.0']):
-        return "MODERATE"
-    elif any(word in text_lower for word in ['easy', 'simple', 'straightforward', '0.', '1.', '2.', '3.0']):
-        return "NOT HARD"
-    else:
-        # Fallback: use score if available
-        score = extract_hardness_score(text)
-        if score is not None:
-            if score >= 4.0:
-                return "HARD"
-            else:
-                return "NOT HARD"
-        return "UNKNOWN"
-
-def format_hardness_output(text):
-    """Format hardness output by removing everything before SME Justification and cleaning up"""
-    if not text:
-        return "No hardness data available"
-
-    # Remove everything before "SME Justification"
-    clean_text = re.sub(r'^.*?(?=SME Justification)', '', text, flags=re.DOTALL | re.IGNORECASE)
-    
-    # If SME Justification wasn't found, use the original text
-    if not clean_text.strip():
-        clean_text = text
-    
-    # Remove calculation sections that might still be present
-    clean_text = re.sub(r'Calculation:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
-    clean_text = re.sub(r'Score Calculation:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
-    clean_text = re.sub(r'Calculation Process:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
-    clean_text = re.sub(r'How.*?calculated:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.IGNORECASE | re.DOTALL)
-    
-    # Remove mathematical expressions
-    clean_text = re.sub(r'\(\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*\)\s*\/\s*4', '', clean_text)
-    clean_text = re.sub(r'\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*=\s*\d+\.?\d*', '', clean_text)
-    
-    # Remove dimension scores and individual question scores if they appear after SME Justification
-    clean_text = re.sub(r'Individual Question Scores.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
-    clean_text = re.sub(r'Dimension Averages.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
-    clean_text = re.sub(r'DIMENSION SCORES:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
-    clean_text = re.sub(r'OVERALL CLASSIFICATION:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
-    clean_text = re.sub(r'COMPREHENSIVE ASSESSMENT:.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
-    clean_text = re.sub(r'HARDNESS SUMMARY.*?(?=\n\n|\n[A-Z]|$)', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
-    
-    # Clean up remaining text
-    clean_text = re.sub(r'<[^>]+>', '', clean_text)
-    clean_text = re.sub(r'^\s+', '', clean_text, flags=re.MULTILINE)
-    clean_text = re.sub(r'\n\s+', '\n', clean_text)
-    clean_text = re.sub(r' {2,}', ' ', clean_text)
-    clean_text = re.sub(r'\n{3,}', '\n\n', clean_text)
-    
-    return clean_text.strip()
+def agency_result_to_text(result_data):
+    """Sanitized answer text of a successful agency call"""
+    text_output = json_to_text(result_data)
+    return sanitize_text(text_output)
 
 def submit_feedback_wrapper(feedback_type, user_id="", off_definitions="", suggestions="", additional_feedback=""):
     """Wrapper for submit_feedback to handle the parameter mismatch"""
@@ -291,62 +114,12 @@ def submit_feedback_wrapper(feedback_type, user_id="", off_definitions="", sugge
     )
 
 def submit_feedback(feedback_type, name="", email="", off_definitions="", suggestions="", additional_feedback=""):
-    """Submit feedback to CSV file and admin session storage"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    # Get context data from session state
-    account = st.session_state.get("current_account", "")
-    industry = st.session_state.get("current_industry", "")
-    problem_statement = st.session_state.get("current_problem", "")
-
-    # Create feedback data for admin session
-    feedback_data = {
-        "Name": name,
-        "Email": email, 
-        "Feedback": additional_feedback,
-        "FeedbackType": feedback_type,
-        "OffDefinitions": off_definitions,
-        "Suggestions": suggestions,
-        "Account": account,
-        "Industry": industry,
-        "ProblemStatement": problem_statement
-    }
-
-    # Save to admin session storage
-    save_feedback_to_admin_session(feedback_data, "Hardness Agent")
-
-    # Also save to CSV file (original functionality)
-    new_entry = pd.DataFrame([[
-        timestamp, name, email, additional_feedback, feedback_type, off_definitions, suggestions, account, industry, problem_statement
-    ]], columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
-
+    """Submit feedback through the shared feedback service"""
     try:
-        # Try file-based storage first
-        if os.path.exists(FEEDBACK_FILE):
-            existing = pd.read_csv(FEEDBACK_FILE)
-
-            # Handle schema mismatch
-            missing_cols = set(new_entry.columns) - set(existing.columns)
-            for col in missing_cols:
-                existing[col] = ''
-
-            # Reorder existing columns to match the new entry's order
-            existing = existing[new_entry.columns]
-
-            updated = pd.concat([existing, new_entry], ignore_index=True)
-        else:
-            updated = new_entry
-
-        try:
-            updated.to_csv(FEEDBACK_FILE, index=False)
-        except (PermissionError, OSError):
-            # Fallback to session state on Streamlit Cloud
-            if 'feedback_data' not in st.session_state:
-                st.session_state.feedback_data = pd.DataFrame(
-                    columns=new_entry.columns)
-            st.session_state.feedback_data = pd.concat(
-                [st.session_state.feedback_data, new_entry], ignore_index=True)
-            st.info("📝 Feedback saved to session (cloud mode)")
+        submit_agent_feedback(
+            "Hardness Agent", feedback_type, name=name, email=email, off_definitions=off_definitions,
+            suggestions=suggestions, additional_feedback=additional_feedback,
+        )
 
         st.session_state.hardness_feedback_submitted = True  # AGENT-SPECIFIC
         return True
@@ -399,6 +172,17 @@ account, industry, problem = render_unified_business_inputs(
     save_button_label="✅ Save Problem Details",
 )
 
+# Pick up the hardness summary from the background full assessment once it has finished
+pipeline_results = take_assessment_results("hardness_summary")
+if pipeline_results:
+    st.session_state.hardness_outputs, st.session_state.hardness_errors = split_agency_results(
+        pipeline_results, agency_result_to_text
+    )
+    store_agent_results("hardness_summary", st.session_state.hardness_outputs)
+    st.session_state.show_hardness = True
+    st.session_state.analysis_complete = True
+render_assessment_status("hardness_summary")
+
 st.markdown("---")
 
 # ===============================
@@ -413,6 +197,34 @@ has_problem = bool(problem.strip())
 # Check if all agents are completed for comprehensive analysis
 all_completed = all_agents_completed()
 
+# With all twelve question scores in, the headline score and band are plain arithmetic
+question_scores = get_all_question_scores()
+all_questions = [q for questions in DIMENSION_QUESTIONS.values() for q in questions]
+local_hardness_score = None
+if all(question_scores.get(q) is not None for q in all_questions):
+    local_hardness_score = sum(question_scores[q] for q in all_questions) / len(all_questions)
+
+# The narrative is asked for once per problem and set of question scores
+narrative_key = (account, industry, problem, tuple(sorted(question_scores.items())))
+if pipeline_results:
+    # The background assessment already wrote it for these scores; do not ask again
+    st.session_state.hardness_narrative_key = narrative_key
+
+
+def submit_hardness_summary():
+    """Ask the hardness agency for its narrative in the background, passing the Q1-Q12 scores and takeaways"""
+    full_context = build_agent_context(problem, account, industry, extra=hardness_extra_context(session_question_results()))
+
+    # Runs as a background job; answers are previewed live while they stream in
+    st.session_state.hardness_outputs = {}
+    st.session_state.hardness_errors = {}
+    st.session_state.show_hardness = False
+    st.session_state.hardness_narrative_key = narrative_key
+    submit_agent_job(
+        "hardness_summary",
+        [(api_cfg["name"], api_cfg["url"], api_cfg["prompt"](full_context, {})) for api_cfg in API_CONFIGS],
+    )
+
 # Analyze Hardness Button
 analyze_btn = st.button("🔍 Analyze Hardness", type="primary", use_container_width=True,
                         disabled=not (has_account and has_industry and has_problem))
@@ -434,86 +246,43 @@ if analyze_btn:
         st.error("❌ Please enter a business problem description.")
         st.stop()
 
-    # Build enhanced context with dimension scores if available
-    dimension_scores_text = ""
-    if all_completed:
-        dimension_scores = progress_data['scores']
-        dimension_scores_text = "\n\nDimension Scores:\n"
-        for dimension, score in dimension_scores.items():
-            if score is not None:
-                dimension_scores_text += f"{dimension.title()}: {score:.2f}/5\n"
-    
-    full_context = f"""
-    Business Problem:
-    {problem.strip()}
-
-    Context:
-    Account: {account}
-    Industry: {industry}
-    {dimension_scores_text}
-    """.strip()
-
-    # Prepare headers with authentication
-    headers = HEADERS_BASE.copy()
-    headers.update({
-        "Tenant-ID": TENANT_ID,
-        "X-Tenant-ID": TENANT_ID
-    })
-
-    if st.session_state.auth_token:
-        headers["Authorization"] = f"Bearer {st.session_state.auth_token}"
-
-    with st.spinner("🔍 Analyzing problem hardness and difficulty..."):
-        progress = st.progress(0)
-        st.session_state.hardness_outputs = {}
+    submit_hardness_summary()
+
+# The headline is already local; the narrative is fetched once per set of scores, in the background
+elif (
+    local_hardness_score is not None
+    and has_account and has_industry and has_problem
+    and not assessment_pending("hardness_summary")
+    and st.session_state.get("hardness_narrative_key") != narrative_key
+):
+    submit_hardness_summary()
+
+render_agent_job_progress(
+    "hardness_summary",
+    sanitize_text,
+    titles={api_cfg["name"]: api_cfg["description"] for api_cfg in API_CONFIGS},
+)
 
-        try:
-            with requests.Session() as session:
-                total_apis = len(API_CONFIGS)
-                
-                for i, api_cfg in enumerate(API_CONFIGS):
-                    progress.progress(i / total_apis)
-                    
-                    try:
-                        goal = api_cfg["prompt"](full_context, {})
-                        
-                        # Make API request with timeout
-                        response = session.post(
-                            api_cfg["url"],
-                            headers=headers,
-                            json={"agency_goal": goal},
-                            timeout=60
-                        )
-
-                        if response.status_code == 200:
-                            # Process successful response
-                            result_data = response.json()
-                            text_output = json_to_text(result_data)
-                            cleaned_text = sanitize_text(text_output)
-                            
-                            st.session_state.hardness_outputs[api_cfg["name"]] = cleaned_text
-                        else:
-                            error_msg = f"API Error {response.status_code}: {response.text[:200]}"
-                            st.session_state.hardness_outputs[api_cfg["name"]] = error_msg
-
-                    except requests.exceptions.Timeout:
-                        st.session_state.hardness_outputs[api_cfg["name"]] = "Request timeout: The API took too long to respond."
-                    except Exception as e:
-                        st.session_state.hardness_outputs[api_cfg["name"]] = f"Error: {str(e)}"
-
-                progress.progress(1.0)
-                st.session_state.show_hardness = True
-                st.session_state.analysis_complete = True
-                st.success("✅ Hardness analysis complete!")
-
-        except Exception as e:
-            st.error(f"An unexpected error occurred during analysis: {str(e)}")
+job_results = take_agent_job_results("hardness_summary")
+if job_results:
+    st.session_state.hardness_outputs, st.session_state.hardness_errors = split_agency_results(
+        job_results, agency_result_to_text
+    )
+    store_agent_results("hardness_summary", st.session_state.hardness_outputs)
+    st.session_state.show_hardness = True
+    st.session_state.analysis_complete = True
+    if not st.session_state.hardness_errors:
+        st.success("✅ Hardness analysis complete!")
+
+# Failed calls are reported, never rendered as answers
+for api_name, message in st.session_state.get("hardness_errors", {}).items():
+    st.error(f"❌ {api_name}: {message}")
 
 # ===============================
 # Display Hardness Results
 # ===============================
 
-if st.session_state.get("show_hardness") and st.session_state.get("hardness_outputs"):
+if (st.session_state.get("show_hardness") and st.session_state.get("hardness_outputs")) or local_hardness_score is not None:
     st.markdown("---")
 
     display_account = globals().get("display_account") or st.session_state.get("saved_account", "Unknown Company")
@@ -543,15 +312,18 @@ if st.session_state.get("show_hardness") and st.session_state.get("hardness_outp
         unsafe_allow_html=True,
     )
 
-    # Get the hardness output
-    hardness_output = st.session_state.hardness_outputs.get("hardness_summary", "")
-    
-    # Extract score and classification
-    hardness_score = extract_hardness_score(hardness_output)
-    hardness_classification = extract_hardness_classification(hardness_output)
+    # Score and classification were parsed once when the summary arrived
+    hardness_record = get_agent_results("hardness_summary", st.session_state.hardness_outputs).get("hardness_summary")
+    hardness_score = hardness_record.score if hardness_record else None
+    hardness_classification = hardness_record.classification if hardness_record else "UNKNOWN"
     
     # Calculate overall score from dimensions if available
     overall_dimension_score = get_overall_hardness_score()
+
+    # Structured dimension scores take precedence over the score read out of the summary text
+    if local_hardness_score is not None:
+        hardness_score = None
+        hardness_classification = score_classification(local_hardness_score)
     
     # Create two-column layout with equal dimensions
     col1, col2 = st.columns(2)
@@ -638,15 +410,7 @@ if st.session_state.get("show_hardness") and st.session_state.get("hardness_outp
         display_score = hardness_score if hardness_score is not None else overall_dimension_score
         
         if display_score is not None:
-            if display_score >= 4.0:
-                score_color = "#ff6b6b"
-                score_emoji = "🔴"
-            elif display_score >= 3.1:
-                score_color = "#ffa502"
-                score_emoji = "🟡"
-            else:
-                score_color = "#51cf66"
-                score_emoji = "🟢"
+            score_color, score_emoji = BAND_STYLES[score_classification(display_score)]
             
             score_source = "AI Assessment" if hardness_score is not None else "Dimension Average"
             
@@ -718,6 +482,13 @@ if st.session_state.get("show_hardness") and st.session_state.get("hardness_outp
                 unsafe_allow_html=True
             )
 
+    low_confidence = get_low_confidence_questions()
+    if low_confidence:
+        st.caption(
+            f"⚠️ Scores for {', '.join(low_confidence)} were missing or loosely stated in the agent answers; "
+            "re-run those dimensions for a firmer assessment."
+        )
+
     # Display Dimension Scores if available
     if all_completed:
         st.markdown("<br>", unsafe_allow_html=True)
@@ -743,15 +514,7 @@ if st.session_state.get("show_hardness") and st.session_state.get("hardness_outp
         for i, (dimension, score) in enumerate(dimension_scores.items()):
             with dim_cols[i]:
                 if score is not None:
-                    if score >= 4.0:
-                        dim_color = "#ff6b6b"
-                        dim_emoji = "🔴"
-                    elif score >= 3.1:
-                        dim_color = "#ffa502" 
-                        dim_emoji = "🟡"
-                    else:
-                        dim_color = "#51cf66"
-                        dim_emoji = "🟢"
+                    dim_color, dim_emoji = BAND_STYLES[score_classification(score)]
                     
                     st.markdown(
                         f"""
@@ -782,8 +545,46 @@ if st.session_state.get("show_hardness") and st.session_state.get("hardness_outp
                         unsafe_allow_html=True
                     )
 
-    # Continue with the rest of your existing display code for detailed analysis...
-    # [Keep your existing detailed analysis display code here]
+    # SME justification, summary and takeaways from the hardness agency (arrives after the headline)
+    hardness_output = st.session_state.hardness_outputs.get("hardness_summary")
+    if hardness_output:
+        html_body = cached_answer_html(format_hardness_output(hardness_output), "hardness", display_account, display_industry)
+        st.markdown(
+            f"""
+            <div style="
+                background: var(--bg-card);
+                border: 2px solid #8b1e1e;
+                border-radius: 16px;
+                padding: 1.6rem;
+                margin: 1.6rem 0;
+                box-shadow: 0 3px 10px rgba(139,30,30,0.15);
+            ">
+                <h4 style="
+                    color: #8b1e1e;
+                    font-weight: 700;
+                    font-size: 1.15rem;
+                    margin: 0 0 1rem 0;
+                    border-bottom: 2px solid #8b1e1e;
+                    padding-bottom: 0.5rem;
+                    text-align: left;
+                ">
+                    SME Justification, Summary & Key Takeaways
+                </h4>
+                <div style="
+                    color: var(--text-primary);
+                    line-height: 1.45;
+                    font-size: 1rem;
+                    text-align: left;
+                    white-space: normal;
+                ">
+                    {html_body}
+                </div>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+    elif not st.session_state.get("hardness_errors"):
+        st.caption("📝 The SME justification and key takeaways are being written in the background and will appear here.")
 
 # ===============================
 # User Feedback Section - UPDATED
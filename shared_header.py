@@ -5,17 +5,31 @@ Provides fixed header with logo, title, theme toggle, and admin access.
 import streamlit as st
 import streamlit.components.v1 as components
 import os
+import html
+import json
+import math
+import time
+import hashlib
+import random
+import sqlite3
+import threading
+import uuid
 import pandas as pd
-from urllib.parse import unquote
+import requests
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import unquote, urlparse, parse_qs
 from datetime import datetime
+from text_cleaning import answer_html, json_to_text, sanitize_text
+from agent_results import parse_agent_result
+from feedback_log import FEEDBACK_COLUMNS, FeedbackLog, new_feedback_id
+from feedback_store import FeedbackStore
+from feedback_writer import FeedbackWriter
 
 # Logo URL for the header
 LOGO_URL = "https://yt3.googleusercontent.com/ytc/AIdro_k-7HkbByPWjKpVPO3LCF8XYlKuQuwROO0vf3zo1cqgoaE=s900-c-k-c0x00ffffff-no-rj"
 
-# Feedback file path for admin section
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-FEEDBACK_FILE = os.path.join(BASE_DIR, "feedback.csv")
-
 # ================================
 # 🏢 Account & Industry Mapping
 # ================================
@@ -80,6 +94,986 @@ INDUSTRIES = sorted([i for i in all_industries if i != "Select Industry"])
 if "Other" not in INDUSTRIES:
     INDUSTRIES.append("Other")
 INDUSTRIES = ["Select Industry"] + INDUSTRIES
+
+# ================================
+# 🌐 Talos Reasoning API Client
+# ================================
+
+TALOS_TENANT_ID = "talos"
+# Send every agency call to another reasoning_api host, e.g. the local mock server
+# (TALOS_BASE_URL=http://127.0.0.1:8765); the path and society/agency query are kept
+TALOS_BASE_URL = os.environ.get("TALOS_BASE_URL", "").rstrip("/")
+TALOS_REQUEST_TIMEOUT = 60
+# Upper bound of keep-alive connections kept per host; sized for 50+ concurrent users
+TALOS_POOL_MAXSIZE = int(os.environ.get("TALOS_POOL_MAXSIZE", "64"))
+# Ask for server-sent events so pages can show text while the answer is still being written
+TALOS_STREAMING = os.environ.get("TALOS_STREAMING", "1") != "0"
+# A host that does not accept the connection quickly is treated as down
+TALOS_CONNECT_TIMEOUT = 10
+# Retries for dropped connections and 5xx/429 answers, with exponential backoff and full jitter
+TALOS_MAX_RETRIES = int(os.environ.get("TALOS_MAX_RETRIES", "2"))
+TALOS_BACKOFF_BASE_SECONDS = 1.0
+TALOS_BACKOFF_MAX_SECONDS = 8.0
+# An agency that keeps failing is skipped for a while instead of making every user wait on it
+TALOS_BREAKER_FAILURES = int(os.environ.get("TALOS_BREAKER_FAILURES", "5"))
+TALOS_BREAKER_COOLDOWN_SECONDS = int(os.environ.get("TALOS_BREAKER_COOLDOWN_SECONDS", "30"))
+
+
+class TalosAPIError(Exception):
+    """Raised when the reasoning API answers with a non-200 status."""
+
+    def __init__(self, status_code, body=""):
+        self.status_code = status_code
+        self.body = body or ""
+        super().__init__(f"API Error {status_code}: {self.body[:200]}")
+
+
+class TalosCircuitOpenError(TalosAPIError):
+    """Raised without calling the API while an agency's circuit breaker is open."""
+
+    def __init__(self, agency_id, retry_in):
+        self.agency_id = agency_id
+        self.retry_in = retry_in
+        super().__init__(503, f"agency {agency_id} is temporarily unavailable")
+
+
+def _is_retryable(error):
+    """Dropped/refused connections and 5xx/429 answers; a read timeout already cost a full wait"""
+    if isinstance(error, TalosCircuitOpenError):
+        return False
+    if isinstance(error, TalosAPIError):
+        return error.status_code >= 500 or error.status_code == 429
+    if isinstance(error, requests.exceptions.ReadTimeout):
+        return False
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def _is_agency_failure(error):
+    """Errors that count against an agency's circuit breaker; a 4xx or a malformed body still proves it is up"""
+    return _is_retryable(error) or isinstance(
+        error, (requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError)
+    )
+
+
+def _backoff_delay(attempt):
+    return random.uniform(0, min(TALOS_BACKOFF_MAX_SECONDS, TALOS_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def describe_agency_error(error):
+    """Short message for a failed agency call; shown with st.error, never stored as an answer"""
+    if isinstance(error, TalosCircuitOpenError):
+        return f"This analysis service is temporarily unavailable. Please try again in about {int(error.retry_in) + 1}s."
+    if isinstance(error, TalosAPIError):
+        return f"The analysis service returned an error (status {error.status_code}). Please try again."
+    if isinstance(error, requests.exceptions.Timeout):
+        return "Request timeout: The API took too long to respond. Please try again."
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "Connection error: Unable to connect to the API server."
+    return f"Unexpected error: {error}"
+
+
+class AgencyCircuitBreaker:
+    """
+    Per-agency_id circuit breaker. After `failure_threshold` consecutive
+    failures the agency is skipped for `cooldown_seconds`; then a single trial
+    call is let through, and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold=TALOS_BREAKER_FAILURES, cooldown_seconds=TALOS_BREAKER_COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._failures = {}
+        self._opened_at = {}
+        self._trial_running = set()
+        self._lock = threading.Lock()
+
+    def before_call(self, agency_id):
+        """Raise TalosCircuitOpenError if calls to this agency should fail fast right now"""
+        with self._lock:
+            opened_at = self._opened_at.get(agency_id)
+            if opened_at is None:
+                return
+            retry_in = opened_at + self.cooldown_seconds - time.monotonic()
+            if retry_in > 0 or agency_id in self._trial_running:
+                raise TalosCircuitOpenError(agency_id, max(retry_in, 0))
+            self._trial_running.add(agency_id)
+
+    def record_success(self, agency_id):
+        with self._lock:
+            self._failures.pop(agency_id, None)
+            self._opened_at.pop(agency_id, None)
+            self._trial_running.discard(agency_id)
+
+    def record_failure(self, agency_id):
+        with self._lock:
+            self._failures[agency_id] = self._failures.get(agency_id, 0) + 1
+            if agency_id in self._trial_running or self._failures[agency_id] >= self.failure_threshold:
+                self._opened_at[agency_id] = time.monotonic()
+            self._trial_running.discard(agency_id)
+
+    def open_agencies(self):
+        """agency_id -> seconds until a trial call is allowed, for agencies currently failing fast"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                agency_id: max(opened_at + self.cooldown_seconds - now, 0)
+                for agency_id, opened_at in self._opened_at.items()
+            }
+
+
+def _init_auth_token():
+    """Read the Talos bearer token from the environment or Streamlit secrets"""
+    token = os.environ.get("AUTH_TOKEN", "")
+    try:
+        if not token:
+            token = st.secrets.get("AUTH_TOKEN", "")
+    except Exception:
+        pass
+    return token or ""
+
+
+# Cached agency answers: an in-memory LRU in front of a small SQLite file
+TALOS_CACHE_PATH = os.environ.get(
+    "TALOS_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "talos_cache.sqlite3"),
+)
+TALOS_CACHE_TTL_SECONDS = int(os.environ.get("TALOS_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+TALOS_CACHE_MEMORY_ENTRIES = int(os.environ.get("TALOS_CACHE_MEMORY_ENTRIES", "256"))
+TALOS_CACHE_DISK_ENTRIES = int(os.environ.get("TALOS_CACHE_DISK_ENTRIES", "5000"))
+
+
+def agency_id_from_url(agency_url):
+    """agency_id query parameter of a reasoning_api URL (the URL itself if it has none)"""
+    return parse_qs(urlparse(agency_url).query).get("agency_id", [agency_url])[0]
+
+
+def agency_cache_key(agency_url, goal):
+    """agency_id plus a hash of the whitespace-normalized goal"""
+    normalized_goal = " ".join(goal.split())
+    return f"{agency_id_from_url(agency_url)}:{hashlib.sha256(normalized_goal.encode('utf-8')).hexdigest()}"
+
+
+class AgencyResponseCache:
+    """
+    Two-tier cache of successful agency answers shared by every session.
+    Memory is a bounded LRU; SQLite keeps answers across restarts and is trimmed
+    by age (TTL) and by entry count. If the file cannot be opened (read-only
+    deployments) the cache quietly runs memory-only.
+    """
+
+    def __init__(self, path=TALOS_CACHE_PATH, ttl_seconds=TALOS_CACHE_TTL_SECONDS,
+                 memory_entries=TALOS_CACHE_MEMORY_ENTRIES, disk_entries=TALOS_CACHE_DISK_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        # Admin switch: skip lookups but keep storing, so every call refreshes its entry
+        self.bypass = False
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = self._open_db(path)
+
+    @staticmethod
+    def _open_db(path):
+        if not path:
+            return None
+        try:
+            db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS agency_responses ("
+                "key TEXT PRIMARY KEY, agency_id TEXT NOT NULL, payload TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_agency_responses_last_used ON agency_responses (last_used)")
+            db.commit()
+            return db
+        except (sqlite3.Error, OSError) as e:
+            print(f"Response cache running memory-only: {e}")
+            return None
+
+    def _remember(self, key, payload, created_at):
+        self._memory[key] = (payload, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Cached payload for key, or None on a miss, an expired entry or while bypassed"""
+        if self.bypass:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self._memory.pop(key, None)
+
+            row = None
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT payload, created_at FROM agency_responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None and now - row[1] >= self.ttl_seconds:
+                        self._db.execute("DELETE FROM agency_responses WHERE key = ?", (key,))
+                        row = None
+                    elif row is not None:
+                        self._db.execute("UPDATE agency_responses SET last_used = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                except sqlite3.Error:
+                    row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+            payload = json.loads(row[0])
+            self._remember(key, payload, row[1])
+            self.hits += 1
+            return payload
+
+    def put(self, key, agency_id, payload):
+        """Store a successful answer in both tiers and trim the disk tier"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, payload, now)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO agency_responses (key, agency_id, payload, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, agency_id, json.dumps(payload), now, now),
+                )
+                self._db.execute("DELETE FROM agency_responses WHERE created_at < ?", (now - self.ttl_seconds,))
+                self._db.execute(
+                    "DELETE FROM agency_responses WHERE key IN ("
+                    "SELECT key FROM agency_responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.disk_entries,),
+                )
+                self._db.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                print(f"Response cache write skipped: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self.hits = 0
+            self.misses = 0
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM agency_responses")
+                    self._db.commit()
+                except sqlite3.Error:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            disk_count = None
+            if self._db is not None:
+                try:
+                    disk_count = self._db.execute("SELECT COUNT(*) FROM agency_responses").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            return {
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_count,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypass": self.bypass,
+            }
+
+
+# Per-call timings: a bounded in-memory window plus a rolling JSONL file for history
+TALOS_METRICS_SAMPLES = int(os.environ.get("TALOS_METRICS_SAMPLES", "5000"))
+TALOS_METRICS_LOG_PATH = os.environ.get(
+    "TALOS_METRICS_LOG_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "talos_metrics.jsonl"),
+)
+TALOS_METRICS_LOG_MAX_BYTES = int(os.environ.get("TALOS_METRICS_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers: the ceil(pct/100 * n)-th smallest (None when empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class AgencyMetrics:
+    """
+    Bounded store of per-call samples (agency_id, mode, status, attempts,
+    ttfb_ms, wall_ms, request/response bytes, error). Every sample is also
+    appended to a JSONL file, rotated once to "<file>.1" when it outgrows
+    max_bytes. With path=None, or when the file cannot be written, samples
+    are kept in memory only.
+    """
+
+    def __init__(self, path=TALOS_METRICS_LOG_PATH, max_samples=TALOS_METRICS_SAMPLES,
+                 max_bytes=TALOS_METRICS_LOG_MAX_BYTES):
+        self.path = path or None
+        self.max_bytes = max_bytes
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, sample):
+        sample = dict(sample, ts=round(time.time(), 3))
+        with self._lock:
+            self._samples.append(sample)
+            if self.path is not None:
+                self._append_to_log(sample)
+
+    def _append_to_log(self, sample):
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                os.replace(self.path, self.path + ".1")
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(sample) + "\n")
+        except OSError:
+            # Read-only deployments (e.g. Streamlit Cloud) keep the in-memory window only
+            self.path = None
+
+    def samples(self):
+        with self._lock:
+            return list(self._samples)
+
+    def history(self):
+        """Samples from the JSONL file (previous rotation first), or the in-memory window"""
+        if self.path is None:
+            return self.samples()
+        rows = []
+        for path in (self.path + ".1", self.path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            rows.append(json.loads(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                continue
+        return rows
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    @staticmethod
+    def summarize(samples):
+        """agency_id -> counts, error rate and latency percentiles (ms) over the given samples"""
+        by_agency = {}
+        for sample in samples:
+            by_agency.setdefault(sample.get("agency_id", "unknown"), []).append(sample)
+
+        summary = {}
+        for agency_id, rows in by_agency.items():
+            api_calls = [r for r in rows if r.get("mode") in ("call", "stream")]
+            jobs = [r for r in rows if r.get("mode") == "job"]
+            wall = [r["wall_ms"] for r in api_calls if r.get("wall_ms") is not None and not r.get("error")]
+            ttfb = [r["ttfb_ms"] for r in api_calls if r.get("ttfb_ms") is not None]
+            sizes = [r.get("response_bytes", 0) for r in api_calls if not r.get("error")]
+            errors = sum(1 for r in api_calls if r.get("error"))
+            summary[agency_id] = {
+                "calls": len(api_calls),
+                "cache_hits": sum(1 for r in rows if r.get("mode") == "cache"),
+                "coalesced": sum(1 for r in rows if r.get("mode") == "coalesced"),
+                "errors": errors,
+                "error_rate": errors / len(api_calls) if api_calls else 0.0,
+                "retries": sum(max(r.get("attempts", 1) - 1, 0) for r in api_calls),
+                "p50_ms": _percentile(wall, 50),
+                "p95_ms": _percentile(wall, 95),
+                "p99_ms": _percentile(wall, 99),
+                "ttfb_p50_ms": _percentile(ttfb, 50),
+                "ttfb_p95_ms": _percentile(ttfb, 95),
+                "queue_p95_ms": _percentile([r["queue_ms"] for r in jobs if r.get("queue_ms") is not None], 95),
+                "avg_response_kb": (sum(sizes) / len(sizes) / 1024) if sizes else None,
+            }
+        return summary
+
+
+def _iter_sse_events(response):
+    """Yield (event, data) pairs from a text/event-stream response as they arrive"""
+    if "charset" not in response.headers.get("Content-Type", ""):
+        response.encoding = "utf-8"
+    event, data = "message", []
+    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith(":"):
+            continue
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            value = line[len("data:"):]
+            data.append(value[1:] if value.startswith(" ") else value)
+    if data:
+        yield event, "\n".join(data)
+
+
+class TalosClient:
+    """
+    Pooled client for the Talos reasoning_api.
+    A single requests.Session with a sized connection pool is shared by every
+    Streamlit session and thread, so analyses reuse warm keep-alive connections
+    instead of opening a new TCP+TLS handshake per button click.
+    Failed attempts are retried with jittered backoff, and an optional
+    circuit breaker makes calls to a degraded agency fail fast. Identical
+    calls made at the same time (same agency and goal) share one request.
+    """
+
+    def __init__(self, auth_token="", pool_maxsize=TALOS_POOL_MAXSIZE, timeout=TALOS_REQUEST_TIMEOUT, cache=None,
+                 max_retries=TALOS_MAX_RETRIES, breaker=None, metrics=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.metrics = metrics
+        self.max_retries = max_retries
+        self.breaker = breaker
+        self.coalesced_calls = 0
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Tenant-ID": TALOS_TENANT_ID,
+            "X-Tenant-ID": TALOS_TENANT_ID,
+            "Connection": "keep-alive",
+        })
+        if auth_token:
+            self.session.headers["Authorization"] = f"Bearer {auth_token}"
+
+    def _call_stats(self, agency_url, goal, mode):
+        return {
+            "agency_id": agency_id_from_url(agency_url),
+            "mode": mode,
+            "started": time.perf_counter(),
+            "attempts": 0,
+            "status": None,
+            "ttfb_ms": None,
+            "request_bytes": len(json.dumps({"agency_goal": goal}).encode("utf-8")),
+            "response_bytes": 0,
+        }
+
+    def _record(self, stats, error=None):
+        if self.metrics is None:
+            return
+        sample = dict(stats)
+        sample["wall_ms"] = round((time.perf_counter() - sample.pop("started")) * 1000, 1)
+        if error is not None:
+            sample["error"] = type(error).__name__
+            if isinstance(error, TalosAPIError):
+                sample["status"] = error.status_code
+        self.metrics.record(sample)
+
+    def _with_retries(self, agency_url, send, stats, settle=True):
+        """
+        Run send() under the retry policy and the agency's circuit breaker.
+        With settle=False a successful send() is not yet recorded: the caller
+        reports the outcome once it has read the rest of the answer.
+        """
+        agency_id = agency_id_from_url(agency_url)
+        for attempt in range(self.max_retries + 1):
+            if self.breaker is not None:
+                self.breaker.before_call(agency_id)
+            stats["attempts"] += 1
+            try:
+                result = send()
+            except Exception as e:
+                if self.breaker is not None:
+                    if _is_agency_failure(e):
+                        self.breaker.record_failure(agency_id)
+                    else:
+                        self.breaker.record_success(agency_id)
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                time.sleep(_backoff_delay(attempt))
+            else:
+                if self.breaker is not None and settle:
+                    self.breaker.record_success(agency_id)
+                return result
+
+    def _join_flight(self, key):
+        """(future, True) for the first caller of a key, (the leader's future, False) for the rest"""
+        with self._flights_lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self.coalesced_calls += 1
+                return future, False
+            future = Future()
+            self._flights[key] = future
+            return future, True
+
+    def _finish_flight(self, key, future, payload=None, error=None):
+        with self._flights_lock:
+            self._flights.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(payload)
+
+    def _post(self, agency_url, goal, timeout, stats, **kwargs):
+        response = self.session.post(
+            agency_url,
+            json={"agency_goal": goal},
+            timeout=(TALOS_CONNECT_TIMEOUT, timeout or self.timeout),
+            **kwargs
+        )
+        # elapsed stops once the response headers are parsed, i.e. time to first byte
+        stats["status"] = response.status_code
+        stats["ttfb_ms"] = round(response.elapsed.total_seconds() * 1000, 1)
+        if not kwargs.get("stream"):
+            stats["response_bytes"] = len(response.content)
+        if response.status_code != 200:
+            body = response.text
+            response.close()
+            raise TalosAPIError(response.status_code, body)
+        return response
+
+    def call_agency(self, agency_url, goal, timeout=None):
+        """POST an agency goal and return the decoded JSON payload (served from cache when possible)."""
+        stats = self._call_stats(agency_url, goal, "call")
+        cache_key = agency_cache_key(agency_url, goal) if self.cache is not None else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._record(dict(stats, mode="cache"))
+                return cached
+
+        flight_key = agency_cache_key(agency_url, goal)
+        future, leader = self._join_flight(flight_key)
+        if not leader:
+            stats["mode"] = "coalesced"
+            try:
+                payload = future.result()
+            except Exception as e:
+                self._record(stats, e)
+                raise
+            self._record(stats)
+            return payload
+        try:
+            payload = self._with_retries(
+                agency_url, lambda: self._post(agency_url, goal, timeout, stats).json(), stats
+            )
+        except Exception as e:
+            self._finish_flight(flight_key, future, error=e)
+            self._record(stats, e)
+            raise
+
+        # Only successful answers are cached
+        if cache_key is not None:
+            self.cache.put(cache_key, agency_id_from_url(agency_url), payload)
+        self._finish_flight(flight_key, future, payload)
+        self._record(stats)
+        return payload
+
+    def stream_agency(self, agency_url, goal, timeout=None):
+        """
+        Streaming variant of call_agency. Yields (text_delta, None) while a
+        server-sent-event answer arrives, then ("", payload) with the same JSON
+        payload call_agency would have returned. Cache hits, servers that
+        answer with plain JSON and callers that joined an identical call
+        already in flight only produce the final item.
+        """
+        stats = self._call_stats(agency_url, goal, "stream")
+        cache_key = agency_cache_key(agency_url, goal) if self.cache is not None else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._record(dict(stats, mode="cache"))
+                yield "", cached
+                return
+
+        flight_key = agency_cache_key(agency_url, goal)
+        future, leader = self._join_flight(flight_key)
+        if not leader:
+            # The same answer is already being fetched for another session; wait for it
+            stats["mode"] = "coalesced"
+            try:
+                payload = future.result()
+            except Exception as e:
+                self._record(stats, e)
+                raise
+            self._record(stats)
+            yield "", payload
+            return
+        try:
+            payload = yield from self._stream_answer(agency_url, goal, timeout, stats)
+        except BaseException as e:
+            # Also on GeneratorExit, so a reader that stops early does not strand the waiters
+            error = e if isinstance(e, Exception) else TalosAPIError(499, "stream closed before the answer finished")
+            self._finish_flight(flight_key, future, error=error)
+            self._record(stats, error)
+            raise
+
+        if cache_key is not None:
+            self.cache.put(cache_key, agency_id_from_url(agency_url), payload)
+        self._finish_flight(flight_key, future, payload)
+        self._record(stats)
+        yield "", payload
+
+    def _stream_answer(self, agency_url, goal, timeout, stats):
+        """Yield (text_delta, None) from the API and return the final payload"""
+        # Retries only cover opening the stream; once text has been shown it is not replayed
+        response = self._with_retries(agency_url, lambda: self._post(
+            agency_url, goal, timeout, stats,
+            headers={"Accept": "text/event-stream, application/json"},
+            stream=True,
+        ), stats, settle=False)
+        agency_id = agency_id_from_url(agency_url)
+        try:
+            with response:
+                if not response.headers.get("Content-Type", "").startswith("text/event-stream"):
+                    stats["response_bytes"] = len(response.content)
+                    payload = response.json()
+                else:
+                    payload = yield from self._read_events(response, stats)
+        except BaseException as e:
+            # An error event or a dropped connection mid-stream counts like a failed call;
+            # a reader that stops early (GeneratorExit) still got a healthy answer so far
+            if self.breaker is not None:
+                if isinstance(e, Exception) and _is_agency_failure(e):
+                    self.breaker.record_failure(agency_id)
+                else:
+                    self.breaker.record_success(agency_id)
+            raise
+        if self.breaker is not None:
+            self.breaker.record_success(agency_id)
+        return payload
+
+    @staticmethod
+    def _read_events(response, stats):
+        """Yield (text_delta, None) from a text/event-stream answer and return its final payload"""
+        payload, parts = None, []
+        for event, data in _iter_sse_events(response):
+            stats["response_bytes"] += len(data.encode("utf-8"))
+            if event == "done":
+                payload = json.loads(data)
+            elif event == "error":
+                raise TalosAPIError(502, data)
+            else:
+                delta = json.loads(data).get("delta", "")
+                if delta:
+                    parts.append(delta)
+                    yield delta, None
+        return payload if payload is not None else {"result": "".join(parts)}
+
+
+@st.cache_resource(show_spinner=False)
+def get_talos_client():
+    """Return the Talos client, created once per server process"""
+    return TalosClient(
+        auth_token=_init_auth_token(),
+        cache=AgencyResponseCache(),
+        breaker=AgencyCircuitBreaker(),
+        metrics=AgencyMetrics(),
+    )
+
+
+def call_agency(agency_url, goal, timeout=None):
+    """
+    Single entry point used by every agent page to call a Talos agency.
+    Returns the decoded JSON payload; raises TalosAPIError on a non-200 answer
+    and lets requests' Timeout/ConnectionError propagate to the caller.
+    """
+    return get_talos_client().call_agency(agency_url, goal, timeout=timeout)
+
+
+def stream_agency(agency_url, goal, timeout=None):
+    """Streaming counterpart of call_agency; see TalosClient.stream_agency"""
+    return get_talos_client().stream_agency(agency_url, goal, timeout=timeout)
+
+
+class IncrementalSanitizer:
+    """
+    Cleaned preview of an answer that is still streaming in. Paragraphs that
+    are complete (followed by a blank line) are sanitized once and kept; only
+    the unfinished tail is re-cleaned on each repaint. The preview is display
+    only - the stored result always comes from the batch sanitizer.
+    """
+
+    def __init__(self, sanitize):
+        self.sanitize = sanitize
+        self._finished = []
+        self._tail = ""
+
+    def feed(self, delta):
+        self._tail += delta
+        if "\n\n" in self._tail:
+            head, self._tail = self._tail.rsplit("\n\n", 1)
+            cleaned = self.sanitize(head)
+            if cleaned:
+                self._finished.append(cleaned)
+
+    def text(self):
+        tail = self.sanitize(self._tail)
+        return "\n\n".join(self._finished + ([tail] if tail else []))
+
+
+def _render_stream_preview(slot, title, text):
+    body = html.escape(text).replace("\n", "<br>")
+    slot.markdown(
+        f"""
+        <div style="background: var(--bg-card); border: 2px dashed #8b1e1e; border-radius: 16px;
+                    padding: 1.6rem; margin-bottom: 1.6rem; box-shadow: 0 3px 10px rgba(139,30,30,0.15);">
+            <h4 style="color: #8b1e1e; font-weight: 700; font-size: 1.15rem; margin: 0 0 1rem 0;
+                       border-bottom: 2px solid #8b1e1e; padding-bottom: 0.5rem; text-align: left;">
+                {title} <span style="font-size: 0.85rem; font-weight: 500;">• writing…</span>
+            </h4>
+            <div style="color: var(--text-primary); line-height: 1.45; font-size: 1rem; text-align: left;">
+                {body}
+            </div>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+# ================================
+# 🧭 Agent API Configurations
+# ================================
+# Kept in one place so the agent pages and the full assessment pipeline send identical goals
+VOCAB_API_URL = "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758548233201&level=1"
+
+VOCABULARY_API_CONFIGS = [
+    {
+        "name": "vocabulary",
+        "url": VOCAB_API_URL,
+        "multiround_convo": 3,
+        "description": "vocabulary",
+        "prompt": lambda problem, outputs: (
+            f"{problem}\n\nExtract the vocabulary from this problem statement."
+        )
+    }
+]
+
+CURRENT_SYSTEM_API_URL = (
+    "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api"
+    "?society_id=1757657318406&agency_id=1758549095254&level=1"
+)
+
+CURRENT_SYSTEM_API_CONFIGS = [
+    {
+        "name": "current_system",
+        "url": CURRENT_SYSTEM_API_URL,
+        "multiround_convo": 2,
+        "description": "Current System in Place",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\n"
+            f"Context from vocabulary:\n{outputs.get('vocabulary', '')}\n\n"
+            "Describe the current system, inputs, outputs, and pain points in detail with clear sections."
+        )
+    }
+]
+
+VOLATILITY_API_CONFIGS = [
+    {
+        "name": "Q1",
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758555344231&level=1",
+        "multiround_convo": 2,
+        "description": "What is the frequency and pace of change in the key inputs driving the business?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\n"
+            "What is the frequency and pace of change in the key inputs driving the business? "
+            "Provide detailed analysis, score 0–5, and justification."
+        )
+    },
+    {
+        "name": "Q2", 
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758549615986&level=1",
+        "multiround_convo": 2,
+        "description": "To what extent are these changes cyclical and predictable versus sporadic and unpredictable?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\n"
+            "To what extent are these changes cyclical and predictable versus sporadic and unpredictable? "
+            "Provide detailed analysis, score 0–5, and justification."
+        )
+    },
+    {
+        "name": "Q3",
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758614550482&level=1",
+        "multiround_convo": 2,
+        "description": "How resilient is the current system in absorbing these changes without requiring significant rework or disruption?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\n"
+            "How resilient is the current system in absorbing these changes without requiring significant rework or disruption? "
+            "Provide detailed analysis, score 0–5, and justification."
+        )
+    }
+]
+
+AMBIGUITY_API_CONFIGS = [
+    {
+        "name": "Q4",
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758614809984&level=1",
+        "multiround_convo": 2,
+        "description": "To what extent do stakeholders share a common understanding of the key terms and concepts?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "To what extent do stakeholders share a common understanding and goals about the problem? Score 0–5. Provide justification."
+        )
+    },
+    {
+        "name": "Q5",
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758615038050&level=1",
+        "multiround_convo": 2,
+        "description": "Are there any conflicting definitions or interpretations that could create confusion",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "Are there significant conflicts or tradeoffs between stakeholders or system elements? Score 0–5. Provide justification."
+        )
+    },
+    {
+        "name": "Q6",
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758615386880&level=1",
+        "multiround_convo": 2,
+        "description": "Are objectives, priorities, and constraints clearly communicated and well-defined?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "How clear is the problem definition and scope? Score 0–5. Provide justification."
+        )
+    }
+]
+
+INTERCONNECTEDNESS_API_CONFIGS = [
+   {
+        "name": "Q7",
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758615778653&level=1",
+        "multiround_convo": 2,
+        "description": "To what extent are key inputs interdependent?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "How adequate are current resources (people, budget, technology) to handle the issue? Score 0–5. Provide justification."
+        )
+    },
+    {
+        "name": "Q8",
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758616081630&level=1",
+        "multiround_convo": 2,
+        "description": "How well are the governing rules, functions, and relationships between inputs understood?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "How complex is the problem in terms of stakeholders, processes, or technology involved? Score 0–5. Provide justification."
+        )
+    },
+    {
+        "name": "Q9",
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758616793510&level=1",
+        "multiround_convo": 2,
+        "description": "Are there any hidden or latent dependencies that could impact outcomes?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "How dependent is the problem on external factors or third parties? Score 0–5. Provide justification."
+        )
+    }
+]
+
+UNCERTAINTY_API_CONFIGS = [
+   {
+        "name": "Q10",
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758617140479&level=1",
+        "multiround_convo": 2,
+        "description": "Are there hidden or latent dependencies that could affect outcomes?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "What is the risk/impact if this problem remains unresolved? Score 0–5. Provide justification."
+        )
+    },
+    {
+        "name": "Q11",
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758618137301&level=1",
+        "multiround_convo": 2,
+        "description": "Are feedback loops insufficient or missing, limiting our ability to adapt?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "How urgent is it to address this problem? Score 0–5. Provide justification."
+        )
+    },
+    {
+        "name": "Q12",
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758619317968&level=1",
+        "multiround_convo": 2,
+        "description": "Do we lack established benchmarks or \"gold standards\" to validate results?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "How well does solving this problem align with organizational strategy or goals? Score 0–5. Provide justification."
+        )
+    }
+]
+
+HARDNESS_API_CONFIGS = [
+    {
+        "name": "hardness_summary",
+        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758619658634&level=1",
+        "multiround_convo": 2,
+        "description": "Hardness Level, Summary & Key Takeaways",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\n"
+            "Based on the comprehensive analysis of the business problem, provide a hardness assessment with the following sections IN THIS EXACT FORMAT:\n\n"
+            
+            "Overall Difficulty Score\n"
+            "[Provide a single numerical score between 0-5 based on your assessment of the problem complexity]\n\n"
+            "Hardness Level\n"
+            "[Easy: 0-3.0, Moderate: 3.1-4.0, or Hard: 4.1-5.0]\n\n"
+            "SME Justification\n"
+            "[Provide detailed justification analyzing the problem across multiple dimensions - complexity, ambiguity, interconnectedness, and uncertainty]\n\n"
+            "Summary\n"
+            "[Provide a concise summary of the overall assessment in 2-3 sentences]\n\n"
+            "Key Takeaways\n"
+            "[Provide 3-5 bullet points with actionable insights]\n\n"
+            "IMPORTANT: Make sure each section is clearly labeled with its header as shown above. Provide actual scores and analysis, not placeholders."
+        )
+    }
+]
+
+AGENT_API_CONFIGS = {
+    "vocabulary": VOCABULARY_API_CONFIGS,
+    "current_system": CURRENT_SYSTEM_API_CONFIGS,
+    "volatility": VOLATILITY_API_CONFIGS,
+    "ambiguity": AMBIGUITY_API_CONFIGS,
+    "interconnectedness": INTERCONNECTEDNESS_API_CONFIGS,
+    "uncertainty": UNCERTAINTY_API_CONFIGS,
+    "hardness_summary": HARDNESS_API_CONFIGS,
+}
+
+
+def rebase_agency_url(agency_url, base_url=TALOS_BASE_URL):
+    """agency_url with its scheme and host swapped for base_url (unchanged when base_url is empty)"""
+    if not base_url:
+        return agency_url
+    parsed = urlparse(agency_url)
+    return f"{base_url}{parsed.path}?{parsed.query}"
+
+
+if TALOS_BASE_URL:
+    VOCAB_API_URL = rebase_agency_url(VOCAB_API_URL)
+    CURRENT_SYSTEM_API_URL = rebase_agency_url(CURRENT_SYSTEM_API_URL)
+    for _configs in AGENT_API_CONFIGS.values():
+        for _cfg in _configs:
+            _cfg["url"] = rebase_agency_url(_cfg["url"])
+
+
+def build_agent_context(problem, account, industry, extra=""):
+    """Business problem context block the pages pass into each agency prompt"""
+    return f"""
+    Business Problem:
+    {problem.strip()}
+
+    Context:
+    Account: {account}
+    Industry: {industry}
+    {extra}
+    """.strip()
+
+
 def initialize_account_industry_state():
     """Initialize session state for account and industry with proper defaults"""
     if "account" not in st.session_state:
@@ -182,12 +1176,6 @@ def render_account_industry_selectors(page_key_prefix: str = "global"):
 
 def init_admin_session():
     """Initialize admin session state for all agents"""
-    if 'admin_feedback_data' not in st.session_state:
-        st.session_state.admin_feedback_data = pd.DataFrame(
-            columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", 
-                    "OffDefinitions", "Suggestions", "Account", "Industry", 
-                    "ProblemStatement", "Agent"]
-        )
     if 'admin_authenticated' not in st.session_state:
         st.session_state.admin_authenticated = False
     if 'admin_access_requested' not in st.session_state:
@@ -197,118 +1185,79 @@ def init_admin_session():
     if 'show_admin_panel' not in st.session_state:
         st.session_state.show_admin_panel = False
 
-def save_feedback_to_admin_session(feedback_data, agent_name="Vocabulary Agent"):
-    """
-    Save feedback data to admin session storage for all agents
-    """
-    init_admin_session()  # Ensure session is initialized
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Add agent information to feedback data
-    feedback_data_with_agent = feedback_data.copy()
-    feedback_data_with_agent['Agent'] = agent_name
-    feedback_data_with_agent['Timestamp'] = timestamp
-    
-    # Convert to DataFrame if not already
-    if not isinstance(feedback_data_with_agent, pd.DataFrame):
-        feedback_data_with_agent = pd.DataFrame([feedback_data_with_agent])
-    
-    # Append to admin session storage
-    st.session_state.admin_feedback_data = pd.concat(
-        [st.session_state.admin_feedback_data, feedback_data_with_agent], 
-        ignore_index=True
-    )
-    
-    # Also save to file for persistence
-    save_feedback_to_file(feedback_data_with_agent)
-    
-    return True
-
-def save_feedback_to_file(feedback_data):
-    """
-    Save feedback to CSV file with fallback to session state
-    """
-    try:
-        # Ensure the feedback data has all required columns including 'Agent'
-        required_columns = ["Timestamp", "Name", "Email", "Feedback", "FeedbackType", 
-                           "OffDefinitions", "Suggestions", "Account", "Industry", 
-                           "ProblemStatement", "Agent"]
-        
-        # Add missing columns with empty values
-        for col in required_columns:
-            if col not in feedback_data.columns:
-                feedback_data[col] = ''
-        
-        if os.path.exists(FEEDBACK_FILE):
-            existing = pd.read_csv(FEEDBACK_FILE)
-            
-            # Handle schema mismatch - ensure existing data also has all columns
-            for col in required_columns:
-                if col not in existing.columns:
-                    existing[col] = ''
-            
-            # Reorder both dataframes to match required columns
-            existing = existing[required_columns]
-            feedback_data = feedback_data[required_columns]
-            
-            updated = pd.concat([existing, feedback_data], ignore_index=True)
-        else:
-            # Create new file with all required columns
-            updated = feedback_data[required_columns]
-        
-        updated.to_csv(FEEDBACK_FILE, index=False)
-        return True
-        
-    except (PermissionError, OSError) as e:
-        # Fallback to session state on Streamlit Cloud
-        if 'file_feedback_data' not in st.session_state:
-            st.session_state.file_feedback_data = pd.DataFrame(columns=feedback_data.columns)
-        
-        st.session_state.file_feedback_data = pd.concat(
-            [st.session_state.file_feedback_data, feedback_data], 
-            ignore_index=True
-        )
-        return True
-        
-    except Exception as e:
-        st.error(f"Error saving feedback to file: {str(e)}")
-        return False
+# ================================
+# 📝 Feedback Service
+# ================================
 
-def get_all_feedback_data():
+@st.cache_resource(show_spinner=False)
+def get_feedback_log():
+    """Return the append-only feedback log, created once per server process"""
+    return FeedbackLog()
+
+@st.cache_resource(show_spinner=False)
+def get_feedback_store():
+    """Return the indexed feedback store behind the admin views, created once per server process"""
+    return FeedbackStore()
+
+@st.cache_resource(show_spinner=False)
+def get_feedback_writer():
+    """Return the process-wide feedback writer thread: writes the log, then syncs the store from it"""
+    return FeedbackWriter(get_feedback_log(), get_feedback_store())
+
+def flush_feedback_writes(timeout=5):
+    """Let the writer finish queued submissions so the admin views show them, and show any write failure"""
+    writer = get_feedback_writer()
+    writer.flush(timeout=timeout)
+    stats = writer.stats()
+    for error in (stats["log_error"], stats["store_error"]):
+        if error:
+            st.error(f"⚠️ {error}")
+
+def submit_agent_feedback(agent_name, feedback_type, name="", email="", off_definitions="", suggestions="",
+                          additional_feedback="", account=None, industry=None, problem_statement=None):
     """
-    Get combined feedback data from both file and session state
+    Record one feedback submission for an agent page and return its FeedbackId.
+    Builds a single FEEDBACK_COLUMNS row (account, industry and problem default
+    to the current business inputs) and queues it for the writer thread, which
+    appends it to the feedback log and syncs the store from there. While the
+    log cannot be written the row is still queued (the writer retries it) and
+    also kept in this session's unsaved_feedback, with a warning.
     """
-    file_data = pd.DataFrame()
-    session_data = pd.DataFrame()
-    
-    # Try to load from file
-    try:
-        if os.path.exists(FEEDBACK_FILE):
-            file_data = pd.read_csv(FEEDBACK_FILE)
-            # Ensure the file data has Agent column
-            if 'Agent' not in file_data.columns:
-                file_data['Agent'] = 'Unknown Agent'
-    except Exception as e:
-        st.warning(f"Could not read feedback file: {e}")
-    
-    # Get from session state
-    if 'admin_feedback_data' in st.session_state and not st.session_state.admin_feedback_data.empty:
-        session_data = st.session_state.admin_feedback_data.copy()
-    
-    if 'file_feedback_data' in st.session_state and not st.session_state.file_feedback_data.empty:
-        session_data = pd.concat([session_data, st.session_state.file_feedback_data], ignore_index=True)
-    
-    # Combine data, preferring session data for duplicates
-    if not file_data.empty and not session_data.empty:
-        combined = pd.concat([file_data, session_data], ignore_index=True).drop_duplicates()
-        return combined
-    elif not file_data.empty:
-        return file_data
-    elif not session_data.empty:
-        return session_data
-    else:
-        return pd.DataFrame()
+    feedback_id = new_feedback_id()
+    row = {
+        "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "Name": name,
+        "Email": email,
+        "Feedback": additional_feedback,
+        "FeedbackType": feedback_type,
+        "OffDefinitions": off_definitions,
+        "Suggestions": suggestions,
+        "Account": st.session_state.get("current_account", "") if account is None else account,
+        "Industry": st.session_state.get("current_industry", "") if industry is None else industry,
+        "ProblemStatement": st.session_state.get("current_problem", "") if problem_statement is None else problem_statement,
+        "Agent": agent_name,
+        "FeedbackId": feedback_id,
+    }
+    writer = get_feedback_writer()
+    writer.submit([row])
+    if writer.log_error is not None:
+        st.session_state.setdefault("unsaved_feedback", []).append(row)
+        render_unsaved_feedback_notice()
+    return feedback_id
+
+def render_unsaved_feedback_notice():
+    """Warn while feedback from this session waits for the log; forget it once the writer has caught up"""
+    unsaved = st.session_state.get("unsaved_feedback")
+    if not unsaved:
+        return
+    if get_feedback_writer().log_error is None:
+        # Retried rows are written together, so a clear error means every one of them is in the log
+        del st.session_state["unsaved_feedback"]
+        return
+    st.warning(
+        f"⚠️ Feedback could not be written to disk just now. Your {len(unsaved)} latest submission(s) are kept "
+        "in this session and saved automatically as soon as the feedback log is writable again."
+    )
 
 def _safe_rerun():
     """Safely rerun the app without causing errors."""
@@ -1007,6 +1956,8 @@ def render_header(
     </script>
     """, height=0)
 
+    render_unsaved_feedback_notice()
+
 def get_shared_data():
     """Get shared data from session state or URL parameters"""
     data = {
@@ -1253,6 +2204,12 @@ def render_unified_business_inputs(page_key_prefix: str = "global", show_titles:
                 st.session_state.saved_problem = st.session_state.business_problem
                 st.session_state.edit_confirmed = False
                 st.session_state.auto_mapped_industry = False  # Reset after save
+                # Run every agent in the background so results are ready when the pages open
+                start_assessment_pipeline(
+                    st.session_state.saved_account,
+                    st.session_state.saved_industry,
+                    st.session_state.saved_problem,
+                )
                 st.success("✅ Problem details saved!")
                 _safe_rerun()
 
@@ -1290,24 +2247,24 @@ def initialize_scoring_system():
         }
 
 def mark_agent_completed(agent_name, scores_dict=None):
-    """Mark an agent as completed and store its scores"""
+    """Mark an agent as completed and store the scores of its latest run, replacing any earlier run's"""
     initialize_scoring_system()
     
     if agent_name in st.session_state.agents_completed:
         st.session_state.agents_completed[agent_name] = True
     
-    if scores_dict and isinstance(scores_dict, dict):
-        for question, score in scores_dict.items():
-            # Store individual question scores
-            if f'{agent_name}_scores' not in st.session_state:
-                st.session_state[f'{agent_name}_scores'] = {}
-            st.session_state[f'{agent_name}_scores'][question] = score
-            
-            # Also update dimension score if all questions are available
-            dimension_questions = DIMENSION_QUESTIONS.get(agent_name.title(), [])
-            if dimension_questions and all(q in st.session_state[f'{agent_name}_scores'] for q in dimension_questions):
-                dimension_scores = [st.session_state[f'{agent_name}_scores'][q] for q in dimension_questions]
-                st.session_state.agent_scores[agent_name] = sum(dimension_scores) / len(dimension_scores)
+    if isinstance(scores_dict, dict):
+        # Questions without a score in this run must not keep the previous run's
+        scores = {question: score for question, score in scores_dict.items() if score is not None}
+        st.session_state[f'{agent_name}_scores'] = scores
+        
+        # The dimension score needs every question scored in the same run
+        dimension_questions = DIMENSION_QUESTIONS.get(agent_name.title(), [])
+        if dimension_questions and all(q in scores for q in dimension_questions):
+            dimension_scores = [scores[q] for q in dimension_questions]
+            st.session_state.agent_scores[agent_name] = sum(dimension_scores) / len(dimension_scores)
+        else:
+            st.session_state.agent_scores[agent_name] = None
 
 def all_agents_completed():
     """Check if all 4 dimension agents have been completed"""
@@ -1355,6 +2312,659 @@ def get_all_question_scores():
     
     return all_scores
 
+
+def store_agent_results(agent, answers):
+    """Parse newly arrived answers once into AgentResult records; a finished dimension also records its scores"""
+    records = {name: parse_agent_result(agent, name, text) for name, text in answers.items()}
+    st.session_state.setdefault("agent_results", {})[agent] = records
+    questions = DIMENSION_QUESTIONS.get(agent.title())
+    if questions and all(q in records for q in questions):
+        mark_agent_completed(agent, {name: r.score for name, r in records.items()})
+    return records
+
+
+def get_agent_results(agent, answers):
+    """AgentResult records for an agent's current answers; only answers not seen before are parsed"""
+    records = st.session_state.setdefault("agent_results", {}).setdefault(agent, {})
+    for name, text in answers.items():
+        record = records.get(name)
+        if record is None or record.text != text:
+            records[name] = parse_agent_result(agent, name, text)
+    return records
+
+
+def get_low_confidence_questions():
+    """Answered dimension questions whose score was missing or only loosely extracted"""
+    results = st.session_state.get("agent_results", {})
+    flagged = []
+    for dimension, questions in DIMENSION_QUESTIONS.items():
+        records = results.get(dimension.lower(), {})
+        flagged.extend(q for q in questions if q in records and records[q].confidence != "high")
+    return flagged
+
+
+def hardness_extra_context(records):
+    """
+    Q1-Q12 scores, dimension averages and key takeaways for the hardness
+    prompt, from question name -> AgentResult (missing questions are left out)
+    """
+    question_lines, dimension_lines, takeaway_lines = [], [], []
+    for dimension, questions in DIMENSION_QUESTIONS.items():
+        scores = []
+        for q in questions:
+            record = records.get(q)
+            if record is None:
+                continue
+            if record.score is not None:
+                scores.append(record.score)
+                question_lines.append(f"{q} ({dimension}): {record.score:.1f}/5")
+            takeaway_lines.extend(f"- {q}: {takeaway}" for takeaway in record.takeaways)
+        if scores and len(scores) == len(questions):
+            dimension_lines.append(f"{dimension}: {sum(scores) / len(scores):.2f}/5")
+
+    sections = []
+    if dimension_lines:
+        sections.append("Dimension Scores:\n" + "\n".join(dimension_lines))
+    if question_lines:
+        sections.append("Question Scores:\n" + "\n".join(question_lines))
+    if takeaway_lines:
+        sections.append("Key Takeaways:\n" + "\n".join(takeaway_lines))
+    return "\n\n" + "\n\n".join(sections) if sections else ""
+
+
+def session_question_results():
+    """Question name -> AgentResult for every dimension answer parsed in this session"""
+    results = st.session_state.get("agent_results", {})
+    records = {}
+    for dimension in DIMENSION_QUESTIONS:
+        records.update(results.get(dimension.lower(), {}))
+    return records
+
+# ================================
+# 🖼️ Rendered Answers
+# ================================
+# Formatted answer HTML shared by all sessions, so widget reruns skip the regex work
+RENDERED_ANSWER_CACHE_ENTRIES = int(os.environ.get("RENDERED_ANSWER_CACHE_ENTRIES", "1024"))
+
+
+@st.cache_data(max_entries=RENDERED_ANSWER_CACHE_ENTRIES, show_spinner=False)
+def cached_answer_html(text, agent, display_account, display_industry):
+    """answer_html memoized per (answer text, agent, account, industry)"""
+    return answer_html(text, agent, display_account, display_industry)
+
+
+# ================================
+# 🧵 Background Analysis Jobs
+# ================================
+# Worker threads for the full assessments started in the background when a problem is saved,
+# and for the jobs the Analyze/Extract buttons start. Both pools together never hold more
+# calls than the Talos connection pool has connections, and background work cannot take
+# the threads an interactive job needs.
+ANALYSIS_BACKGROUND_MAX_WORKERS = int(
+    os.environ.get("ANALYSIS_BACKGROUND_MAX_WORKERS", str(max(1, TALOS_POOL_MAXSIZE // 4)))
+)
+ANALYSIS_JOB_MAX_WORKERS = int(
+    os.environ.get("ANALYSIS_JOB_MAX_WORKERS", str(max(1, TALOS_POOL_MAXSIZE - ANALYSIS_BACKGROUND_MAX_WORKERS)))
+)
+# Finished jobs are kept this long so pages can reattach after a page switch
+ANALYSIS_JOB_RETENTION_SECONDS = int(os.environ.get("ANALYSIS_JOB_RETENTION_SECONDS", str(6 * 3600)))
+# How often a page checks on a running job / the full assessment
+ANALYSIS_JOB_POLL_SECONDS = 1
+ASSESSMENT_POLL_SECONDS = 2
+
+
+def _job_signature(nodes, inputs):
+    """Fingerprint of the calls a job makes, used to reattach instead of re-running"""
+    calls = [
+        (name, node["url"], node["goal"] if isinstance(node["goal"], str) else None, list(node["upstream"]))
+        for name, node in sorted(nodes.items())
+    ]
+    return hashlib.sha256(json.dumps([inputs, calls]).encode("utf-8")).hexdigest()
+
+
+class AnalysisJob:
+    """
+    Agency calls for one analysis, run on the job manager's worker threads.
+    `nodes` maps a name to {"url", "goal", "upstream", "group"}: a node starts
+    once its upstream nodes have finished, and `goal` may be a callable that
+    builds the goal from the job. Results are raw API payloads so each page
+    keeps its own formatting; streamed text is kept for live previews.
+    """
+
+    def __init__(self, job_id, nodes, inputs=None):
+        self.job_id = job_id
+        self.uid = uuid.uuid4().hex
+        self.nodes = nodes
+        self.inputs = inputs
+        self.signature = _job_signature(nodes, inputs)
+        self.results = {}
+        self.errors = {}
+        self.partials = {}
+        self.created_at = time.time()
+        self.finished_at = None
+        self._submitted = set()
+        self._queued_at = {}
+        self._lock = threading.Lock()
+        self._client = None
+        self._executor = None
+
+    def start(self, executor, client):
+        self._client = client
+        self._executor = executor
+        self._schedule_ready()
+        return self
+
+    def _schedule_ready(self):
+        with self._lock:
+            ready = [
+                name for name, node in self.nodes.items()
+                if name not in self._submitted
+                and all(dep in self.results or dep in self.errors for dep in node["upstream"])
+            ]
+            self._submitted.update(ready)
+            for name in ready:
+                self._queued_at[name] = time.perf_counter()
+        for name in ready:
+            self._executor.submit(self._run_node, name)
+
+    def _run_node(self, name):
+        node = self.nodes[name]
+        started = time.perf_counter()
+        error = None
+        try:
+            goal = node["goal"](self) if callable(node["goal"]) else node["goal"]
+            if TALOS_STREAMING:
+                payload = None
+                for delta, final in self._client.stream_agency(node["url"], goal):
+                    if final is not None:
+                        payload = final
+                    elif delta:
+                        with self._lock:
+                            self.partials.setdefault(name, []).append(delta)
+            else:
+                payload = self._client.call_agency(node["url"], goal)
+        except Exception as e:
+            error = e
+            with self._lock:
+                self.errors[name] = e
+        else:
+            with self._lock:
+                self.results[name] = payload
+        if self._client.metrics is not None:
+            # Our side of the latency: waiting for a worker, plus goal building and bookkeeping
+            self._client.metrics.record({
+                "agency_id": agency_id_from_url(node["url"]),
+                "mode": "job",
+                "queue_ms": round((started - self._queued_at[name]) * 1000, 1),
+                "node_ms": round((time.perf_counter() - started) * 1000, 1),
+                "error": type(error).__name__ if error is not None else None,
+            })
+        with self._lock:
+            self.partials.pop(name, None)
+            if len(self.results) + len(self.errors) == len(self.nodes):
+                self.finished_at = time.time()
+        self._schedule_ready()
+
+    def finished(self):
+        return self.finished_at is not None
+
+    def group_nodes(self, group=None):
+        return [name for name, node in self.nodes.items() if group is None or node["group"] == group]
+
+    def group_finished(self, group=None):
+        with self._lock:
+            return all(name in self.results or name in self.errors for name in self.group_nodes(group))
+
+    def node_done(self, name):
+        with self._lock:
+            return name in self.results or name in self.errors
+
+    def group_results(self, group=None):
+        """name -> (payload, error), in the order the nodes were given"""
+        with self._lock:
+            return {name: (self.results.get(name), self.errors.get(name)) for name in self.group_nodes(group)}
+
+    def partial_deltas(self, name, start=0):
+        """Streamed text chunks for a running node, from index `start` on"""
+        with self._lock:
+            return list(self.partials.get(name, [])[start:])
+
+    def progress(self, group=None):
+        with self._lock:
+            names = self.group_nodes(group)
+            return sum(1 for name in names if name in self.results or name in self.errors), len(names)
+
+
+class AnalysisJobManager:
+    """
+    Process-wide registry of analysis jobs, keyed by "<browser session id>:<job>".
+    Jobs keep running when the user clicks around or switches page;
+    submitting the same calls again reattaches to the existing job.
+    Background jobs run on their own, smaller pool, so other users' full
+    assessments never queue ahead of a job someone is waiting on.
+    """
+
+    def __init__(self, max_workers=ANALYSIS_JOB_MAX_WORKERS, background_workers=ANALYSIS_BACKGROUND_MAX_WORKERS,
+                 retention_seconds=ANALYSIS_JOB_RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+        self._background = ThreadPoolExecutor(max_workers=background_workers, thread_name_prefix="analysis-background")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job_id, nodes, inputs=None, background=False):
+        job = AnalysisJob(job_id, nodes, inputs)
+        with self._lock:
+            self._prune()
+            current = self._jobs.get(job_id)
+            if current is not None and current.signature == job.signature and not current.errors:
+                return current
+            self._jobs[job_id] = job
+        return job.start(self._background if background else self._executor, get_talos_client())
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [j for j, job in self._jobs.items() if job.finished() and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_manager():
+    """Return the analysis job manager, created once per server process"""
+    return AnalysisJobManager()
+
+
+def get_client_session_id():
+    """
+    Id that owns this session's jobs. It lives in session state only, so it
+    survives reruns and page switches but never travels in a link: anything
+    read from the URL could be another user's id.
+    """
+    if "client_session_id" not in st.session_state:
+        st.session_state.client_session_id = uuid.uuid4().hex
+    return st.session_state.client_session_id
+
+
+def _session_job_id(name):
+    return f"{get_client_session_id()}:{name}"
+
+
+def _business_inputs():
+    return (
+        st.session_state.get("business_account"),
+        st.session_state.get("business_industry"),
+        st.session_state.get("business_problem"),
+    )
+
+
+def _saved_inputs():
+    return (
+        st.session_state.get("saved_account"),
+        st.session_state.get("saved_industry"),
+        st.session_state.get("saved_problem"),
+    )
+
+
+def _take_job(job, absorb_key):
+    absorbed = st.session_state.setdefault("absorbed_jobs", set())
+    if absorb_key in absorbed:
+        return False
+    absorbed.add(absorb_key)
+    previews = st.session_state.get("stream_previews", {})
+    for key in [k for k in previews if k[0] == job.uid]:
+        del previews[key]
+    return True
+
+
+def submit_agent_job(agent, calls):
+    """
+    Run an agent page's calls in the background. `calls` is a list of
+    (name, agency_url, goal); the job is keyed by this browser session and
+    the agent, so clicking again with the same inputs reattaches to it.
+    """
+    nodes = {name: {"url": url, "goal": goal, "upstream": (), "group": agent} for name, url, goal in calls}
+    job = get_job_manager().submit(_session_job_id(agent), nodes, _business_inputs())
+    st.session_state.setdefault("absorbed_jobs", set()).discard((job.uid, agent))
+    return job
+
+
+def take_agent_job_results(agent):
+    """Hand an agent page its finished job results once, or None"""
+    job = get_job_manager().get(_session_job_id(agent))
+    if job is None or not job.finished() or job.inputs != _business_inputs():
+        return None
+    if not _take_job(job, (job.uid, agent)):
+        return None
+    return job.group_results(agent)
+
+
+def split_agency_results(results, to_text):
+    """(answers, error messages) from name -> (payload, error); a failure never becomes an answer"""
+    answers, errors = {}, {}
+    for name, (payload, error) in results.items():
+        if error is None:
+            answers[name] = to_text(payload)
+        else:
+            errors[name] = describe_agency_error(error)
+    return answers, errors
+
+
+def _stream_preview_text(job, name, sanitize):
+    previews = st.session_state.setdefault("stream_previews", {})
+    sanitizer, consumed = previews.get((job.uid, name), (IncrementalSanitizer(sanitize), 0))
+    deltas = job.partial_deltas(name, consumed)
+    for delta in deltas:
+        sanitizer.feed(delta)
+    previews[(job.uid, name)] = (sanitizer, consumed + len(deltas))
+    return sanitizer.text()
+
+
+@st.fragment(run_every=ANALYSIS_JOB_POLL_SECONDS)
+def _agent_job_fragment(agent, sanitize, titles, render_result):
+    job = get_job_manager().get(_session_job_id(agent))
+    if job is None:
+        return
+    if job.finished():
+        # Rerun the whole page so it picks the results up
+        st.rerun()
+    done, total = job.progress(agent)
+    st.progress(done / total, text=f"⏳ {done}/{total} ready • results are kept if you switch pages")
+    results = job.group_results(agent)
+    for name in job.group_nodes(agent):
+        payload, error = results[name]
+        if job.node_done(name):
+            if render_result is not None:
+                render_result(name, payload, error)
+            continue
+        text = _stream_preview_text(job, name, sanitize)
+        if text:
+            _render_stream_preview(st, titles.get(name, name), text)
+
+
+def render_agent_job_progress(agent, sanitize, titles=None, render_result=None):
+    """
+    Poll this session's running job for an agent page: live previews of the
+    answers being written, `render_result(name, payload, error)` for finished
+    ones, and a page rerun once everything has landed (the page itself
+    picks finished jobs up with take_agent_job_results).
+    """
+    job = get_job_manager().get(_session_job_id(agent))
+    if job is None or job.finished() or job.inputs != _business_inputs():
+        return
+    if (job.uid, agent) in st.session_state.get("absorbed_jobs", set()):
+        return
+    _agent_job_fragment(agent, sanitize, titles or {}, render_result)
+
+
+# ================================
+# 🚀 Full Assessment Pipeline
+# ================================
+def build_agency_goal(agent, cfg, problem, account, industry, extra_context=""):
+    """Goal text for one agency call, identical to what the agent page would send"""
+    if agent == "current_system":
+        return cfg["prompt"](problem, {"vocabulary": f"{account}, {industry}"})
+    return cfg["prompt"](build_agent_context(problem, account, industry, extra_context), {})
+
+
+def _hardness_goal(cfg, account, industry, problem):
+    """Goal builder for the pipeline's hardness node: runs once Q1-Q12 are in and passes their scores on"""
+    def goal(job):
+        results = job.group_results()
+        records = {}
+        for dimension, questions in DIMENSION_QUESTIONS.items():
+            for q in questions:
+                payload, error = results.get(q, (None, None))
+                if error is None and payload is not None:
+                    records[q] = parse_agent_result(dimension.lower(), q, sanitize_text(json_to_text(payload)))
+        return build_agency_goal("hardness_summary", cfg, problem, account, industry, hardness_extra_context(records))
+    return goal
+
+
+def _assessment_nodes(account, industry, problem):
+    """Job nodes for every agency call of one full assessment"""
+    nodes = {}
+    for agent, configs in AGENT_API_CONFIGS.items():
+        if agent == "hardness_summary":
+            continue
+        for cfg in configs:
+            goal = build_agency_goal(agent, cfg, problem, account, industry)
+            nodes[cfg["name"]] = {"url": cfg["url"], "goal": goal, "upstream": (), "group": agent}
+    # The hardness summary reads the dimension results, so it waits for Q1-Q12
+    dimension_nodes = tuple(q for questions in DIMENSION_QUESTIONS.values() for q in questions)
+    for cfg in AGENT_API_CONFIGS["hardness_summary"]:
+        goal = _hardness_goal(cfg, account, industry, problem)
+        nodes[cfg["name"]] = {"url": cfg["url"], "goal": goal, "upstream": dimension_nodes, "group": "hardness_summary"}
+    return nodes
+
+
+def start_assessment_pipeline(account, industry, problem):
+    """Kick off the full assessment for the saved problem (reattaches if it is already running)"""
+    inputs = (account, industry, problem)
+    return get_job_manager().submit(_session_job_id("assessment"), _assessment_nodes(*inputs), inputs, background=True)
+
+
+def _current_assessment_pipeline():
+    """This session's assessment job, or None if it was started for a problem that is no longer saved"""
+    job = get_job_manager().get(_session_job_id("assessment"))
+    if job is None or job.inputs != _saved_inputs():
+        return None
+    return job
+
+
+def take_assessment_results(agent):
+    """Hand an agent page its finished pipeline results once, or None"""
+    job = _current_assessment_pipeline()
+    if job is None or not job.group_finished(agent):
+        return None
+    if not _take_job(job, (job.uid, agent)):
+        return None
+    return job.group_results(agent)
+
+
+@st.fragment(run_every=ASSESSMENT_POLL_SECONDS)
+def _assessment_status_fragment(agent):
+    job = _current_assessment_pipeline()
+    if job is None:
+        return
+    waiting = agent and (job.uid, agent) not in st.session_state.get("absorbed_jobs", set())
+    if waiting and job.group_finished(agent):
+        # Rerun the whole page so it picks the results up
+        st.rerun()
+    done, total = job.progress()
+    st.progress(done / total, text=f"⚡ Full assessment running in the background • {done}/{total} analyses ready")
+
+
+def assessment_pending(agent):
+    """True while the background assessment for the saved problem still owes `agent` its results"""
+    job = _current_assessment_pipeline()
+    return job is not None and (job.uid, agent) not in st.session_state.get("absorbed_jobs", set())
+
+
+def render_assessment_status(agent=None):
+    """Background assessment progress; on an agent page, reloads once its results land"""
+    job = _current_assessment_pipeline()
+    if job is None:
+        return
+    done, total = job.progress()
+    waiting = agent is not None and (job.uid, agent) not in st.session_state.get("absorbed_jobs", set())
+    if done < total or waiting:
+        _assessment_status_fragment(agent)
+
+
+def render_response_cache_controls(key_prefix="admin"):
+    """Admin view of the Talos response cache with bypass/refresh and clear controls"""
+    client = get_talos_client()
+    cache = client.cache
+    if cache is None:
+        return
+
+    st.markdown("### ⚡ Response Cache")
+    stats = cache.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("In memory", stats["memory_entries"])
+    col2.metric("On disk", stats["disk_entries"] if stats["disk_entries"] is not None else "N/A")
+    col3.metric("Hits", stats["hits"])
+    col4.metric("Misses", stats["misses"])
+    st.caption(f"🔗 {client.coalesced_calls} calls joined an identical request already in flight instead of sending their own")
+
+    bypass = st.toggle(
+        "Bypass cache (always call the API and refresh stored answers)",
+        value=stats["bypass"],
+        key=f"{key_prefix}_cache_bypass",
+    )
+    if bypass != cache.bypass:
+        cache.bypass = bypass
+
+    if st.button("🗑️ Clear cached responses", key=f"{key_prefix}_cache_clear"):
+        cache.clear()
+        st.success("✅ Response cache cleared.")
+
+
+def agency_labels():
+    """agency_id -> "Agent · Question" for every configured agency call"""
+    labels = {}
+    for agent, configs in AGENT_API_CONFIGS.items():
+        for cfg in configs:
+            label = f"{agent.replace('_', ' ').title()} · {cfg['name']}"
+            agency_id = agency_id_from_url(cfg["url"])
+            labels[agency_id] = f"{labels[agency_id]}, {label}" if agency_id in labels else label
+    return labels
+
+
+def _ms_to_seconds(value):
+    return round(value / 1000, 2) if value is not None else None
+
+
+def render_agency_metrics(key_prefix="admin"):
+    """Admin view of per-agency latency percentiles, error rates and payload sizes"""
+    metrics = get_talos_client().metrics
+    if metrics is None:
+        return
+
+    st.markdown("### ⏱️ Agency Latency")
+    source = st.radio(
+        "Samples",
+        ["This server (recent calls)", "History file"],
+        horizontal=True,
+        key=f"{key_prefix}_metrics_source",
+    )
+    samples = metrics.samples() if source.startswith("This server") else metrics.history()
+    summary = AgencyMetrics.summarize(samples)
+    if not summary:
+        st.info("📭 No Talos calls recorded yet.")
+        return
+
+    labels = agency_labels()
+    rows = []
+    for agency_id, stats in summary.items():
+        rows.append({
+            "Agent · Question": labels.get(agency_id, "—"),
+            "Agency ID": agency_id,
+            "Calls": stats["calls"],
+            "Cache hits": stats["cache_hits"],
+            "Coalesced": stats["coalesced"],
+            "Error %": round(stats["error_rate"] * 100, 1),
+            "Retries": stats["retries"],
+            "p50 s": _ms_to_seconds(stats["p50_ms"]),
+            "p95 s": _ms_to_seconds(stats["p95_ms"]),
+            "p99 s": _ms_to_seconds(stats["p99_ms"]),
+            "TTFB p50 s": _ms_to_seconds(stats["ttfb_p50_ms"]),
+            "Queue p95 s": _ms_to_seconds(stats["queue_p95_ms"]),
+            "Avg KB": round(stats["avg_response_kb"], 1) if stats["avg_response_kb"] is not None else None,
+        })
+    df = pd.DataFrame(rows).sort_values("p95 s", ascending=False, na_position="last")
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    st.caption(
+        "p50/p95/p99 and TTFB are measured around the HTTP call (backend time). "
+        "Queue is the wait for a free worker on our side before the call starts."
+    )
+
+    breaker = get_talos_client().breaker
+    open_agencies = breaker.open_agencies() if breaker is not None else {}
+    for agency_id, retry_in in open_agencies.items():
+        st.warning(f"⚡ {labels.get(agency_id, agency_id)} is failing fast (circuit open, retry in {int(retry_in) + 1}s)")
+
+
+# Admin feedback tables: rows sent to the browser per page, and the largest
+# download built on every rerun (bigger ones are built when asked for)
+ADMIN_PAGE_SIZES = (25, 50, 100, 250)
+ADMIN_INLINE_DOWNLOAD_ROWS = int(os.environ.get("ADMIN_INLINE_DOWNLOAD_ROWS", "5000"))
+
+
+def render_feedback_table(agent, feedback_type, key_prefix="admin", height=400):
+    """
+    One page of the filtered feedback. Sorting, paging and the column choice
+    are applied on the server, so only the rows on screen are serialized; the
+    page and the row total behind the page count come from the same read.
+    """
+    col_sort, col_order, col_size, col_page = st.columns([2, 1, 1, 1])
+    sort_by = col_sort.selectbox(
+        "Sort by", ["Submission order"] + list(FEEDBACK_COLUMNS), key=f"{key_prefix}_sort_by"
+    )
+    descending = col_order.selectbox(
+        "Order", ["Newest / Z-A first", "Oldest / A-Z first"], key=f"{key_prefix}_sort_order"
+    ).startswith("Newest")
+    page_size = col_size.selectbox("Rows per page", ADMIN_PAGE_SIZES, index=1, key=f"{key_prefix}_page_size")
+    columns = st.multiselect(
+        "Columns",
+        list(FEEDBACK_COLUMNS),
+        default=[column for column in FEEDBACK_COLUMNS if column != "FeedbackId"],
+        key=f"{key_prefix}_columns",
+    )
+
+    def read_page(page):
+        return get_feedback_store().page(
+            agent,
+            feedback_type,
+            sort_by=None if sort_by == "Submission order" else sort_by,
+            descending=descending,
+            offset=(page - 1) * page_size,
+            limit=page_size,
+            columns=columns or None,
+        )
+
+    page_key = f"{key_prefix}_page"
+    page = int(st.session_state.get(page_key, 1))
+    page_df, total = read_page(page)
+    page_count = max(1, -(-total // page_size))
+    # Filters or page size may have shrunk the page count since the last rerun
+    if page > page_count:
+        page = page_count
+        page_df, total = read_page(page)
+        page_count = max(1, -(-total // page_size))
+        st.session_state[page_key] = page
+    col_page.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, step=1, key=page_key)
+
+    offset = (page - 1) * page_size
+    st.dataframe(page_df, use_container_width=True, height=height, hide_index=True)
+    st.caption(f"Rows {offset + 1 if len(page_df) else 0}–{offset + len(page_df)} of {total}")
+
+
+def render_feedback_download(agent, feedback_type, matching_count, file_name, label, key_prefix="admin"):
+    """Download button for every filtered row; large reports are only built when asked for"""
+    if matching_count <= ADMIN_INLINE_DOWNLOAD_ROWS:
+        report = get_feedback_store().query(agent, feedback_type).to_csv(index=False).encode("utf-8")
+    else:
+        # Keyed by the filters and row count, so a prepared report never goes stale
+        prepared_key = f"{key_prefix}_prepared_report"
+        wanted = (agent, feedback_type, matching_count)
+        prepared = st.session_state.get(prepared_key)
+        if prepared is None or prepared[0] != wanted:
+            if not st.button(f"📦 Prepare report ({matching_count} rows)", key=f"{key_prefix}_prepare_report",
+                             use_container_width=True):
+                return
+            with st.spinner("Building report..."):
+                prepared = (wanted, get_feedback_store().query(agent, feedback_type).to_csv(index=False).encode("utf-8"))
+            st.session_state[prepared_key] = prepared
+        report = prepared[1]
+
+    st.download_button(label, report, file_name, "text/csv", use_container_width=True, type="primary")
+
+
 def render_admin_panel(admin_password="admin123"):
     """
     Render admin panel with password authentication and feedback download.
@@ -1431,10 +3041,12 @@ def render_admin_panel(admin_password="admin123"):
             # Admin download options
             st.markdown("### 📋 Feedback Report Management")
 
-            # Get combined feedback data from all sources
-            df = get_all_feedback_data()
+            # Counts, the table's pages and the report are all indexed queries on the feedback store
+            flush_feedback_writes()
+            feedback_store = get_feedback_store()
+            total_count = feedback_store.count()
 
-            if df is not None and not df.empty:
+            if total_count:
                 # Add TWO filter dropdowns
                 st.markdown("#### 🔍 Filter Options")
                 
@@ -1473,19 +3085,9 @@ def render_admin_panel(admin_password="admin123"):
                     )
 
                 # Apply BOTH filters
-                filtered_df = df.copy()
-                
-                # Filter by Agent (if Agent column exists)
-                if 'Agent' in df.columns:
-                    if agent_filter != "All Agents":
-                        filtered_df = filtered_df[filtered_df['Agent'] == agent_filter]
-                else:
-                    if agent_filter != "All Agents":
-                        st.warning("⚠️ 'Agent' column not found in feedback data. Showing all agents.")
-                
-                # Filter by Feedback Type
-                if feedback_type_filter != "All Feedback Types":
-                    filtered_df = filtered_df[filtered_df['FeedbackType'] == feedback_type_filter]
+                agent = agent_filter if agent_filter != "All Agents" else None
+                feedback_type = feedback_type_filter if feedback_type_filter != "All Feedback Types" else None
+                matching_count = feedback_store.count(agent, feedback_type)
 
                 # Show count with filter summary
                 filter_summary = []
@@ -1495,20 +3097,17 @@ def render_admin_panel(admin_password="admin123"):
                     filter_summary.append(f"Type: **{feedback_type_filter[:50]}...**")
                 
                 if filter_summary:
-                    st.info(f"📊 Showing **{len(filtered_df)}** of **{len(df)}** feedback entries | Filters: {' | '.join(filter_summary)}")
+                    st.info(f"📊 Showing **{matching_count}** of **{total_count}** feedback entries | Filters: {' | '.join(filter_summary)}")
                 else:
-                    st.info(f"📊 Showing **{len(filtered_df)}** total feedback entries (no filters applied)")
+                    st.info(f"📊 Showing **{matching_count}** total feedback entries (no filters applied)")
 
-                # Display filtered feedback data table
-                if not filtered_df.empty:
+                # Display one page of the filtered feedback
+                if matching_count:
                     st.markdown("#### 📋 Feedback Data")
-                    st.dataframe(filtered_df, use_container_width=True, height=400)
+                    render_feedback_table(agent, feedback_type, key_prefix="admin_panel", height=400)
 
                     st.markdown("<br>", unsafe_allow_html=True)
 
-                    # Download filtered feedback
-                    feedback_csv = filtered_df.to_csv(index=False).encode("utf-8")
-                    
                     # Create descriptive filename
                     agent_part = agent_filter.replace(' ', '_') if agent_filter != "All Agents" else "AllAgents"
                     type_part = feedback_type_filter.replace(' ', '_').replace('.', '').replace(',', '')[:30] if feedback_type_filter != "All Feedback Types" else "AllTypes"
@@ -1516,13 +3115,10 @@ def render_admin_panel(admin_password="admin123"):
 
                     col_dl1, col_dl2, col_dl3 = st.columns([1, 2, 1])
                     with col_dl2:
-                        st.download_button(
-                            "⬇️ Download Filtered Feedback Report",
-                            feedback_csv,
-                            download_filename,
-                            "text/csv",
-                            use_container_width=True,
-                            type="primary"
+                        # Download filtered feedback
+                        render_feedback_download(
+                            agent, feedback_type, matching_count, download_filename,
+                            "⬇️ Download Filtered Feedback Report", key_prefix="admin_panel",
                         )
                 else:
                     st.warning(f"⚠️ No feedback found matching your filters.")
@@ -1530,6 +3126,10 @@ def render_admin_panel(admin_password="admin123"):
             else:
                 st.info("📭 No feedback data available yet. Submit feedback from the main page to see it here.")
 
+            st.markdown("---")
+            render_response_cache_controls(key_prefix="admin_panel")
+            render_agency_metrics(key_prefix="admin_panel")
+
         elif password and password != "":
             st.session_state.admin_authenticated = False
             st.error("❌ Invalid password. Access denied.")
@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_header import _percentile  # noqa: E402
+
+
+def test_nearest_rank_on_100_values():
+    values = list(range(1, 101))
+    assert _percentile(values, 50) == 50
+    assert _percentile(values, 95) == 95
+    assert _percentile(values, 99) == 99
+    assert _percentile(values, 100) == 100
+    assert _percentile(values, 0) == 1
+
+
+def test_rank_rounds_up_not_half_to_even():
+    # 50% of 5 is rank 2.5: nearest rank takes the 3rd value
+    assert _percentile([10, 20, 30, 40, 50], 50) == 30
+    assert _percentile([4, 1, 3, 2], 50) == 2
+    assert _percentile([7], 99) == 7
+    assert _percentile([], 50) is None
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+import streamlit as st
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_header import get_all_question_scores, get_overall_hardness_score, store_agent_results  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    st.session_state.clear()
+    yield
+    st.session_state.clear()
+
+
+def answers(*scores):
+    return {
+        f"Q{i}": f"Analysis of the question.\n\nScore: {score}" if score is not None else "No score could be given."
+        for i, score in enumerate(scores, start=1)
+    }
+
+
+def test_rerun_replaces_the_previous_scores():
+    store_agent_results("volatility", answers(4, 4, 4))
+    assert st.session_state.agent_scores["volatility"] == 4
+    assert get_overall_hardness_score() == 4
+
+    store_agent_results("volatility", answers(2, 3, 1))
+    assert st.session_state.volatility_scores == {"Q1": 2, "Q2": 3, "Q3": 1}
+    assert st.session_state.agent_scores["volatility"] == 2
+    assert get_overall_hardness_score() == 2
+
+
+def test_rerun_without_a_score_drops_the_old_one():
+    store_agent_results("volatility", answers(4, 4, 4))
+    store_agent_results("volatility", answers(2, None, 3))
+
+    assert get_all_question_scores() == {"Q1": 2, "Q3": 3}
+    assert st.session_state.agent_scores["volatility"] is None
+    assert get_overall_hardness_score() is None
@@ -0,0 +1,643 @@
+"""
+Shared text cleaning for agent answers.
+Patterns are compiled once at import and applied from per-agent rule tables,
+so every page cleans Talos output the same way without re-parsing regexes on
+each rerun.
+"""
+import re
+from functools import lru_cache
+
+# ================================
+# 🧹 Rule Tables
+# ================================
+# A rule is (needle, pattern, replacement), applied in order. Patterns are either
+# compiled regexes or plain strings (literal str.replace). When the needle is set
+# and not present in the text the rule cannot match, so its pass is skipped.
+# Patterns are written to start with a literal where possible ("  +" rather than
+# " {2,}") so the regex engine can scan ahead for it; alternations of unrelated
+# rules are kept apart since they lose that fast path.
+#
+# Every rule must stay linear in the answer size (benchmarks/bench_regex_budget.py
+# checks this on pathological inputs): numbers are written \d+(?:\.\d*)? rather
+# than the ambiguous \d+\.?\d*, runs of whitespace are only entered at their
+# start, and lazy "head ... tail" patterns that would rescan to the end of the
+# text from every failed start are run as bounded patterns.
+
+
+def _rule(pattern, repl, needle=None, flags=0):
+    return (needle, re.compile(pattern, flags), repl)
+
+
+def _replacer(repl):
+    if callable(repl):
+        return repl
+    # Match.expand reparses its template on every call, so plain strings skip it
+    return (lambda m: m.expand(repl)) if "\\" in repl else (lambda m: repl)
+
+
+class _BoundedPattern:
+    """
+    A "head tail" pattern run as head.search + tail.match, with head matches
+    confined to windows after which no match can start. `windows(text)` yields
+    (start, bound) pairs such that every head match ending by `bound` is
+    followed by a tail match; outside the windows the joined pattern cannot
+    match. Same result as re.sub with the joined pattern, but failed starts no
+    longer rescan to the end of the text.
+    """
+
+    def __init__(self, head, tail, windows, flags=0):
+        self.head = re.compile(head, flags)
+        self.tail = re.compile(tail, flags)
+        self.windows = windows
+        self.pattern = head + tail
+
+    def sub(self, repl, text):
+        repl = _replacer(repl)
+        pieces = []
+        done = 0
+        for start, bound in self.windows(text):
+            pos = max(done, start)
+            while pos < bound:
+                m = self.head.search(text, pos, bound)
+                if m is None:
+                    break
+                end = self.tail.match(text, m.end()).end()
+                pieces.append(text[done:m.start()])
+                pieces.append(repl(m))
+                done = pos = end
+        if not pieces:
+            return text
+        pieces.append(text[done:])
+        return "".join(pieces)
+
+
+class _BlankRunPattern:
+    """
+    A "head \\s* body" pattern, with head "^" (multiline) or "\\n" and a body
+    that starts with a non-space, which enters each run of blank lines once.
+    Where the body fails after the first line of a run of three or more, the
+    whole run is matched and written back unchanged, so the later lines of
+    the run (which could only reach the same body position) are not each
+    rescanned to its end.
+    """
+
+    def __init__(self, head, body, flags=0):
+        self.regex = re.compile(
+            head + r'(?:\s*' + body + r'(?P<hit>)|[^\S\n]*\n[^\S\n]*\n\s*)', flags | re.MULTILINE)
+        self.pattern = head + r'\s*' + body
+
+    def sub(self, repl, text):
+        repl = _replacer(repl)
+        return self.regex.sub(lambda m: repl(m) if m.group('hit') is not None else m.group(0), text)
+
+
+def _markdown_link_windows(text):
+    # Per line: a "[" can only match before the last "](" that a ")" still follows
+    p = text.find("](")
+    while p != -1:
+        line_start = text.rfind("\n", 0, p) + 1
+        line_end = text.find("\n", p)
+        if line_end == -1:
+            line_end = len(text)
+        close = text.rfind(")", p + 2, line_end)
+        if close != -1:
+            yield line_start, text.rfind("](", p, close) + 2
+        p = text.find("](", line_end)
+
+
+_CALCULATED = re.compile(r'calculated:', re.IGNORECASE)
+
+
+def _how_calculated_windows(text):
+    # A "How" can only match before the last "calculated:"
+    last = None
+    for last in _CALCULATED.finditer(text):
+        pass
+    if last is not None:
+        yield 0, last.end()
+
+
+# Sections that run to the next blank line, capitalised line or end of text
+_SECTION_TAIL = r'.*?(?=\n\n|\n[A-Z]|$)'
+
+# Four-term score arithmetic, e.g. "(1.5 + 2 + 3 - 4) / 4" and "1 + 2 + 3 + 4 = 10"
+_NUMBER = r'\d+(?:\.\d*)?'
+_SUM_OF_FOUR = r'\s*[+-]\s*'.join([_NUMBER] * 4)
+
+
+# Stray "s" left at the start of an answer or of a line
+_STRAY_S_RULES = (
+    _rule(r'^\s*s\s+', ''),
+    ('\n', _BlankRunPattern(r'\n', r's\s+'), '\n'),
+)
+
+# Markdown/HTML artifacts removed from every agent answer
+_MARKDOWN_RULES = (
+    _rule(r'Q\d+\s*Answer\s*Explanation\s*:', '', needle=':', flags=re.IGNORECASE),
+    _rule(r'\*\*(.*?)\*\*', r'\1', needle='**'),
+    _rule(r'\*(.*?)\*', r'\1', needle='*'),
+    _rule(r'`(.*?)`', r'\1', needle='`'),
+    _rule(r'#+\s*', '', needle='#'),
+    ('![', _BoundedPattern(r'!\[.*?\]\(', r'.*?\)', _markdown_link_windows), ''),
+    ('](', _BoundedPattern(r'\[(.*?)\]\(', r'.*?\)', _markdown_link_windows), lambda m: m.group(1)),
+    _rule(r'\n\n\n+', '\n\n', needle='\n\n\n'),
+    _rule(r'  +', ' ', needle='  '),
+    (None, _BlankRunPattern(r'^', r'[-*]\s+'), '• '),
+    _rule(r'<\/?[^>]+>', '', needle='<'),
+    ('& Key Takeaway:', '& Key Takeaway:', 'Key Takeaway:'),
+)
+
+SANITIZE_RULES = _STRAY_S_RULES + _MARKDOWN_RULES
+
+# Current System answers also carry "---" separator lines
+CURRENT_SYSTEM_SANITIZE_RULES = (
+    _STRAY_S_RULES
+    + (_rule(r'^---\s*$', '', needle='---', flags=re.MULTILINE),)
+    + _MARKDOWN_RULES
+)
+
+# Question/answer prefixes stripped from dimension answers before the cards
+AGENT_OUTPUT_RULES = (
+    _rule(r'<[^>]+>', '', needle='<'),
+    _rule(r'^(Q\d+\.?\s*)', '', flags=re.MULTILINE | re.IGNORECASE),
+    _rule(r'\n(Q\d+\.?\s*)', '\n', flags=re.MULTILINE | re.IGNORECASE),
+    _rule(r'^(Question\s*\d+\.?\s*)', '', flags=re.MULTILINE | re.IGNORECASE),
+    _rule(r'\n(Question\s*\d+\.?\s*)', '\n', flags=re.MULTILINE | re.IGNORECASE),
+    _rule(r'^(Answer|Analysis)\s*:\s*', '', needle=':', flags=re.MULTILINE | re.IGNORECASE),
+    _rule(r'Score\s*\(0[-–]5\)\s*:', 'Score:', needle='(0', flags=re.IGNORECASE),
+    _rule(r'^\s+', '', flags=re.MULTILINE),
+    _rule(r'\n\s+', '\n', needle='\n'),
+    _rule(r'  +', ' ', needle='  '),
+    _rule(r'\n\n\n+', '\n\n', needle='\n\n\n'),
+)
+
+# Q1/Answer labels removed before bold formatting of dimension answers
+ANSWER_LABEL_RULES = (
+    (':', _BlankRunPattern(r'^', r'Q\d+\s*:', flags=re.IGNORECASE), ''),
+    (':', _BlankRunPattern(r'^', r'Answer\s*:', flags=re.IGNORECASE), ''),
+    (':', _BlankRunPattern(r'^', r'Question\s*\d+\s*:', flags=re.IGNORECASE), ''),
+    _rule(r'\bQ\d+\b\s*:', '', needle=':', flags=re.IGNORECASE),
+    _rule(r'\bAnswer\b\s*:', '', needle=':', flags=re.IGNORECASE),
+)
+
+# Plain-text bullets ahead of the line-by-line bold formatting
+BULLET_RULES = (
+    (' - ', ' - ', ' : '),
+    (None, _BlankRunPattern(r'^', r'[-*]\s+'), '• '),
+)
+
+# Lists and bold labels of a dimension question card
+CARD_RULES = (
+    (None, _BlankRunPattern(r'^', r'(?:\d+\.|-)\s+(.*)'), lambda m: f"• {m.group(1)}"),
+    _rule(r':\s*•', ':\n•', needle='•'),
+    _rule(r'(:)\s+(?=•)', r'\1\n', needle='•'),
+    # Whitespace runs are only entered at their start (equivalent to (?<!\n)\s*•)
+    _rule(r'(?<!\s)\s*•', r'\n•', needle='•'),
+    # A label after a run of blank lines is only tried from the run's first newline
+    # (or the spaces just before it, which are matched and written back unchanged)
+    _rule(
+        r'(^|\n(?<!\s\n)|[^\S\n](?<=\S[^\S\n])[^\S\n]*\n)\s*(•\s*)?([^:\n]{2,80}):',
+        lambda m: f"{m.group(1)}{m.group(2) or ''}<strong>{m.group(3).strip()}:</strong>",
+        needle=':',
+    ),
+    _rule(r'\n\n+', '\n', needle='\n\n'),
+)
+
+# Sections of the Current System boxes
+SECTION_RULES = (
+    (None, _BlankRunPattern(r'^', r'\d+\.\s*'), ''),
+    _rule(r'(?i)\b(box\s*\d+[:.]?\s*)', ''),
+    _rule(r'\n\n\n+', '\n\n', needle='\n\n\n'),
+    _rule(r'  +', ' ', needle='  '),
+)
+
+# Numbered prefixes dropped from Current System answers before bold formatting
+NUMBERING_RULES = (
+    (None, _BlankRunPattern(r'^', r'\d+\.\s*'), ''),
+)
+
+# Hardness summary: keep the SME justification, drop the calculations
+HARDNESS_RULES = (
+    _rule(r'Calculation:' + _SECTION_TAIL, '', needle=':', flags=re.DOTALL | re.IGNORECASE),
+    _rule(r'Score Calculation:' + _SECTION_TAIL, '', needle=':', flags=re.DOTALL | re.IGNORECASE),
+    _rule(r'Calculation Process:' + _SECTION_TAIL, '', needle=':', flags=re.DOTALL | re.IGNORECASE),
+    (':', _BoundedPattern(r'How.*?calculated:', _SECTION_TAIL, _how_calculated_windows,
+                          flags=re.IGNORECASE | re.DOTALL), ''),
+    _rule(r'\(\s*' + _SUM_OF_FOUR + r'\s*\)\s*\/\s*4', '', needle='/'),
+    # Only tried at the start of a number; a match inside one would have started at its first digit
+    _rule(r'(?<!\d)' + _SUM_OF_FOUR + r'\s*=\s*' + _NUMBER, '', needle='='),
+    _rule(r'Individual Question Scores' + _SECTION_TAIL, '', flags=re.DOTALL | re.IGNORECASE),
+    _rule(r'Dimension Averages' + _SECTION_TAIL, '', flags=re.DOTALL | re.IGNORECASE),
+    _rule(r'DIMENSION SCORES:' + _SECTION_TAIL, '', needle=':', flags=re.DOTALL | re.IGNORECASE),
+    _rule(r'OVERALL CLASSIFICATION:' + _SECTION_TAIL, '', needle=':', flags=re.DOTALL | re.IGNORECASE),
+    _rule(r'COMPREHENSIVE ASSESSMENT:' + _SECTION_TAIL, '', needle=':', flags=re.DOTALL | re.IGNORECASE),
+    _rule(r'HARDNESS SUMMARY' + _SECTION_TAIL, '', flags=re.DOTALL | re.IGNORECASE),
+    _rule(r'<[^>]+>', '', needle='<'),
+    _rule(r'^\s+', '', flags=re.MULTILINE),
+    _rule(r'\n\s+', '\n', needle='\n'),
+    _rule(r'  +', ' ', needle='  '),
+    _rule(r'\n\n\n+', '\n\n', needle='\n\n\n'),
+)
+
+JSON_TEXT_KEYS = ("result", "output", "content", "text", "answer", "response")
+
+_BASE_AGENT_RULES = {
+    "sanitize": SANITIZE_RULES,
+    "json_keys": JSON_TEXT_KEYS,
+    "json_scan_values": True,
+    "label": "",
+    # Bold formatting (see format_with_bold)
+    "prepare": ANSWER_LABEL_RULES,
+    "skip_label_lines": True,
+    "step_blocks": False,
+    "section_headers": None,
+    "numbered_blocks": False,
+    "side_max_words": 8,
+    "colon_fallback": False,
+    "exact_headers": None,
+    "strong": "<strong>",
+    "section_strong": "<strong>",
+    "plain_line": "{}",
+    "paragraph_style": "margin:6px 0; line-height:1.45; font-size:0.98rem;",
+    "css_class": "",
+    # Dimension answers are shown as bulleted cards, others as bold paragraphs
+    "card_layout": True,
+}
+
+# Per-agent settings; anything not listed falls back to _BASE_AGENT_RULES
+AGENT_TEXT_RULES = {
+    name: {**_BASE_AGENT_RULES, **overrides}
+    for name, overrides in {
+        "vocabulary": {
+            "label": "vocabulary",
+            "prepare": (),
+            "skip_label_lines": False,
+            "step_blocks": True,
+            "numbered_blocks": True,
+            "exact_headers": r'\s*Revenue\s+Growth\s+Rate\s*',
+            "css_class": "vocab-display",
+            "card_layout": False,
+        },
+        "current_system": {
+            "sanitize": CURRENT_SYSTEM_SANITIZE_RULES,
+            "json_keys": ("result", "output", "content", "text"),
+            "json_scan_values": False,
+            "label": "current system",
+            "prepare": NUMBERING_RULES,
+            "skip_label_lines": False,
+            "section_headers": r'Current\s+System|Inputs?|Outputs?|Pain\s+Points?|System\s+Description',
+            "numbered_blocks": True,
+            "side_max_words": 12,
+            "colon_fallback": True,
+            "strong": "<strong style='color: var(--text-primary);'>",
+            "section_strong": "<strong style='font-size:1.1rem; color: var(--text-primary);'>",
+            "plain_line": "<span style='color: var(--text-primary);'>{}</span>",
+            "paragraph_style": "margin:6px 0; line-height:1.45; font-size:0.98rem; color: var(--text-primary);",
+            "card_layout": False,
+        },
+        "volatility": {
+            "label": "volatility",
+            "section_headers": r'Analysis|Score|Justification|Key\s+Takeaway|Frequency|Pace|Change|Cyclical|Predictable|Sporadic|Unpredictable|Resilient|System|Rework|Disruption',
+            "css_class": "volatility-display",
+        },
+        "ambiguity": {
+            "label": "ambiguity",
+            "section_headers": r'Analysis|Score|Justification|Key\s+Takeaway|Clarity|Definition|Boundaries|Success|Criteria|Requirements|Constraints|Interpretation|Stakeholder|Expectations|Decision|Processes',
+            "css_class": "ambiguity-display",
+        },
+        "interconnectedness": {
+            "label": "interconnectedness",
+            "section_headers": r'Analysis|Score|Justification|Key\s+Takeaway|Interconnectedness|Dependencies|Relationships|Impact|Propagation|Ripple\s+Effects|System\s+Components|Stakeholders|Integration|Coupling|Interdependencies',
+            "css_class": "interconnectedness-display",
+        },
+        "uncertainty": {
+            "label": "uncertainty",
+            "section_headers": r'Analysis|Score|Justification|Key\s+Takeaway|Uncertainty|Risk|Predictability|Data\s+Gaps|Knowledge\s+Limitations|Volatility|Stability|Reliability|Confidence|Probability',
+            "css_class": "uncertainty-display",
+        },
+        "hardness": {"label": "hardness"},
+    }.items()
+}
+
+
+def apply_rules(text, rules):
+    """Run a rule table over text"""
+    for needle, pattern, repl in rules:
+        if needle is not None and needle not in text:
+            continue
+        if isinstance(pattern, str):
+            text = text.replace(pattern, repl)
+        else:
+            text = pattern.sub(repl, text)
+    return text
+
+
+def _agent_rules(agent):
+    return AGENT_TEXT_RULES.get(agent, _BASE_AGENT_RULES)
+
+
+# ================================
+# 🧾 Answer Text
+# ================================
+
+def json_to_text(data, agent=None):
+    """Extract text from JSON response"""
+    rules = _agent_rules(agent)
+    return _json_to_text(data, rules["json_keys"], rules["json_scan_values"])
+
+
+def _json_to_text(data, keys, scan_values):
+    if data is None:
+        return ""
+    if isinstance(data, str):
+        return data
+    if isinstance(data, dict):
+        for key in keys:
+            if key in data and data[key]:
+                return _json_to_text(data[key], keys, scan_values)
+        if "data" in data:
+            return _json_to_text(data["data"], keys, scan_values)
+        if scan_values:
+            # Try to extract any string values
+            for value in data.values():
+                if isinstance(value, str) and len(value) > 10:
+                    return value
+        return "\n".join(f"{k}: {_json_to_text(v, keys, scan_values)}" for k, v in data.items() if v)
+    if isinstance(data, list):
+        return "\n".join(_json_to_text(x, keys, scan_values) for x in data if x)
+    return str(data)
+
+
+def sanitize_text(text, agent=None):
+    """Remove markdown artifacts and clean up text"""
+    if not text:
+        return ""
+    return apply_rules(text.strip(), _agent_rules(agent)["sanitize"]).strip()
+
+
+def clean_agent_output(text, agent):
+    """Clean a dimension answer by removing Q1/Q2/Q3 prefixes, HTML tags, and fixing formatting"""
+    if not text:
+        return f"No {_agent_rules(agent)['label']} data available"
+    return apply_rules(text, AGENT_OUTPUT_RULES).strip()
+
+
+def clean_section_content(content):
+    """Remove numbered lists (1., 2., 3., etc.) and clean up formatting"""
+    if not content:
+        return content
+    return apply_rules(content, SECTION_RULES).strip()
+
+
+_GENERIC_COMPANY = re.compile(r'\bthe company\b', re.IGNORECASE)
+_GENERIC_INDUSTRY = re.compile(r'\bthe industry\b', re.IGNORECASE)
+
+
+def replace_generic_mentions(text, display_account, display_industry):
+    """Swap "the company"/"the industry" for the selected account and industry"""
+    if display_account and display_account != "Unknown Company":
+        text = _GENERIC_COMPANY.sub(display_account, text)
+    if display_industry and display_industry != "Unknown Industry":
+        text = _GENERIC_INDUSTRY.sub(display_industry, text)
+    return text
+
+
+def format_card_body(text, display_account, display_industry):
+    """Bulleted card text with bold labels (newlines still to be turned into <br>)"""
+    text = replace_generic_mentions(text, display_account, display_industry)
+    return apply_rules(text, CARD_RULES)
+
+
+_SME_JUSTIFICATION = re.compile(r'SME Justification', re.IGNORECASE)
+
+
+def format_hardness_output(text):
+    """Keep the SME justification of a hardness summary and drop the score calculations"""
+    if not text:
+        return "No hardness data available"
+
+    # Everything before the SME justification goes; without one the whole text is kept
+    sme = _SME_JUSTIFICATION.search(text)
+    clean_text = text[sme.start():] if sme else text
+    return apply_rules(clean_text, HARDNESS_RULES).strip()
+
+
+# ================================
+# 🅱️ Bold Formatting
+# ================================
+# Answers are rendered in one pass: every line is classified once by a single
+# per-agent pattern into a token, and tokens are turned into HTML pieces that
+# are joined at the end. Branch order is the precedence of the line kinds.
+
+_LINE_BRANCHES = (
+    ("label", "skip_label_lines", r'\s*(?i:Q\d+|Answer|Question\s*\d+)\s*\Z'),
+    ("step", "step_blocks", r'(?=.*?(?i:Step\s*\d+\s*:))'),
+    ("section", "section_headers", r'\s*(?i:{})'),
+    ("numbered", None, r'\s*(?P<numbered_head>\d+\.\s+[^:]+):\s*(?P<numbered_rest>.*)\Z'),
+    ("block", "numbered_blocks", r'\s*\d+\.\s+.+\Z'),
+    ("bullet", None, r'\s*(?:•|\d+\.)\s*(?P<bullet_head>[^:]+):\s*(?P<bullet_rest>.*)\Z'),
+    ("side", None, r'\s*(?P<side_left>[^:]+):\s*(?P<side_right>.*)\Z'),
+    ("exact", "exact_headers", r'(?i:{})\Z'),
+)
+
+# A line continues a step/numbered block when it is indented or starts lowercase
+_CONTINUATION = re.compile(r'[\sa-z]')
+_REGEX_CHARS = set(r".^$*+?{}[]\|()")
+
+
+def _line_pattern(rules):
+    branches = []
+    for kind, setting, branch in _LINE_BRANCHES:
+        if setting is None or rules[setting] is True:
+            branches.append(f"(?P<{kind}>{branch})")
+        elif rules[setting]:
+            branches.append(f"(?P<{kind}>{branch.format(rules[setting])})")
+    return re.compile("|".join(branches))
+
+
+_LINE_PATTERNS = {name: _line_pattern(rules) for name, rules in AGENT_TEXT_RULES.items()}
+_LINE_PATTERNS[None] = _line_pattern(_BASE_AGENT_RULES)
+
+
+# ================================
+# 🔦 Extra Phrase Highlighting
+# ================================
+# A phrase set is compiled once into a single pattern: plain phrases go into a
+# character trie rendered as nested alternations (shared prefixes are matched
+# once, the longest phrase wins), phrases containing regex syntax follow as
+# their own alternatives. Each line is then scanned once however many phrases
+# there are, and overlapping phrases produce one bold span instead of nested ones.
+
+def _trie_key(ch):
+    lower = ch.lower()
+    return lower if len(lower) == 1 else ch
+
+
+def _trie_regex(node):
+    branches = []
+    for ch, child in sorted((k, v) for k, v in node.items() if k):
+        # Walk single-child chains without recursing so long phrases stay flat
+        run = [ch]
+        while len(child) == 1 and "" not in child:
+            (ch, child), = child.items()
+            run.append(ch)
+        branches.append(re.escape("".join(run)) + _trie_regex(child))
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        return f"(?:{body})?"
+    return body
+
+
+@lru_cache(maxsize=32)
+def _extra_phrase_pattern(phrases):
+    trie = {}
+    expressions = []
+    for p in phrases:
+        if not p:
+            continue
+        if any(ch in _REGEX_CHARS for ch in p):
+            try:
+                re.compile(p)
+                expressions.append(p)
+                continue
+            except re.error:
+                pass
+        node = trie
+        for ch in p:
+            node = node.setdefault(_trie_key(ch), {})
+        node[""] = {}
+    alternatives = ([_trie_regex(trie)] if trie else []) + expressions
+    if not alternatives:
+        return None
+    return re.compile("|".join(alternatives), re.IGNORECASE)
+
+
+def extra_phrase_pattern(extra_phrases):
+    """One compiled pattern matching any of `extra_phrases` (plain text or regex), cached per phrase set"""
+    if not extra_phrases:
+        return None
+    return _extra_phrase_pattern(tuple(extra_phrases))
+
+
+def tokenize_answer(text, agent=None, extra_phrases=None):
+    """Classify each line of a cleaned answer into (kind, ...) tokens"""
+    rules = _agent_rules(agent)
+    line_pattern = _LINE_PATTERNS.get(agent, _LINE_PATTERNS[None])
+    extra_pattern = extra_phrase_pattern(extra_phrases)
+    side_max_words = rules["side_max_words"]
+    block = None
+
+    for raw in text.splitlines():
+        if block is not None:
+            if raw.strip() and _CONTINUATION.match(raw):
+                block.append(raw.rstrip())
+                continue
+            yield ("block", block)
+            block = None
+
+        ln = raw.rstrip()
+        if not ln.strip():
+            yield ("blank",)
+            continue
+
+        m = line_pattern.match(ln)
+        kind = m.lastgroup if m else None
+        if kind == "label":
+            continue
+
+        if extra_pattern is not None:
+            new_ln = extra_pattern.sub(r"<strong>\g<0></strong>", ln)
+            if new_ln != ln:
+                yield ("html", new_ln)
+                continue
+
+        if kind == "step" or kind == "block":
+            block = [ln]
+        elif kind == "section" or kind == "exact":
+            yield ("heading", ln.strip())
+        elif kind == "numbered":
+            yield ("numbered", m.group("numbered_head").strip(), m.group("numbered_rest").strip())
+        elif kind == "bullet":
+            yield ("bullet", m.group("bullet_head").strip(), m.group("bullet_rest").strip())
+        elif kind == "side" and len(m.group("side_left").split()) <= side_max_words:
+            yield ("label", m.group("side_left").strip(), m.group("side_right").strip())
+        elif rules["colon_fallback"] and ':' in ln and not ln.startswith('•') \
+                and len(ln.split(':', 1)[0].split()) <= 8:
+            left, right = ln.split(':', 1)
+            yield ("colon", left.strip(), right.strip())
+        else:
+            yield ("text", ln)
+
+    if block is not None:
+        yield ("block", block)
+
+
+def render_answer_html(tokens, agent=None):
+    """Join answer tokens into <p> paragraphs, blank lines separating paragraphs"""
+    rules = _agent_rules(agent)
+    strong = rules["strong"]
+    section_strong = rules["section_strong"]
+    plain_line = rules["plain_line"]
+    p_open = f"<p style='{rules['paragraph_style']}'>"
+
+    paragraphs = []
+    current = []
+    for token in tokens:
+        kind = token[0]
+        if kind == "blank":
+            if current:
+                paragraphs.append("<br>".join(current))
+                current = []
+            continue
+        if kind == "html":
+            current.append(token[1])
+        elif kind == "block":
+            current.append(f"{strong}{'<br>'.join(b.strip() for b in token[1])}</strong>")
+        elif kind == "heading":
+            current.append(f"{section_strong}{token[1]}</strong>")
+        elif kind == "numbered" or kind == "label":
+            head, rest = token[1], token[2]
+            current.append(f"{strong}{head}:</strong> {rest}" if rest else f"{strong}{head}:</strong>")
+        elif kind == "bullet":
+            head, rest = token[1], token[2]
+            current.append(f"• {strong}{head}:</strong> {rest}" if rest else f"• {strong}{head}:</strong>")
+        elif kind == "colon":
+            current.append(f"{strong}{token[1]}:</strong> {token[2]}")
+        else:
+            current.append(plain_line.format(token[1]))
+    if current:
+        paragraphs.append("<br>".join(current))
+
+    return "\n".join(f"{p_open}{p}</p>" for p in paragraphs)
+
+
+def format_with_bold(text, agent, extra_phrases=None):
+    """Format an agent answer as HTML paragraphs with bold headings and labels"""
+    rules = _agent_rules(agent)
+    if not text:
+        return f"No {rules['label']} data available"
+
+    clean_text = apply_rules(sanitize_text(text, agent), rules["prepare"])
+    clean_text = apply_rules(clean_text, BULLET_RULES)
+    final_html = render_answer_html(tokenize_answer(clean_text, agent, extra_phrases), agent)
+    if not rules["css_class"]:
+        return final_html
+
+    # Sanitized text holds no tags and every paragraph line has content,
+    # so no run of <br> needs collapsing here
+    return f"""
+    <div class="{rules['css_class']}">
+        {final_html}
+    </div>
+    """
+
+
+def answer_html(text, agent, display_account, display_industry):
+    """Final HTML of an answer as its page shows it, with the account/industry filled in"""
+    if _agent_rules(agent)["card_layout"]:
+        body = format_card_body(clean_agent_output(text, agent), display_account, display_industry)
+    else:
+        body = replace_generic_mentions(format_with_bold(text, agent), display_account, display_industry)
+    return body.replace('\n', '<br>')